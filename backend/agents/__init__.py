@@ -13,6 +13,17 @@ from .multi_agent_newsroom_system import MultiAgentNewsroomSystem
 from .ultimate_ai_news_agent import UltimateAINewsAgent
 from .live_news_agent import LiveNewsAgent
 from .agent_runner import AgentRunner
+from .session_store import SessionStore
+from .registry import AgentInfo, AgentRegistry, agent_registry
+from .client_pool import client_pool
+from .errors import AgentError, RateLimitedError, QuotaExceededError, classify_error
+from .rate_limiter import RateLimiter, rate_limiter
+from .model_router import ModelRouter, model_router
+from .summary_batcher import SummaryBatcher, summary_prompt
+from .chunked_summarizer import ChunkedSummarizer
+from .snapshot_scheduler import SnapshotScheduler
+from .dag import NodeFailed
+from .schemas import NewsItem, NewsFeed, render_news_text
 
 __all__ = [
     "SEOAgent",
@@ -27,5 +38,26 @@ __all__ = [
     "UltimateAINewsAgent",
     "LiveNewsAgent",
     "AgentRunner",
+    "SessionStore",
+    "AgentInfo",
+    "AgentRegistry",
+    "agent_registry",
+    "client_pool",
+    "AgentError",
+    "RateLimitedError",
+    "QuotaExceededError",
+    "classify_error",
+    "RateLimiter",
+    "rate_limiter",
+    "ModelRouter",
+    "model_router",
+    "SummaryBatcher",
+    "summary_prompt",
+    "ChunkedSummarizer",
+    "SnapshotScheduler",
+    "NodeFailed",
+    "NewsItem",
+    "NewsFeed",
+    "render_news_text",
 ]
 
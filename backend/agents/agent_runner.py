@@ -2,16 +2,71 @@
 Agent Runner - Wrapper for running agents with session management
 Using official openai-agents Runner
 """
-from typing import Optional, Any
+from typing import Optional, Any, AsyncIterator, Callable, Dict, List
+import hashlib
+import json
+import os
 import uuid
 from .base import Runner
+from .errors import AgentError
+from .result_cache import ResultCache, make_cache_key
+from .session_store import SessionStore
+from .single_flight import SingleFlight
+
+
+def _run_variant(response_model: Optional[type], history: List[Dict[str, str]]) -> Optional[str]:
+    """Cache variant for a run: the structured output model plus a digest of the session history"""
+    parts = []
+    if response_model is not None:
+        parts.append(response_model.__name__)
+    if history:
+        digest = hashlib.sha256(json.dumps(history, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+        parts.append(f"history:{digest}")
+    return "|".join(parts) or None
+
+
+class Result:
+    """Agent run result with session_id for compatibility"""
+    
+    def __init__(self, final_output: str, session_id: str, cached: bool = False, parsed: Any = None, model: Optional[str] = None):
+        self.final_output = final_output
+        self.session_id = session_id
+        self.cached = cached
+        # Validated response_model instance for structured runs
+        self.parsed = parsed
+        # Model the router picked (None when served from the cache)
+        self.model = model
 
 
 class AgentRunner:
     """Wrapper for Runner to maintain compatibility with our agent structure"""
     
-    def __init__(self):
-        pass
+    def __init__(self, cache: Optional[ResultCache] = None, sessions: Optional[SessionStore] = None):
+        self.cache = cache if cache is not None else ResultCache()
+        # Outputs of a fallback model are cached this long at most, so the
+        # primary model serves the query again soon after it recovers
+        self.fallback_cache_ttl = float(os.getenv("FALLBACK_CACHE_TTL", "60"))
+        # Conversation history per session_id, sent with each follow-up run
+        self.sessions = sessions if sessions is not None else SessionStore()
+        self.single_flight = SingleFlight()
+        self._listeners: List[Callable[..., None]] = []
+    
+    def add_listener(self, listener: Callable[..., None]):
+        """Call ``listener(agent, query, output, parsed)`` after every fresh (non-cached) run"""
+        self._listeners.append(listener)
+    
+    def _notify(self, agent: Any, query: str, output: str, parsed: Any = None):
+        for listener in self._listeners:
+            try:
+                listener(agent, query, output, parsed)
+            except Exception as e:
+                print(f"AgentRunner listener {listener!r} failed: {e}")
+    
+    def _cache_output(self, agent_instance: Any, run_key: str, output: str, model: Optional[str]):
+        if model is not None and model not in (agent_instance.model, agent_instance.light_model):
+            self.cache.set(run_key, output, ttl=min(agent_instance.cache_ttl, self.fallback_cache_ttl))
+            return
+        self.cache.set(run_key, output, ttl=agent_instance.cache_ttl, bucketed=agent_instance.cache_bucketed)
     
     def create_session_id(self) -> str:
         """Create a new session ID"""
@@ -21,9 +76,18 @@ class AgentRunner:
         self,
         agent: Any,
         query: str,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        use_cache: bool = True,
+        response_model: Optional[type] = None,
+        remember: bool = True
     ):
-        """Run an agent asynchronously"""
+        """Run an agent asynchronously, serving fresh cached results when available.
+
+        Pass a pydantic ``response_model`` to get structured output in ``result.parsed``.
+        The session's earlier turns are sent with the query; with ``remember`` the
+        exchange is recorded under ``session_id``. Without a session id a fresh
+        one is returned but nothing is recorded, since no caller can continue it.
+        """
         try:
             # Handle both agent objects with .agent attribute and direct Agent instances
             agent_instance = agent.agent if hasattr(agent, 'agent') else agent
@@ -31,28 +95,105 @@ class AgentRunner:
             if agent_instance is None:
                 raise ValueError("Agent instance is None")
             
-            # Use official Runner.run for async execution
-            result = await Runner.run(agent_instance, query)
+            history = self.sessions.history(session_id)
+            run_key = make_cache_key(agent_instance, query, _run_variant(response_model, history))
+            remember = remember and session_id is not None
+            session_id = session_id or self.create_session_id()
+            cached_output = self.cache.get(run_key) if use_cache else None
+            if cached_output is not None:
+                if remember:
+                    self.sessions.append(session_id, query, cached_output)
+                return Result(
+                    final_output=cached_output,
+                    session_id=session_id,
+                    cached=True,
+                    parsed=response_model.model_validate_json(cached_output) if response_model is not None else None
+                )
             
-            if result is None or not hasattr(result, 'final_output'):
-                raise ValueError("Invalid result from Runner.run")
+            async def run_upstream():
+                # Use official Runner.run for async execution
+                result = await Runner.run(agent_instance, query, response_model=response_model, history=history)
+                
+                if result is None or not hasattr(result, 'final_output'):
+                    raise ValueError("Invalid result from Runner.run")
+                
+                output = result.final_output or ""
+                model = getattr(result, 'model', None)
+                if output:
+                    self._cache_output(agent_instance, run_key, output, model)
+                parsed = getattr(result, 'parsed', None)
+                self._notify(agent_instance, query, output, parsed)
+                return output, parsed, model
             
-            # Create a result object with session_id for compatibility
-            class Result:
-                def __init__(self, final_output: str, session_id: str):
-                    self.final_output = final_output
-                    self.session_id = session_id
+            # Identical concurrent runs share one upstream call
+            final_output, parsed, model = await self.single_flight.do(run_key, run_upstream)
+            if remember and final_output:
+                self.sessions.append(session_id, query, final_output)
             
             return Result(
-                final_output=result.final_output or "",
-                session_id=session_id or self.create_session_id()
+                final_output=final_output,
+                session_id=session_id,
+                parsed=parsed,
+                model=model
             )
+        except AgentError:
+            # Typed upstream failures keep their class (status code, Retry-After)
+            raise
         except Exception as e:
             import traceback
             error_details = traceback.format_exc()
             print(f"Error in AgentRunner.run_async: {e}\n{error_details}")
             raise Exception(f"Error running agent: {str(e)}")
     
+    async def stream_async(
+        self,
+        agent: Any,
+        query: str,
+        session_id: Optional[str] = None,
+        use_cache: bool = True,
+        remember: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run an agent with token streaming.
+
+        Yields ``delta`` events and a final ``done`` event carrying the session
+        id, usage, model and cache flag. Fresh cached results arrive as a single delta.
+        History and ``remember`` work as in ``run_async``.
+        """
+        agent_instance = agent.agent if hasattr(agent, 'agent') else agent
+        if agent_instance is None:
+            raise ValueError("Agent instance is None")
+        
+        history = self.sessions.history(session_id)
+        remember = remember and session_id is not None
+        session_id = session_id or self.create_session_id()
+        run_key = make_cache_key(agent_instance, query, _run_variant(None, history))
+        cached_output = self.cache.get(run_key) if use_cache else None
+        if cached_output is not None:
+            if remember:
+                self.sessions.append(session_id, query, cached_output)
+            yield {"type": "delta", "content": cached_output}
+            yield {"type": "done", "session_id": session_id, "usage": None, "model": None, "cached": True}
+            return
+        
+        parts = []
+        usage = None
+        model = None
+        async for event in Runner.stream(agent_instance, query, history=history):
+            if event["type"] == "delta":
+                parts.append(event["content"])
+                yield event
+            elif event["type"] == "usage":
+                usage = event["usage"]
+                model = event.get("model")
+        
+        final_output = "".join(parts)
+        if final_output:
+            self._cache_output(agent_instance, run_key, final_output, model)
+            self._notify(agent_instance, query, final_output)
+            if remember:
+                self.sessions.append(session_id, query, final_output)
+        yield {"type": "done", "session_id": session_id, "usage": usage, "model": model, "cached": False}
+    
     def run_sync(
         self,
         agent: Any,
@@ -65,12 +206,6 @@ class AgentRunner:
         # Use official Runner.run_sync for sync execution
         result = Runner.run_sync(agent_instance, query)
         
-        # Create a result object with session_id for compatibility
-        class Result:
-            def __init__(self, final_output: str, session_id: str):
-                self.final_output = final_output
-                self.session_id = session_id
-        
         return Result(
             final_output=result.final_output,
             session_id=session_id or self.create_session_id()
@@ -2,9 +2,21 @@
 Base classes for OpenAI Agents SDK
 Using OpenAI SDK directly with a simple Agent wrapper
 """
-from typing import Optional, Dict, Any
-from openai import OpenAI, AsyncOpenAI
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional, Dict, Any, AsyncIterator, Awaitable, Callable, List, Tuple
+import hashlib
 import os
+import time
+from .client_pool import client_pool
+from .errors import AgentError, classify_error
+from .model_router import NON_FAULT_ERRORS, model_router
+from .rate_limiter import rate_limiter
+from .session_store import estimate_tokens
+from .schemas import output_note_for, response_format_for
+from utils.metrics import agent_errors, agent_fallbacks, agent_in_flight, agent_run_seconds, agent_tokens
+
+if TYPE_CHECKING:
+    from openai import OpenAI, AsyncOpenAI
 
 # Try to load environment variables (ignore errors if .env file has issues)
 try:
@@ -18,20 +30,83 @@ try:
 except Exception:
     pass  # Environment variables may already be set
 
-# Initialize OpenAI clients
-def get_client():
-    """Get OpenAI client"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set")
-    return OpenAI(api_key=api_key)
+# OpenAI clients come from the process-wide pool so connections are reused
+def get_client() -> "OpenAI":
+    """Get pooled OpenAI client"""
+    return client_pool.get_client()
+
+def get_async_client() -> "AsyncOpenAI":
+    """Get pooled async OpenAI client"""
+    return client_pool.get_async_client()
+
+
+def friendly_error(e: Exception) -> AgentError:
+    """Map an OpenAI SDK error to a typed, user-facing ``AgentError``"""
+    return classify_error(e)
+
+
+def error_class(e: BaseException) -> str:
+    """Class of an agent failure for metrics: quota, rate_limit, auth, timeout, unavailable, bad_request or other"""
+    return classify_error(e).kind
+
+
+def record_usage(agent: "Agent", usage: Any, model: Optional[str] = None):
+    """Count prompt/completion tokens from ``response.usage`` (object or dict)"""
+    if usage is None:
+        return
+    if not isinstance(usage, dict):
+        usage = {"prompt_tokens": getattr(usage, "prompt_tokens", 0), "completion_tokens": getattr(usage, "completion_tokens", 0)}
+    agent_id = agent.agent_id or agent.name
+    model = model or agent.model
+    agent_tokens.labels(agent_id, model, "prompt").inc(usage.get("prompt_tokens") or 0)
+    agent_tokens.labels(agent_id, model, "completion").inc(usage.get("completion_tokens") or 0)
+
 
-def get_async_client():
-    """Get async OpenAI client"""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set")
-    return AsyncOpenAI(api_key=api_key)
+async def routed_call(
+    agent: "Agent",
+    kind: str,
+    messages: List[Dict[str, Any]],
+    request: Callable[[str], Awaitable[Any]]
+) -> Tuple[Any, str, int]:
+    """Await ``request(model)`` on the models the router picks, in order.
+
+    Every model but the last fails fast (no retries, no queueing), so a slow,
+    rate-limited or failing primary falls through to the next model. Returns
+    (response, model, estimated cost).
+    """
+    agent_id = agent.agent_id or agent.name
+    cost = rate_limiter.estimate_cost(messages)
+    # Input size is what the caller sent (query and history), not the fixed instructions
+    input_tokens = sum(estimate_tokens(str(m["content"])) for m in messages if m["role"] != "system")
+    models, _ = model_router.candidates(
+        agent, kind, input_tokens, lambda model: rate_limiter.wait_time(model, cost)
+    )
+    for index, model in enumerate(models):
+        last = index == len(models) - 1
+        # Breakers are checked only for the model about to be called, so a
+        # half-open probe slot is not used up by candidates that are never tried
+        if not model_router.allow(model) and not last:
+            continue
+        start = time.perf_counter()
+        try:
+            response = await rate_limiter.call(
+                model,
+                cost,
+                lambda: request(model),
+                max_retries=None if last else 0,
+                max_wait=None if last else 0
+            )
+        except AgentError as error:
+            # Only faults of the model count against its breaker
+            if error.kind not in NON_FAULT_ERRORS:
+                model_router.record(agent, model, kind, None, ok=False)
+            if last or not error.retryable:
+                raise
+            model_router.fallbacks += 1
+            agent_fallbacks.labels(agent_id, models[index + 1]).inc()
+            continue
+        model_router.record(agent, model, kind, time.perf_counter() - start, ok=True)
+        return response, model, cost
 
 
 class Agent:
@@ -43,13 +118,50 @@ class Agent:
         instructions: str,
         model: str = "gpt-4o",
         tools: Optional[list] = None,
-        guardrails: Optional[list] = None
+        guardrails: Optional[list] = None,
+        temperature: float = 0.7,
+        cache_ttl: Optional[float] = None,
+        cache_bucketed: bool = False,
+        cache_exact_query: bool = False,
+        light_model: Optional[str] = None,
+        light_input_tokens: Optional[int] = None,
+        fallback_models: Optional[List[str]] = None,
+        latency_slo: Optional[float] = None
     ):
         self.name = name
         self.instructions = instructions
         self.model = model
         self.tools = tools or []
         self.guardrails = guardrails or []
+        self.temperature = temperature
+        # Seconds a result stays fresh in the result cache (0 disables caching).
+        # With cache_bucketed, results expire at fixed wall-clock boundaries.
+        self.cache_ttl = cache_ttl if cache_ttl is not None else float(os.getenv("RESULT_CACHE_DEFAULT_TTL", "300"))
+        self.cache_bucketed = cache_bucketed
+        # Key cached results on the exact query text (content to summarize) instead of the normalized one
+        self.cache_exact_query = cache_exact_query
+        # Model routing: light_model serves inputs up to light_input_tokens (estimated),
+        # fallback_models are tried in order when the routed model is slow or failing
+        # (opt-in per agent; MODEL_FALLBACKS applies to agents that set none),
+        # and latency_slo (seconds) is the p95 a model must meet to stay first choice
+        self.light_model = light_model
+        self.light_input_tokens = light_input_tokens if light_input_tokens is not None else int(os.getenv("MODEL_LIGHT_INPUT_TOKENS", "2000"))
+        if fallback_models is None:
+            fallback_models = [m.strip() for m in os.getenv("MODEL_FALLBACKS", "").split(",") if m.strip()]
+        self.fallback_models = [m for m in fallback_models if m != model]
+        self.latency_slo = latency_slo if latency_slo is not None else float(os.getenv("MODEL_LATENCY_SLO", "30"))
+        # Stable id assigned by the agent registry (agent_type); caches and metrics key off it
+        self.agent_id: Optional[str] = None
+    
+    @cached_property
+    def instructions_hash(self) -> str:
+        """SHA-256 of the instructions, computed once per agent"""
+        return hashlib.sha256(self.instructions.encode("utf-8")).hexdigest()
+    
+    @cached_property
+    def system_message(self) -> Dict[str, str]:
+        """The instructions as a chat message, built once and reused by every run"""
+        return {"role": "system", "content": self.instructions}
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert agent to dictionary for API calls"""
@@ -57,59 +169,148 @@ class Agent:
             "name": self.name,
             "instructions": self.instructions,
             "model": self.model,
-            "tools": self.tools
+            "tools": self.tools,
+            "temperature": self.temperature
         }
 
 
 class Runner:
-    """Simple Runner for executing agents"""
+    """Simple Runner for executing agents.
+
+    Upstream calls go through the per-model rate limiter, which queues bursts
+    and retries rate-limited or transient failures; anything else is raised as
+    a typed ``AgentError``.
+    """
     
     @staticmethod
-    async def run(agent: Agent, query: str) -> Any:
-        """Run an agent asynchronously"""
+    async def run(
+        agent: Agent,
+        query: str,
+        response_model: Optional[type] = None,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> Any:
+        """Run an agent asynchronously.
+
+        With ``response_model`` (a pydantic model) the model is asked for JSON
+        matching its schema and the validated object is returned as ``parsed``.
+        ``history`` (earlier messages of the session) is sent before ``query``.
+        """
+        agent_id = agent.agent_id or agent.name
         try:
+            messages = [agent.system_message]
+            extra = {}
+            if response_model is not None:
+                messages.append({"role": "system", "content": output_note_for(response_model)})
+                extra["response_format"] = response_format_for(response_model)
+            if history:
+                messages.extend(history)
+            messages.append({"role": "user", "content": query})
+            
             async_client = get_async_client()
-            response = await async_client.chat.completions.create(
-                model=agent.model,
-                messages=[
-                    {"role": "system", "content": agent.instructions},
-                    {"role": "user", "content": query}
-                ],
-                temperature=0.7
-            )
+            
+            async def request(model: str):
+                with agent_in_flight.track(agent_id), agent_run_seconds.labels(agent_id, model, "run").time():
+                    return await async_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=agent.temperature,
+                        **extra
+                    )
+            
+            kind = "structured" if response_model is not None else "run"
+            response, model, cost = await routed_call(agent, kind, messages, request)
+            rate_limiter.settle(model, cost, response.usage)
+            record_usage(agent, response.usage, model)
             
             class Result:
-                def __init__(self, final_output: str):
+                def __init__(self, final_output: str, parsed: Any = None, model: Optional[str] = None):
                     self.final_output = final_output
+                    self.parsed = parsed
+                    self.model = model
             
-            return Result(
-                final_output=response.choices[0].message.content or ""
-            )
+            final_output = response.choices[0].message.content or ""
+            parsed = response_model.model_validate_json(final_output) if response_model is not None else None
+            return Result(final_output=final_output, parsed=parsed, model=model)
         except Exception as e:
-            error_str = str(e)
-            # Check for quota/rate limit errors
-            if "429" in error_str or "insufficient_quota" in error_str or "quota" in error_str.lower():
-                raise Exception("OpenAI API quota exceeded. Please check your OpenAI account billing and add credits. Visit https://platform.openai.com/account/billing to add credits.")
-            elif "401" in error_str or "invalid_api_key" in error_str.lower():
-                raise Exception("Invalid OpenAI API key. Please check your OPENAI_API_KEY in the .env file.")
-            elif "rate_limit" in error_str.lower():
-                raise Exception("OpenAI API rate limit exceeded. Please wait a moment and try again.")
-            else:
-                raise Exception(f"Error running agent: {str(e)}")
+            error = classify_error(e)
+            agent_errors.labels(agent_id, error.kind).inc()
+            if error is e:
+                raise
+            raise error from e
+    
+    @staticmethod
+    async def stream(
+        agent: Agent,
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run an agent with token streaming.
+
+        Yields ``{"type": "delta", "content": str}`` events followed by a single
+        ``{"type": "usage", "usage": dict | None, "model": str}`` event. Only
+        opening the stream is retried or routed to a fallback model; a failure
+        after the first delta is raised.
+        """
+        agent_id = agent.agent_id or agent.name
+        try:
+            async_client = get_async_client()
+            messages = [agent.system_message, *(history or []), {"role": "user", "content": query}]
+            usage = None
+            started = time.perf_counter()
+            
+            async def open_stream(model: str):
+                nonlocal started
+                started = time.perf_counter()
+                with agent_in_flight.track(agent_id):
+                    return await async_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=agent.temperature,
+                        stream=True,
+                        stream_options={"include_usage": True}
+                    )
+            
+            stream, model, cost = await routed_call(agent, "stream", messages, open_stream)
+            # Timed from the last attempt until the last chunk; time spent by the consumer between chunks is included
+            with agent_in_flight.track(agent_id):
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        usage = chunk.usage.model_dump()
+                    if chunk.choices:
+                        content = chunk.choices[0].delta.content
+                        if content:
+                            yield {"type": "delta", "content": content}
+            agent_run_seconds.labels(agent_id, model, "stream").observe(time.perf_counter() - started)
+            rate_limiter.settle(model, cost, usage)
+            record_usage(agent, usage, model)
+            yield {"type": "usage", "usage": usage, "model": model}
+        except Exception as e:
+            error = classify_error(e)
+            agent_errors.labels(agent_id, error.kind).inc()
+            if error is e:
+                raise
+            raise error from e
     
     @staticmethod
     def run_sync(agent: Agent, query: str) -> Any:
         """Run an agent synchronously"""
+        agent_id = agent.agent_id or agent.name
         try:
             client = get_client()
-            response = client.chat.completions.create(
-                model=agent.model,
-                messages=[
-                    {"role": "system", "content": agent.instructions},
-                    {"role": "user", "content": query}
-                ],
-                temperature=0.7
-            )
+            messages = [agent.system_message, {"role": "user", "content": query}]
+            cost = rate_limiter.estimate_cost(messages)
+            
+            def request():
+                with agent_in_flight.track(agent_id), agent_run_seconds.labels(agent_id, agent.model, "sync").time():
+                    return client.chat.completions.create(
+                        model=agent.model,
+                        messages=messages,
+                        temperature=agent.temperature
+                    )
+            
+            response = rate_limiter.call_sync(agent.model, cost, request)
+            rate_limiter.settle(agent.model, cost, response.usage)
+            record_usage(agent, response.usage)
             
             class Result:
                 def __init__(self, final_output: str):
@@ -119,17 +320,12 @@ class Runner:
                 final_output=response.choices[0].message.content or ""
             )
         except Exception as e:
-            error_str = str(e)
-            # Check for quota/rate limit errors
-            if "429" in error_str or "insufficient_quota" in error_str or "quota" in error_str.lower():
-                raise Exception("OpenAI API quota exceeded. Please check your OpenAI account billing and add credits. Visit https://platform.openai.com/account/billing to add credits.")
-            elif "401" in error_str or "invalid_api_key" in error_str.lower():
-                raise Exception("Invalid OpenAI API key. Please check your OPENAI_API_KEY in the .env file.")
-            elif "rate_limit" in error_str.lower():
-                raise Exception("OpenAI API rate limit exceeded. Please wait a moment and try again.")
-            else:
-                raise Exception(f"Error running agent: {str(e)}")
+            error = classify_error(e)
+            agent_errors.labels(agent_id, error.kind).inc()
+            if error is e:
+                raise
+            raise error from e
 
 
 # Re-export for convenience
-__all__ = ["Agent", "Runner", "get_client", "get_async_client"]
+__all__ = ["Agent", "Runner", "get_client", "get_async_client", "friendly_error", "error_class", "routed_call"]
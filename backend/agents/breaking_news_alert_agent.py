@@ -83,6 +83,11 @@ Always ensure:
 - Timestamps are included
 - Location/region is specified
 
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=60,
+            cache_bucketed=True,
+            # Alerts are time critical: fall back rather than wait
+            fallback_models=["gpt-4o-mini"],
+            latency_slo=20
         )
 
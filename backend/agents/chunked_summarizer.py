@@ -0,0 +1,196 @@
+"""
+Chunked Summarizer - Map-reduce summarization for content too long for one prompt
+Text is split at paragraph and then sentence boundaries into chunks of a token
+budget, each chunk is condensed into notes in parallel, and the notes are
+merged level by level until they fit one prompt for the final summary.
+Chunk and merge outputs are cached by a hash of their exact text; chunk boundaries depend
+only on nearby text, so editing one part of a document re-summarizes just the
+chunks around the edit.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import os
+import re
+
+from .result_cache import ResultCache, make_cache_key
+from .session_store import estimate_tokens
+from .summary_batcher import summary_prompt
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?[A-Z0-9])")
+
+# Deepest merge hierarchy before the notes are used as they are
+MAX_REDUCE_LEVELS = 6
+
+
+def split_units(text: str, max_tokens: int) -> List[str]:
+    """Paragraphs of ``text``; paragraphs over ``max_tokens`` are split into sentences, then hard-wrapped"""
+    units: List[str] = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if estimate_tokens(paragraph) <= max_tokens:
+            units.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            if estimate_tokens(sentence) <= max_tokens:
+                units.append(sentence)
+            else:
+                width = max_tokens * 4
+                units.extend(sentence[i:i + width] for i in range(0, len(sentence), width))
+    return units
+
+
+def _is_boundary(unit: str, divisor: int) -> bool:
+    digest = hashlib.blake2b(unit.encode("utf-8"), digest_size=4).digest()
+    return int.from_bytes(digest, "big") % divisor == 0
+
+
+def pack(units: List[str], max_tokens: int, separator: str = "\n\n", divisor: int = 4) -> List[str]:
+    """Group consecutive units into pieces of at most ``max_tokens``.
+
+    Besides the size limit, a piece ends after a unit whose hash hits a
+    boundary once it is at least half full. Boundaries are a property of the
+    units themselves, so an edit shifts at most the pieces up to the next
+    boundary instead of every piece after it.
+    """
+    pieces: List[str] = []
+    current: List[str] = []
+    used = 0
+    for unit in units:
+        tokens = estimate_tokens(unit)
+        if current and used + tokens > max_tokens:
+            pieces.append(separator.join(current))
+            current, used = [], 0
+        current.append(unit)
+        used += tokens
+        if used >= max_tokens // 2 and _is_boundary(unit, divisor):
+            pieces.append(separator.join(current))
+            current, used = [], 0
+    if current:
+        pieces.append(separator.join(current))
+    return pieces
+
+
+def chunk_prompt(text: str) -> str:
+    """Prompt that condenses one chunk of a longer document into notes"""
+    return (
+        "This is one section of a longer document. Condense it into concise factual notes "
+        "as plain bullet points, keeping names, numbers and claims. Do not use the summary "
+        f"format; the notes will be combined with notes from the other sections.\n\n{text}"
+    )
+
+
+def merge_prompt(notes: str) -> str:
+    """Prompt that merges notes from consecutive sections into one set"""
+    return (
+        "These are notes from consecutive sections of one document. Merge them into one "
+        "shorter set of plain bullet-point notes, dropping repetition and keeping every "
+        f"distinct fact. Do not use the summary format.\n\n{notes}"
+    )
+
+
+class ChunkedSummarizer:
+    """Summarizes long content through an AgentRunner with a map step and hierarchical reduce.
+
+    ``threshold_tokens`` is the input size above which ``needed`` says to use
+    the pipeline; ``chunk_tokens`` bounds every chunk and every merge input.
+    """
+
+    def __init__(
+        self,
+        runner: Any,
+        threshold_tokens: Optional[int] = None,
+        chunk_tokens: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        cache: Optional[ResultCache] = None,
+        cache_ttl: Optional[float] = None
+    ):
+        self.runner = runner
+        self.threshold_tokens = threshold_tokens or int(os.getenv("SUMMARIZE_CHUNK_THRESHOLD_TOKENS", "3000"))
+        self.chunk_tokens = chunk_tokens or int(os.getenv("SUMMARIZE_CHUNK_TOKENS", "1500"))
+        self.concurrency = concurrency or int(os.getenv("SUMMARIZE_CHUNK_CONCURRENCY", "4"))
+        self.cache = cache or ResultCache(int(os.getenv("CHUNK_CACHE_MAX_BYTES", str(16 * 1024 * 1024))))
+        self.cache_ttl = cache_ttl if cache_ttl is not None else float(os.getenv("CHUNK_CACHE_TTL", "86400"))
+
+    def needed(self, content: str) -> bool:
+        """Whether ``content`` is too long for a single summary prompt"""
+        return estimate_tokens(content) > self.threshold_tokens
+
+    def chunks(self, content: str) -> List[str]:
+        return pack(split_units(content, self.chunk_tokens), self.chunk_tokens)
+
+    async def _condense(self, agent: Any, stage: str, text: str, semaphore: asyncio.Semaphore, stats: Dict[str, int]) -> str:
+        agent_instance = agent.agent if hasattr(agent, "agent") else agent
+        key = make_cache_key(agent_instance, text, f"chunk:{stage}", exact=True)
+        notes = self.cache.get(key)
+        if notes is not None:
+            stats["cached"] += 1
+            return notes
+        async with semaphore:
+            result = await self.runner.run_async(
+                agent=agent,
+                query=chunk_prompt(text) if stage == "map" else merge_prompt(text),
+                use_cache=False,
+                remember=False
+            )
+        stats["calls"] += 1
+        notes = (result.final_output or "").strip() or text
+        self.cache.set(key, notes, self.cache_ttl)
+        return notes
+
+    async def condense(self, agent: Any, content: str, semaphore: Optional[asyncio.Semaphore] = None) -> Tuple[str, Dict[str, int]]:
+        """Notes for ``content`` that fit one prompt, plus chunks/levels/calls/cached counts.
+
+        ``semaphore`` bounds the model calls; pass one to share a caller's limit.
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.concurrency)
+        stats = {"chunks": 0, "levels": 0, "calls": 0, "cached": 0}
+        chunks = self.chunks(content)
+        stats["chunks"] = len(chunks)
+        notes = await asyncio.gather(*(self._condense(agent, "map", chunk, semaphore, stats) for chunk in chunks))
+
+        while len(notes) > 1 and sum(estimate_tokens(n) for n in notes) > self.chunk_tokens:
+            if stats["levels"] >= MAX_REDUCE_LEVELS:
+                break
+            groups = pack(notes, self.chunk_tokens)
+            if len(groups) >= len(notes):
+                # Every note is already a full group on its own; merging cannot shrink further
+                break
+            stats["levels"] += 1
+            notes = await asyncio.gather(*(self._condense(agent, "reduce", group, semaphore, stats) for group in groups))
+        return "\n\n".join(notes), stats
+
+    async def summarize(
+        self,
+        agent: Any,
+        content: str,
+        summary_type: str,
+        session_id: Optional[str] = None,
+        remember: bool = True,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> Tuple[Any, Dict[str, int]]:
+        """Final ``summary_type`` summary of long content: the runner Result and the pipeline stats"""
+        semaphore = semaphore or asyncio.Semaphore(self.concurrency)
+        notes, stats = await self.condense(agent, content, semaphore)
+        async with semaphore:
+            result = await self.runner.run_async(
+                agent=agent,
+                query=summary_prompt(notes, summary_type),
+                session_id=session_id,
+                remember=remember
+            )
+        stats["calls"] += 0 if result.cached else 1
+        return result, stats
+
+    def stats(self) -> dict:
+        return {
+            "threshold_tokens": self.threshold_tokens,
+            "chunk_tokens": self.chunk_tokens,
+            "cache": self.cache.stats(),
+        }
+
+
+__all__ = ["ChunkedSummarizer", "split_units", "pack", "chunk_prompt", "merge_prompt"]
@@ -0,0 +1,139 @@
+"""
+Client Pool - Process-wide pooled OpenAI clients with lifespan management
+One AsyncOpenAI client (and httpx connection pool) per (api key, base URL)
+The openai and httpx packages are imported when the first client is created,
+which keeps them off the import path of a cold start.
+"""
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+import asyncio
+import os
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import OpenAI, AsyncOpenAI
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class PoolSettings:
+    """Connection pool settings, read from the environment"""
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        timeout: Optional[float] = None,
+        prewarm_connections: Optional[int] = None
+    ):
+        self.max_connections = max_connections if max_connections is not None else _env_int("OPENAI_MAX_CONNECTIONS", 100)
+        self.max_keepalive_connections = max_keepalive_connections if max_keepalive_connections is not None else _env_int("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20)
+        self.keepalive_expiry = keepalive_expiry if keepalive_expiry is not None else _env_float("OPENAI_KEEPALIVE_EXPIRY", 60.0)
+        self.timeout = timeout if timeout is not None else _env_float("OPENAI_TIMEOUT", 120.0)
+        self.prewarm_connections = prewarm_connections if prewarm_connections is not None else _env_int("OPENAI_PREWARM_CONNECTIONS", 2)
+
+    def limits(self) -> "httpx.Limits":
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+
+class ClientPool:
+    """Holds one pooled OpenAI client per (api key, base URL) for the whole process"""
+
+    def __init__(self, settings: Optional[PoolSettings] = None):
+        self.settings = settings or PoolSettings()
+        self._async_clients: Dict[Tuple[str, Optional[str]], "AsyncOpenAI"] = {}
+        self._sync_clients: Dict[Tuple[str, Optional[str]], "OpenAI"] = {}
+
+    @staticmethod
+    def _resolve(api_key: Optional[str], base_url: Optional[str]) -> Tuple[str, Optional[str]]:
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is not set")
+        return api_key, base_url or os.getenv("OPENAI_BASE_URL") or None
+
+    def get_async_client(self, api_key: Optional[str] = None, base_url: Optional[str] = None) -> "AsyncOpenAI":
+        """Get (or create) the pooled async client for this key and base URL"""
+        key = self._resolve(api_key, base_url)
+        client = self._async_clients.get(key)
+        if client is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            http_client = httpx.AsyncClient(
+                limits=self.settings.limits(),
+                timeout=self.settings.timeout
+            )
+            # Retries are handled by the rate limiter, which also honours Retry-After
+            client = AsyncOpenAI(api_key=key[0], base_url=key[1], http_client=http_client, max_retries=0)
+            self._async_clients[key] = client
+        return client
+
+    def get_client(self, api_key: Optional[str] = None, base_url: Optional[str] = None) -> "OpenAI":
+        """Get (or create) the pooled sync client for this key and base URL"""
+        key = self._resolve(api_key, base_url)
+        client = self._sync_clients.get(key)
+        if client is None:
+            import httpx
+            from openai import OpenAI
+
+            http_client = httpx.Client(
+                limits=self.settings.limits(),
+                timeout=self.settings.timeout
+            )
+            client = OpenAI(api_key=key[0], base_url=key[1], http_client=http_client, max_retries=0)
+            self._sync_clients[key] = client
+        return client
+
+    async def prewarm(self, api_key: Optional[str] = None, base_url: Optional[str] = None) -> int:
+        """Open keep-alive connections ahead of the first request. Returns connections warmed."""
+        client = self.get_async_client(api_key, base_url)
+        count = max(self.settings.prewarm_connections, 0)
+
+        async def _touch():
+            # Listing models is free and completes the TCP+TLS handshake
+            await client.models.list()
+
+        results = await asyncio.gather(*[_touch() for _ in range(count)], return_exceptions=True)
+        return sum(1 for r in results if not isinstance(r, BaseException))
+
+    async def startup(self):
+        """Create the default client and pre-warm its connections"""
+        try:
+            warmed = await self.prewarm()
+            print(f"OpenAI client pool ready ({warmed} connections pre-warmed)")
+        except ValueError as e:
+            # No API key configured yet - clients are created lazily later
+            print(f"OpenAI client pool not pre-warmed: {e}")
+
+    async def shutdown(self):
+        """Close every pooled client"""
+        for client in self._async_clients.values():
+            await client.close()
+        for client in self._sync_clients.values():
+            client.close()
+        self._async_clients.clear()
+        self._sync_clients.clear()
+
+
+client_pool = ClientPool()
+
+
+__all__ = ["ClientPool", "PoolSettings", "client_pool"]
@@ -0,0 +1,127 @@
+"""
+DAG Executor - Runs dependent async steps with structured concurrency
+Each node starts as soon as the nodes it depends on have finished, inside one
+asyncio.TaskGroup: if a required node fails or the caller is cancelled, every
+other node is cancelled too. Nodes have their own timeout; optional nodes
+that fail or time out yield None so the rest of the graph can still run.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import time
+
+
+@dataclass(frozen=True)
+class Node:
+    """One step: ``run(deps)`` receives {dependency name: result}"""
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    deps: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    optional: bool = False
+
+
+@dataclass
+class NodeReport:
+    status: str  # ok, timeout or error
+    duration_ms: float
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        report = {"status": self.status, "duration_ms": self.duration_ms}
+        if self.error:
+            report["error"] = self.error
+        return report
+
+
+@dataclass
+class DAGResult:
+    results: Dict[str, Any]
+    reports: Dict[str, NodeReport] = field(default_factory=dict)
+    wall_ms: float = 0.0
+
+
+class NodeFailed(Exception):
+    """A required node failed or timed out"""
+
+    def __init__(self, node: str, cause: BaseException):
+        super().__init__(f"Node '{node}' failed: {cause}")
+        self.node = node
+        self.cause = cause
+
+
+def topological_order(nodes: Iterable[Node]) -> List[Node]:
+    """Nodes ordered so every node follows its dependencies; raises ValueError on unknown deps or cycles"""
+    by_name = {node.name: node for node in nodes}
+    order: List[Node] = []
+    state: Dict[str, int] = {}  # 1 visiting, 2 done
+
+    def visit(name: str, path: Tuple[str, ...]):
+        if name not in by_name:
+            raise ValueError(f"Unknown dependency '{name}' of '{path[-1]}'")
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + (name,))}")
+        state[name] = 1
+        for dep in by_name[name].deps:
+            visit(dep, path + (name,))
+        state[name] = 2
+        order.append(by_name[name])
+
+    for name in by_name:
+        visit(name, ())
+    return order
+
+
+class DAGExecutor:
+    """Executes a fixed graph of nodes; ``sequential=True`` runs them one at a time (for comparison)"""
+
+    def __init__(self, nodes: Iterable[Node]):
+        self.nodes = topological_order(nodes)
+
+    async def _run_node(self, node: Node, deps: Dict[str, Any], reports: Dict[str, NodeReport]) -> Any:
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(node.timeout):
+                result = await node.run(deps)
+            reports[node.name] = NodeReport("ok", round((time.perf_counter() - start) * 1000, 1))
+            return result
+        except Exception as e:
+            status = "timeout" if isinstance(e, TimeoutError) else "error"
+            message = f"timed out after {node.timeout}s" if status == "timeout" else str(e)
+            reports[node.name] = NodeReport(status, round((time.perf_counter() - start) * 1000, 1), message)
+            if node.optional:
+                return None
+            raise NodeFailed(node.name, e) from e
+
+    async def run(self, sequential: bool = False) -> DAGResult:
+        reports: Dict[str, NodeReport] = {}
+        start = time.perf_counter()
+        if sequential:
+            results: Dict[str, Any] = {}
+            for node in self.nodes:
+                results[node.name] = await self._run_node(node, {d: results[d] for d in node.deps}, reports)
+        else:
+            tasks: Dict[str, asyncio.Task] = {}
+
+            async def run_after_deps(node: Node) -> Any:
+                deps = {d: await tasks[d] for d in node.deps}
+                return await self._run_node(node, deps, reports)
+
+            try:
+                async with asyncio.TaskGroup() as group:
+                    # Topological order guarantees dependency tasks exist before their dependents
+                    for node in self.nodes:
+                        tasks[node.name] = group.create_task(run_after_deps(node))
+            except ExceptionGroup as group:
+                # Surface the first failed node rather than the group
+                failed = next((e for e in group.exceptions if isinstance(e, NodeFailed)), None)
+                if failed is None:
+                    raise
+                raise failed from None
+            results = {name: task.result() for name, task in tasks.items()}
+        return DAGResult(results=results, reports=reports, wall_ms=round((time.perf_counter() - start) * 1000, 1))
+
+
+__all__ = ["Node", "NodeReport", "DAGResult", "DAGExecutor", "NodeFailed", "topological_order"]
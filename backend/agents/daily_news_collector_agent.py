@@ -149,6 +149,10 @@ Always ensure:
 - Location/region is specified for each news item
 - News is organized by priority and importance
 
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=900,
+            cache_bucketed=True,
+            fallback_models=["gpt-4o-mini"],
+            latency_slo=45
         )
 
@@ -0,0 +1,128 @@
+"""
+Agent Errors - Typed failures of upstream model calls
+OpenAI SDK exceptions are classified by type (not by message text) into a few
+classes that carry an HTTP status, whether a retry can help and the server's
+Retry-After hint. The SDK is only consulted once an error has been raised.
+"""
+from typing import Optional
+import sys
+
+
+class AgentError(Exception):
+    """Base class for agent failures surfaced to API clients"""
+    kind = "other"
+    status_code = 500
+    retryable = False
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        # Seconds the upstream asked us to wait before retrying, if it said so
+        self.retry_after = retry_after
+
+
+class RateLimitedError(AgentError):
+    kind = "rate_limit"
+    status_code = 429
+    retryable = True
+
+
+class QuotaExceededError(AgentError):
+    kind = "quota"
+    status_code = 402
+    retryable = False
+
+
+class AuthError(AgentError):
+    kind = "auth"
+    status_code = 401
+    retryable = False
+
+
+class UpstreamTimeoutError(AgentError):
+    kind = "timeout"
+    status_code = 504
+    retryable = True
+
+
+class UpstreamUnavailableError(AgentError):
+    kind = "unavailable"
+    status_code = 503
+    retryable = True
+
+
+class BadRequestError(AgentError):
+    kind = "bad_request"
+    status_code = 400
+    retryable = False
+
+
+QUOTA_MESSAGE = "OpenAI API quota exceeded. Please check your OpenAI account billing and add credits. Visit https://platform.openai.com/account/billing to add credits."
+AUTH_MESSAGE = "Invalid OpenAI API key. Please check your OPENAI_API_KEY in the .env file."
+RATE_LIMIT_MESSAGE = "OpenAI API rate limit exceeded. Please wait a moment and try again."
+
+
+def retry_after_seconds(e: BaseException) -> Optional[float]:
+    """The ``retry-after-ms`` / ``retry-after`` header of an SDK error response, in seconds"""
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(float(value) * scale, 0.0)
+        except ValueError:
+            # HTTP-date form; not sent by the OpenAI API
+            continue
+    return None
+
+
+def _error_code(e: BaseException) -> str:
+    code = getattr(e, "code", None)
+    body = getattr(e, "body", None)
+    if not code and isinstance(body, dict):
+        code = body.get("code") or (body.get("error") or {}).get("code")
+    return str(code or "")
+
+
+def classify_error(e: BaseException) -> AgentError:
+    """Map an exception from a model call to a typed ``AgentError``"""
+    if isinstance(e, AgentError):
+        return e
+    openai = sys.modules.get("openai")
+    if openai is not None and isinstance(e, openai.OpenAIError):
+        retry_after = retry_after_seconds(e)
+        if isinstance(e, openai.RateLimitError):
+            if _error_code(e) == "insufficient_quota":
+                return QuotaExceededError(QUOTA_MESSAGE)
+            return RateLimitedError(RATE_LIMIT_MESSAGE, retry_after)
+        if isinstance(e, (openai.AuthenticationError, openai.PermissionDeniedError)):
+            return AuthError(AUTH_MESSAGE)
+        if isinstance(e, openai.APITimeoutError):
+            return UpstreamTimeoutError(f"OpenAI API request timed out: {e}")
+        if isinstance(e, openai.APIConnectionError):
+            return UpstreamUnavailableError(f"Could not reach the OpenAI API: {e}")
+        if isinstance(e, openai.InternalServerError) or (
+            isinstance(e, openai.APIStatusError) and e.status_code in (408, 409)
+        ):
+            return UpstreamUnavailableError(f"OpenAI API is temporarily unavailable: {e}", retry_after)
+        if isinstance(e, (openai.BadRequestError, openai.NotFoundError, openai.UnprocessableEntityError)):
+            return BadRequestError(f"OpenAI API rejected the request: {e}")
+    if isinstance(e, TimeoutError):
+        return UpstreamTimeoutError(f"Agent call timed out: {e}")
+    return AgentError(f"Error running agent: {e}")
+
+
+__all__ = [
+    "AgentError",
+    "RateLimitedError",
+    "QuotaExceededError",
+    "AuthError",
+    "UpstreamTimeoutError",
+    "UpstreamUnavailableError",
+    "BadRequestError",
+    "classify_error",
+    "retry_after_seconds",
+]
@@ -131,6 +131,8 @@ Always ensure:
 - Sources are properly attributed to Forbes
 
 Maintain journalistic integrity and cite Forbes sources properly.
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=3600,
+            latency_slo=60
         )
 
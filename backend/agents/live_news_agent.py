@@ -105,6 +105,11 @@ Always ensure:
 - Only AI-related content is included
 - You MUST search for and provide REAL AI news, not just say you cannot provide it
 
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=60,
+            cache_bucketed=True,
+            # Polled feed: a smaller model's answer beats a late one
+            fallback_models=["gpt-4o-mini"],
+            latency_slo=20
         )
 
@@ -0,0 +1,177 @@
+"""
+Model Router - Picks the model for each agent call
+A route is an ordered chain of models with a latency SLO. The primary is the
+agent's light model for small inputs, else its main model, followed by its
+fallbacks. Models whose circuit breaker is open, whose recent p95 latency
+misses the SLO, or whose rate limit would make the call queue are moved behind
+the healthy ones, so calls degrade to a smaller model instead of waiting.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+import os
+import threading
+import time
+
+
+# Failures that say nothing about a model's health: the caller's request or
+# account is at fault, or (rate limits) the limiter already paused the model
+NON_FAULT_ERRORS = frozenset({"rate_limit", "quota", "auth", "bad_request"})
+
+
+@dataclass(frozen=True)
+class Route:
+    """Models to try, in order, and the latency the call should meet (seconds)"""
+    models: Tuple[str, ...]
+    slo: float
+
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures; every ``reset_after`` seconds one probe call is let through"""
+
+    def __init__(self, threshold: int, reset_after: float):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_after else "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state this takes the probe slot"""
+        state = self.state
+        if state == "half_open":
+            # Let this call probe; the next probe waits another reset period
+            self.opened_at = time.monotonic()
+            return True
+        return state == "closed"
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def failure(self):
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+
+class ModelRouter:
+    """Routes agent calls by agent, request type and input size.
+
+    Request types are ``run``, ``structured`` (a response model) and ``stream``.
+    Latency is tracked per (agent, model, request type), since output length
+    differs per agent; circuit breakers are per model. A model that misses its
+    SLO still gets one call in ``probe_every`` so it can recover.
+    """
+
+    def __init__(
+        self,
+        breaker_threshold: Optional[int] = None,
+        breaker_reset: Optional[float] = None,
+        window: int = 50,
+        min_samples: int = 5,
+        probe_every: int = 10
+    ):
+        self.breaker_threshold = breaker_threshold or int(os.getenv("MODEL_BREAKER_THRESHOLD", "5"))
+        self.breaker_reset = breaker_reset or float(os.getenv("MODEL_BREAKER_RESET", "30"))
+        self.stream_slo = float(os.getenv("MODEL_STREAM_SLO", "5"))
+        self.window = window
+        self.min_samples = min_samples
+        self.probe_every = probe_every
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[Tuple[str, str, str], Deque[float]] = {}
+        self._probes: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+        self.fallbacks = 0
+
+    def route(self, agent, kind: str, input_tokens: int) -> Route:
+        """The configured chain for this call, before health is considered"""
+        primary = agent.model
+        if agent.light_model and input_tokens <= agent.light_input_tokens:
+            primary = agent.light_model
+        models = tuple(dict.fromkeys([primary, agent.model, *agent.fallback_models]))
+        # Streams are judged on time to open (first token), not full completion
+        slo = self.stream_slo if kind == "stream" else agent.latency_slo
+        return Route(models=models, slo=slo)
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers.setdefault(model, CircuitBreaker(self.breaker_threshold, self.breaker_reset))
+        return breaker
+
+    def p95(self, agent_id: str, model: str, kind: str) -> Optional[float]:
+        samples = self._latencies.get((agent_id, model, kind))
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def _slow(self, agent_id: str, model: str, kind: str, slo: float) -> bool:
+        p95 = self.p95(agent_id, model, kind)
+        if p95 is None or p95 <= slo:
+            return False
+        key = (agent_id, model, kind)
+        self._probes[key] = self._probes.get(key, 0) + 1
+        return self._probes[key] % self.probe_every != 0
+
+    def candidates(self, agent, kind: str, input_tokens: int, queue_wait=None) -> Tuple[List[str], Route]:
+        """Models to try in order: healthy models of the route first, then the rest as a last resort.
+
+        ``queue_wait(model) -> seconds`` reports how long the rate limiter would queue the call.
+        Breakers are only inspected here; call ``allow`` for the model actually tried.
+        """
+        agent_id = agent.agent_id or agent.name
+        route = self.route(agent, kind, input_tokens)
+        healthy, degraded = [], []
+        with self._lock:
+            for model in route.models:
+                ok = (
+                    self.breaker(model).state != "open"
+                    and not self._slow(agent_id, model, kind, route.slo)
+                    and not (queue_wait is not None and queue_wait(model) > 0)
+                )
+                (healthy if ok else degraded).append(model)
+        return healthy + degraded, route
+
+    def allow(self, model: str) -> bool:
+        """Whether ``model`` may be called now (takes its half-open probe slot)"""
+        with self._lock:
+            return self.breaker(model).allow()
+
+    def record(self, agent, model: str, kind: str, seconds: Optional[float], ok: bool):
+        """Feed back the outcome of a call (latency only for successful calls)"""
+        agent_id = agent.agent_id or agent.name
+        with self._lock:
+            breaker = self.breaker(model)
+            if ok:
+                breaker.success()
+                samples = self._latencies.get((agent_id, model, kind))
+                if samples is None:
+                    samples = self._latencies[(agent_id, model, kind)] = deque(maxlen=self.window)
+                samples.append(seconds)
+            else:
+                breaker.failure()
+
+    def stats(self) -> dict:
+        with self._lock:
+            latency = {
+                f"{agent_id}/{model}/{kind}": round(self.p95(agent_id, model, kind) or 0.0, 3)
+                for agent_id, model, kind in list(self._latencies)
+            }
+            return {
+                "fallbacks": self.fallbacks,
+                "breakers": {model: breaker.state for model, breaker in self._breakers.items()},
+                "p95_seconds": latency,
+            }
+
+
+model_router = ModelRouter()
+
+
+__all__ = ["Route", "CircuitBreaker", "ModelRouter", "model_router", "NON_FAULT_ERRORS"]
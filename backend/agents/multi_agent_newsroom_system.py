@@ -1,22 +1,68 @@
 """
 Multi-Agent Newsroom System - Coordinates multiple agents for news processing
+The sub-agents run as a DAG: collector and breaking concurrently, the
+summarizer on the collector's items, research on the top-ranked stories, and
+the coordinator merges their real outputs into one report.
 """
+from functools import cached_property
+from typing import Any, AsyncIterator, Dict, List, Optional
+import asyncio
+import os
+
 from .base import Agent
+from .dag import DAGExecutor, Node
+from .schemas import NewsFeed, render_news_text
 from .daily_news_collector_agent import DailyNewsCollectorAgent
 from .news_summarizer_agent import NewsSummarizerAgent
 from .news_research_agent import NewsResearchAgent
 from .breaking_news_alert_agent import BreakingNewsAlertAgent
 
 
+NODE_TIMEOUT = float(os.getenv("NEWSROOM_NODE_TIMEOUT", "60"))
+COORDINATOR_TIMEOUT = float(os.getenv("NEWSROOM_COORDINATOR_TIMEOUT", "90"))
+RESEARCH_TOPICS = int(os.getenv("NEWSROOM_RESEARCH_TOPICS", "2"))
+# Characters of each agent output passed to the coordinator
+SECTION_CHARS = int(os.getenv("NEWSROOM_SECTION_CHARS", "6000"))
+
+IMPACT_SCORE = {"high": 3, "medium": 2, "low": 1}
+
+
+def rank_topics(collected: Optional[NewsFeed], breaking: Optional[NewsFeed], count: int) -> List[str]:
+    """Headlines worth researching: impact, breaking flag, and stories both agents reported"""
+    scores: Dict[str, float] = {}
+    headlines: Dict[str, str] = {}
+    for feed, bonus in ((collected, 0.0), (breaking, 2.0)):
+        for item in (feed.items if feed is not None else []):
+            key = " ".join(item.headline.lower().split())
+            score = IMPACT_SCORE.get((item.impact or "").lower(), 1) + bonus + (2.0 if item.breaking else 0.0)
+            # A story seen by both agents outranks either copy alone
+            scores[key] = scores[key] + score + 1.0 if key in scores else score
+            headlines.setdefault(key, item.headline)
+    ranked = sorted(scores, key=lambda key: -scores[key])
+    return [headlines[key] for key in ranked[:count]]
+
+
+def _section(title: str, text: Optional[str]) -> str:
+    body = text[:SECTION_CHARS] if text else "(unavailable)"
+    return f"=== {title} ===\n{body}"
+
+
+class NewsroomResult:
+    """Coordinator output plus per-node status of the run"""
+
+    def __init__(self, final_output: str, session_id: str, model: Optional[str], cached: bool, nodes: Dict[str, dict], wall_ms: float):
+        self.final_output = final_output
+        self.session_id = session_id
+        self.model = model
+        self.cached = cached
+        self.nodes = nodes
+        self.wall_ms = wall_ms
+
+
 class MultiAgentNewsroomSystem:
     """Multi-Agent Newsroom System - Coordinates multiple agents for news processing"""
     
     def __init__(self):
-        self.collector = DailyNewsCollectorAgent()
-        self.summarizer = NewsSummarizerAgent()
-        self.research = NewsResearchAgent()
-        self.breaking = BreakingNewsAlertAgent()
-        
         self.agent = Agent(
             name="Multi-Agent Newsroom System",
             instructions="""You are a Multi-Agent Newsroom System Coordinator specializing EXCLUSIVELY in AI (Artificial Intelligence) news. Your role is to:
@@ -28,12 +74,15 @@ class MultiAgentNewsroomSystem:
 
 CRITICAL: ONLY coordinate AI-related news. All agents work exclusively on AI content.
 
-Workflow:
+Workflow (already executed; you receive each agent's real output in the request):
 1. Collector Agent → Fetches daily AI news
 2. Summarizer Agent → Creates TLDR summaries of AI news
 3. Research Agent → Deep dives on specific AI topics
 4. Breaking News Agent → Alerts on urgent AI news
 
+Build every section only from the agent outputs provided. If an agent's output
+is marked unavailable, say so briefly in that section instead of inventing content.
+
 Format your response as a comprehensive newsroom report:
 
 📰 AI NEWSROOM REPORT
@@ -69,7 +118,162 @@ Coordinated by: Multi-Agent Newsroom System
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 [Overall summary of today's AI news landscape, coordinated from all agents]
 
-You coordinate these agents and provide a comprehensive AI newsroom report.
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+You merge these agents' outputs into a comprehensive AI newsroom report.
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=900,
+            # The merged report is long; a smaller model would drop sections
+            fallback_models=[],
+            latency_slo=120
+        )
+
+    # Sub-agents are the shared registry instances, built on first use
+    @cached_property
+    def collector(self) -> DailyNewsCollectorAgent:
+        from .registry import agent_registry
+        return agent_registry.get("daily_news_collector")
+
+    @cached_property
+    def summarizer(self) -> NewsSummarizerAgent:
+        from .registry import agent_registry
+        return agent_registry.get("news_summarizer")
+
+    @cached_property
+    def research(self) -> NewsResearchAgent:
+        from .registry import agent_registry
+        return agent_registry.get("news_research")
+
+    @cached_property
+    def breaking(self) -> BreakingNewsAlertAgent:
+        from .registry import agent_registry
+        return agent_registry.get("breaking_news_alert")
+
+    def _nodes(self, runner: Any, query: str, use_cache: bool, sequential: bool) -> List[Node]:
+        """Sub-agent nodes of one newsroom run; they go through ``runner`` (result cache, single-flight)"""
+
+        async def run_agent(agent: Any, prompt: str, response_model: Optional[type] = None) -> Any:
+            return await runner.run_async(
+                agent=agent,
+                query=prompt,
+                use_cache=use_cache,
+                response_model=response_model,
+                remember=False
+            )
+
+        async def collect(deps: Dict[str, Any]) -> Any:
+            return await run_agent(self.collector, f"Collect today's AI news related to: {query}", NewsFeed)
+
+        async def breaking(deps: Dict[str, Any]) -> Any:
+            return await run_agent(self.breaking, f"Breaking AI news related to: {query}", NewsFeed)
+
+        async def summarize(deps: Dict[str, Any]) -> Any:
+            collected = deps["collect"]
+            if collected is None or not collected.parsed.items:
+                return None
+            content = render_news_text(collected.parsed, "DAILY AI NEWS COLLECTION")
+            return await run_agent(self.summarizer, f"Create a brief summary of this content:\n\n{content}")
+
+        async def rank(deps: Dict[str, Any]) -> List[str]:
+            feeds = [deps[name].parsed if deps[name] is not None else None for name in ("collect", "breaking")]
+            return rank_topics(feeds[0], feeds[1], RESEARCH_TOPICS)
+
+        async def research(deps: Dict[str, Any]) -> List[tuple]:
+            topics = deps["rank"]
+            prompts = [f"Research this topic in detail: {topic}" for topic in topics]
+            if sequential:
+                results = [await run_agent(self.research, prompt) for prompt in prompts]
+            else:
+                async with asyncio.TaskGroup() as group:
+                    tasks = [group.create_task(run_agent(self.research, prompt)) for prompt in prompts]
+                results = [task.result() for task in tasks]
+            return list(zip(topics, results))
+
+        return [
+            Node("collect", collect, timeout=NODE_TIMEOUT, optional=True),
+            Node("breaking", breaking, timeout=NODE_TIMEOUT, optional=True),
+            Node("summarize", summarize, deps=("collect",), timeout=NODE_TIMEOUT, optional=True),
+            Node("rank", rank, deps=("collect", "breaking")),
+            Node("research", research, deps=("rank",), timeout=NODE_TIMEOUT, optional=True),
+        ]
+
+    @staticmethod
+    def coordinator_prompt(query: str, results: Dict[str, Any]) -> str:
+        """The coordinator's input: the request plus every sub-agent's real output"""
+        collected, alerts, summary = results["collect"], results["breaking"], results["summarize"]
+        research_text = "\n\n".join(
+            f"Topic: {topic}\n{result.final_output}" for topic, result in (results["research"] or [])
         )
+        return "\n\n".join([
+            f"Produce the AI newsroom report for: {query}",
+            _section("BREAKING NEWS AGENT", render_news_text(alerts.parsed, "BREAKING AI NEWS") if alerts else None),
+            _section("COLLECTOR AGENT", render_news_text(collected.parsed, "DAILY AI NEWS COLLECTION") if collected else None),
+            _section("SUMMARIZER AGENT", summary.final_output if summary else None),
+            _section("RESEARCH AGENT", research_text or None),
+        ])
+
+    @staticmethod
+    def _node_status(outcome: Any) -> Dict[str, dict]:
+        nodes = {name: report.to_dict() for name, report in outcome.reports.items()}
+        for name, result in outcome.results.items():
+            if hasattr(result, "cached"):
+                nodes[name].update(cached=result.cached, model=result.model)
+        return nodes
+
+    @staticmethod
+    def _remember(runner: Any, session_id: Optional[str], query: str, report: str):
+        # Like AgentRunner: only a caller-supplied session can be continued
+        if session_id is not None and report:
+            runner.sessions.append(session_id, query, report)
+
+    async def run(
+        self,
+        runner: Any,
+        query: str,
+        session_id: Optional[str] = None,
+        use_cache: bool = True,
+        sequential: bool = False
+    ) -> NewsroomResult:
+        """Run the newsroom DAG with ``runner`` (an AgentRunner); ``sequential`` runs one node at a time.
+
+        The coordinator sees the session's earlier turns, and the session records
+        the user's query and the report rather than the coordinator prompt.
+        """
+
+        async def coordinate(deps: Dict[str, Any]) -> Any:
+            return await runner.run_async(
+                agent=self,
+                query=self.coordinator_prompt(query, deps),
+                session_id=session_id,
+                use_cache=use_cache,
+                remember=False
+            )
+
+        nodes = self._nodes(runner, query, use_cache, sequential)
+        nodes.append(Node("coordinate", coordinate, deps=tuple(node.name for node in nodes), timeout=COORDINATOR_TIMEOUT))
+        outcome = await DAGExecutor(nodes).run(sequential=sequential)
+        final = outcome.results["coordinate"]
+        self._remember(runner, session_id, query, final.final_output)
+        return NewsroomResult(
+            final_output=final.final_output,
+            session_id=final.session_id,
+            model=final.model,
+            cached=final.cached,
+            nodes=self._node_status(outcome),
+            wall_ms=outcome.wall_ms
+        )
+
+    async def stream(self, runner: Any, query: str, session_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Run the sub-agent DAG, then stream the coordinator like ``AgentRunner.stream_async``.
 
+        History and the recorded turn work as in ``run``; the ``done`` event also
+        carries the per-node status.
+        """
+        outcome = await DAGExecutor(self._nodes(runner, query, True, False)).run()
+        prompt = self.coordinator_prompt(query, outcome.results)
+        parts = []
+        async for event in runner.stream_async(agent=self, query=prompt, session_id=session_id, remember=False):
+            if event["type"] == "delta":
+                parts.append(event["content"])
+            elif event["type"] == "done":
+                self._remember(runner, session_id, query, "".join(parts))
+                event = {**event, "nodes": self._node_status(outcome)}
+            yield event
@@ -88,6 +88,10 @@ Ensure the report is:
 - Comprehensive yet readable
 - Properly cited with sources
 - Suitable for professional or academic use
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=21600,
+            # Research reports are long and cached for hours: wait for the main model
+            fallback_models=[],
+            latency_slo=120
         )
 
@@ -56,6 +56,13 @@ Format your response in a clear, readable format:
 [The most important takeaway from the AI news]
 
 Always preserve the most important information and maintain factual accuracy.
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=3600,
+            # Queries carry the content itself; "US" and "us" are not the same story
+            cache_exact_query=True,
+            # Short inputs are fine on the small model and come back much faster
+            light_model="gpt-4o-mini",
+            fallback_models=["gpt-4o-mini"],
+            latency_slo=10
         )
 
@@ -0,0 +1,235 @@
+"""
+Rate Limiter - Per-model request scheduling under OpenAI rate limits
+Each model has two token buckets, requests/min and tokens/min. A call reserves
+one request plus its estimated token cost and waits for the buckets to refill,
+so bursts queue briefly instead of failing. Retryable failures are retried
+with exponential backoff and full jitter, honouring Retry-After; a 429 pauses
+the model's buckets for every caller, not only the one that hit it.
+"""
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+import asyncio
+import os
+import random
+import threading
+import time
+
+from .errors import AgentError, RateLimitedError, classify_error
+from .session_store import estimate_tokens
+from utils.metrics import agent_retries, rate_limit_wait_seconds
+
+# Per-message framing tokens added by the chat format
+MESSAGE_TOKENS = 4
+
+
+class TokenBucket:
+    """Continuously refilling bucket; reservations may run it negative (a queue of debt)"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: Optional[float] = None) -> float:
+        """Seconds until ``amount`` could be taken, without reserving it"""
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            self._refill(now)
+            deficit = min(amount, self.capacity) - self.tokens
+            return max(deficit / self.rate if deficit > 0 else 0.0, self.paused_until - now)
+
+    def reserve(self, amount: float, now: Optional[float] = None) -> float:
+        """Take ``amount`` now and return the seconds to wait before using it"""
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            self._refill(now)
+            self.tokens -= min(amount, self.capacity)
+            return max(-self.tokens / self.rate if self.tokens < 0 else 0.0, self.paused_until - now)
+
+    def refund(self, amount: float):
+        """Give back (or, when negative, charge) tokens after the real cost is known"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def parse_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """``"gpt-4o=500:30000,gpt-4o-mini=500:200000"`` -> {model: (rpm, tpm)}"""
+    limits = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        model, _, values = part.partition("=")
+        rpm, _, tpm = values.partition(":")
+        limits[model.strip()] = (float(rpm), float(tpm))
+    return limits
+
+
+class RateLimiter:
+    """Schedules upstream calls per model within requests/min and tokens/min budgets.
+
+    ``max_wait`` bounds how long a call may queue; beyond it the call fails
+    fast with ``RateLimitedError`` carrying the expected wait as retry_after.
+    """
+
+    def __init__(
+        self,
+        rpm: Optional[float] = None,
+        tpm: Optional[float] = None,
+        overrides: Optional[Dict[str, Tuple[float, float]]] = None,
+        max_wait: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        output_tokens: Optional[int] = None
+    ):
+        self.rpm = rpm or float(os.getenv("OPENAI_RPM", "500"))
+        self.tpm = tpm or float(os.getenv("OPENAI_TPM", "30000"))
+        self.overrides = overrides if overrides is not None else parse_limits(os.getenv("OPENAI_RATE_LIMITS", ""))
+        self.max_wait = max_wait if max_wait is not None else float(os.getenv("RATE_LIMIT_MAX_WAIT", "20"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("OPENAI_MAX_RETRIES", "3"))
+        self.backoff_base = backoff_base or float(os.getenv("OPENAI_BACKOFF_BASE", "0.5"))
+        self.backoff_max = backoff_max or float(os.getenv("OPENAI_BACKOFF_MAX", "20"))
+        # Completion tokens assumed per call until response.usage reports the real count
+        self.output_tokens = output_tokens or int(os.getenv("OPENAI_EXPECTED_OUTPUT_TOKENS", "700"))
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.retries = 0
+        self.rejected = 0
+
+    def buckets(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        """(requests, tokens) buckets for ``model``"""
+        buckets = self._buckets.get(model)
+        if buckets is None:
+            with self._lock:
+                buckets = self._buckets.get(model)
+                if buckets is None:
+                    rpm, tpm = self.overrides.get(model, (self.rpm, self.tpm))
+                    buckets = self._buckets[model] = (TokenBucket(rpm), TokenBucket(tpm))
+        return buckets
+
+    def estimate_cost(self, messages: Iterable[Dict[str, Any]]) -> int:
+        """Estimated prompt tokens plus the expected completion"""
+        prompt = sum(estimate_tokens(str(m.get("content") or "")) + MESSAGE_TOKENS for m in messages)
+        return prompt + self.output_tokens
+
+    def wait_time(self, model: str, cost: int) -> float:
+        """Seconds a call of ``cost`` tokens to ``model`` would queue right now"""
+        requests, tokens = self.buckets(model)
+        now = time.monotonic()
+        return max(requests.wait_time(1, now), tokens.wait_time(cost, now))
+
+    def _reserve(self, model: str, cost: int, max_wait: float) -> float:
+        requests, tokens = self.buckets(model)
+        now = time.monotonic()
+        expected = max(requests.wait_time(1, now), tokens.wait_time(cost, now))
+        if expected > max_wait:
+            self.rejected += 1
+            raise RateLimitedError(
+                f"Rate limit for {model} reached; retry in {expected:.0f}s",
+                retry_after=expected
+            )
+        wait = max(requests.reserve(1, now), tokens.reserve(cost, now))
+        if wait > 0:
+            self.throttled += 1
+        rate_limit_wait_seconds.labels(model).observe(wait)
+        return wait
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before retry ``attempt`` (0-based): Retry-After if given, else full-jitter exponential"""
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _failed(self, model: str, cost: int, e: Exception, attempt: int, max_retries: int, max_wait: float) -> float:
+        """Classify a failed attempt; returns the delay before retrying or raises the typed error"""
+        error = classify_error(e)
+        # A rejected call consumed no tokens upstream
+        self.buckets(model)[1].refund(cost)
+        delay = self.backoff(attempt, error.retry_after)
+        if isinstance(error, RateLimitedError):
+            for bucket in self.buckets(model):
+                bucket.pause(delay)
+        if not error.retryable or attempt >= max_retries or delay > max_wait:
+            if error is e:
+                raise error
+            raise error from e
+        self.retries += 1
+        agent_retries.labels(model, error.kind).inc()
+        return delay
+
+    def settle(self, model: str, cost: int, usage: Any):
+        """Correct the tokens bucket with the real ``response.usage`` total"""
+        if usage is None:
+            return
+        total = usage.get("total_tokens") if isinstance(usage, dict) else getattr(usage, "total_tokens", None)
+        if total:
+            self.buckets(model)[1].refund(cost - total)
+
+    async def call(
+        self,
+        model: str,
+        cost: int,
+        func: Callable[[], Awaitable[Any]],
+        max_retries: Optional[int] = None,
+        max_wait: Optional[float] = None
+    ) -> Any:
+        """Await ``func()`` within the model's limits, retrying retryable failures.
+
+        ``max_retries`` and ``max_wait`` override the defaults, e.g. to fail over
+        to a fallback model quickly instead of retrying or queueing.
+        """
+        max_retries = self.max_retries if max_retries is None else max_retries
+        max_wait = self.max_wait if max_wait is None else max_wait
+        attempt = 0
+        while True:
+            wait = self._reserve(model, cost, max_wait)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                return await func()
+            except (asyncio.CancelledError, AgentError):
+                raise
+            except Exception as e:
+                await asyncio.sleep(self._failed(model, cost, e, attempt, max_retries, max_wait))
+                attempt += 1
+
+    def call_sync(self, model: str, cost: int, func: Callable[[], Any]) -> Any:
+        """Blocking variant of ``call`` for ``Runner.run_sync``"""
+        attempt = 0
+        while True:
+            wait = self._reserve(model, cost, self.max_wait)
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                return func()
+            except AgentError:
+                raise
+            except Exception as e:
+                time.sleep(self._failed(model, cost, e, attempt, self.max_retries, self.max_wait))
+                attempt += 1
+
+    def stats(self) -> dict:
+        models = {}
+        for model, (requests, tokens) in list(self._buckets.items()):
+            models[model] = {
+                "rpm": requests.capacity,
+                "tpm": tokens.capacity,
+                "requests_available": round(requests.tokens, 1),
+                "tokens_available": round(tokens.tokens),
+            }
+        return {"throttled": self.throttled, "retries": self.retries, "rejected": self.rejected, "models": models}
+
+
+rate_limiter = RateLimiter()
+
+
+__all__ = ["TokenBucket", "RateLimiter", "rate_limiter", "parse_limits"]
@@ -0,0 +1,141 @@
+"""
+Agent Registry - Every agent listed once under a stable agent id (the agent_type)
+Agents are built on first lookup, so a cold start only pays for the agents a
+request actually uses. Metadata (model, sampling, cache TTL, priority and the
+instructions hash/size) is captured once, when the agent is built.
+"""
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+
+from .seo_agent import SEOAgent
+from .youtube_agent import YouTubeAgent
+from .forbes_agent import ForbesAgent
+from .web_search_agent import WebSearchAgent
+from .daily_news_collector_agent import DailyNewsCollectorAgent
+from .breaking_news_alert_agent import BreakingNewsAlertAgent
+from .news_research_agent import NewsResearchAgent
+from .news_summarizer_agent import NewsSummarizerAgent
+from .multi_agent_newsroom_system import MultiAgentNewsroomSystem
+from .ultimate_ai_news_agent import UltimateAINewsAgent
+from .live_news_agent import LiveNewsAgent
+
+
+@dataclass(frozen=True)
+class AgentInfo:
+    """Metadata of a registered agent"""
+    agent_id: str
+    name: str
+    model: str
+    light_model: Optional[str]
+    fallback_models: Tuple[str, ...]
+    latency_slo: float
+    temperature: float
+    cache_ttl: float
+    cache_bucketed: bool
+    cache_exact_query: bool
+    priority: int
+    instructions_hash: str
+    instructions_chars: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class AgentRegistry:
+    """Maps agent id -> factory; each agent is built once, when first requested.
+
+    ``priority`` orders agents that compete for the same capacity (higher runs
+    first), e.g. in the /api/news fan-out.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._priorities: Dict[str, int] = {}
+        self._instances: Dict[str, Any] = {}
+        self._info: Dict[str, AgentInfo] = {}
+        self._lock = threading.Lock()
+
+    def register(self, agent_id: str, factory: Callable[[], Any], priority: int = 0):
+        self._factories[agent_id] = factory
+        self._priorities[agent_id] = priority
+        self._instances.pop(agent_id, None)
+        self._info.pop(agent_id, None)
+
+    def _build(self, agent_id: str) -> Any:
+        instance = self._factories[agent_id]()
+        agent = getattr(instance, "agent", instance)
+        agent.agent_id = agent_id
+        self._info[agent_id] = AgentInfo(
+            agent_id=agent_id,
+            name=agent.name,
+            model=agent.model,
+            light_model=agent.light_model,
+            fallback_models=tuple(agent.fallback_models),
+            latency_slo=agent.latency_slo,
+            temperature=agent.temperature,
+            cache_ttl=agent.cache_ttl,
+            cache_bucketed=agent.cache_bucketed,
+            cache_exact_query=agent.cache_exact_query,
+            priority=self._priorities[agent_id],
+            instructions_hash=agent.instructions_hash,
+            instructions_chars=len(agent.instructions),
+        )
+        return instance
+
+    def get(self, agent_id: str) -> Any:
+        """The agent registered as ``agent_id``; raises KeyError for unknown ids"""
+        instance = self._instances.get(agent_id)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(agent_id)
+                if instance is None:
+                    instance = self._build(agent_id)
+                    self._instances[agent_id] = instance
+        return instance
+
+    def info(self, agent_id: str) -> AgentInfo:
+        """Metadata for ``agent_id`` (builds the agent if needed)"""
+        info = self._info.get(agent_id)
+        if info is None:
+            self.get(agent_id)
+            info = self._info[agent_id]
+        return info
+
+    def priority(self, agent_id: str) -> int:
+        return self._priorities[agent_id]
+
+    def by_priority(self, agent_ids: Iterable[str]) -> List[str]:
+        """``agent_ids`` highest priority first (stable for equal priorities)"""
+        return sorted(agent_ids, key=lambda agent_id: -self._priorities.get(agent_id, 0))
+
+    def names(self) -> List[str]:
+        return list(self._factories)
+
+    def built(self) -> List[str]:
+        """Agents constructed so far"""
+        return list(self._instances)
+
+    def describe(self, agent_ids: Optional[Iterable[str]] = None) -> List[dict]:
+        return [self.info(agent_id).to_dict() for agent_id in (agent_ids or self.names())]
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._factories
+
+
+agent_registry = AgentRegistry()
+# Priorities: latency-sensitive feeds first, long-form generation last
+agent_registry.register("seo", SEOAgent, priority=30)
+agent_registry.register("youtube", YouTubeAgent, priority=40)
+agent_registry.register("forbes", ForbesAgent, priority=40)
+agent_registry.register("web_search", WebSearchAgent, priority=70)
+agent_registry.register("daily_news_collector", DailyNewsCollectorAgent, priority=60)
+agent_registry.register("breaking_news_alert", BreakingNewsAlertAgent, priority=100)
+agent_registry.register("news_research", NewsResearchAgent, priority=20)
+agent_registry.register("news_summarizer", NewsSummarizerAgent, priority=50)
+agent_registry.register("multi_agent_newsroom", MultiAgentNewsroomSystem, priority=10)
+agent_registry.register("ultimate_ai_news", UltimateAINewsAgent, priority=10)
+agent_registry.register("live_news", LiveNewsAgent, priority=90)
+
+
+__all__ = ["AgentInfo", "AgentRegistry", "agent_registry"]
@@ -0,0 +1,123 @@
+"""
+Result Cache - Bounded LRU cache for agent outputs with per-agent freshness
+"""
+from typing import Any, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry"""
+    return " ".join(query.split()).lower()
+
+
+def make_cache_key(agent: Any, query: str, variant: Optional[str] = None, exact: bool = False) -> str:
+    """Hash everything that changes the model output for an agent run.
+
+    ``variant`` distinguishes output modes such as a structured response model.
+    With ``exact`` (or an agent with ``cache_exact_query``) the query is hashed
+    as is: for content, case and spacing can change the meaning.
+    """
+    exact = exact or getattr(agent, "cache_exact_query", False)
+    payload = json.dumps(
+        [
+            getattr(agent, "agent_id", None) or agent.name,
+            agent.model,
+            agent.instructions_hash,
+            query if exact else normalize_query(query),
+            getattr(agent, "temperature", None),
+            variant,
+        ],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def expires_at(ttl: float, bucketed: bool = False, now: Optional[float] = None) -> float:
+    """Expiry time for an entry stored now.
+
+    With ``bucketed`` the entry lives until the end of the current ``ttl``-sized
+    wall-clock window, so every worker refreshes on the same boundaries.
+    """
+    now = time.time() if now is None else now
+    if bucketed:
+        return (now // ttl + 1) * ttl
+    return now + ttl
+
+
+class ResultCache:
+    """Thread-safe LRU cache of agent outputs bounded by an approximate byte budget"""
+
+    # Rough per-entry overhead (key string, tuple, dict slot)
+    ENTRY_OVERHEAD = 200
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a fresh cached value, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expiry, size = entry
+            if expiry <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float], bucketed: bool = False):
+        """Store a value for ``ttl`` seconds; a falsy ttl disables caching"""
+        if not ttl or ttl <= 0:
+            return
+        size = len(value.encode("utf-8")) + len(key) + self.ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at(ttl, bucketed), size)
+            self.bytes_used += size
+            while self.bytes_used > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self.bytes_used -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes_used": self.bytes_used,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+__all__ = ["ResultCache", "make_cache_key", "normalize_query", "expires_at"]
@@ -0,0 +1,130 @@
+"""
+Structured output schemas for news agents, plus text rendering on request
+"""
+from typing import ClassVar, List, Optional
+from pydantic import BaseModel, Field
+
+DIVIDER = "━" * 40
+
+# Appended as a second system message when a response model is requested. The
+# agents' own instructions describe a decorated text layout; this overrides it.
+STRUCTURED_OUTPUT_NOTE = """OUTPUT FORMAT OVERRIDE: Ignore any readable/emoji layout described above.
+Respond ONLY with a JSON object that matches the provided JSON schema.
+Use one entry in "items" per news story. Keep summaries to 1-3 sentences.
+Set "breaking" to true only for urgent, high-impact stories.
+Use null for unknown optional fields instead of inventing values."""
+
+
+class NewsItem(BaseModel):
+    """A single news story"""
+    headline: str
+    source: str
+    url: Optional[str] = None
+    time: Optional[str] = None
+    location: Optional[str] = None
+    summary: str
+    impact: Optional[str] = Field(default=None, description="high, medium or low")
+    category: Optional[str] = Field(default=None, description="e.g. ai, crypto, politics, health, pakistan, sports")
+    breaking: bool = False
+
+
+class NewsFeed(BaseModel):
+    """Structured response of the news agents"""
+    items: List[NewsItem]
+    overview: Optional[str] = Field(default=None, description="2-3 sentence summary of the overall news picture")
+
+
+class IndexedSummary(BaseModel):
+    """Summary of one numbered item in a batch"""
+    index: int
+    summary: str
+
+
+class SummaryBatch(BaseModel):
+    """Structured response of a batched summarization call"""
+    summaries: List[IndexedSummary]
+
+    output_note: ClassVar[str] = """OUTPUT FORMAT OVERRIDE: Ignore any readable/emoji layout described above.
+Respond ONLY with a JSON object that matches the provided JSON schema.
+Return exactly one entry in "summaries" per numbered item, with that item's index.
+Each summary is plain text covering only its own item."""
+
+
+def output_note_for(model: type) -> str:
+    """System note sent with a structured request (a model's own ``output_note`` or the news feed note)"""
+    return getattr(model, "output_note", STRUCTURED_OUTPUT_NOTE)
+
+
+def response_format_for(model: type) -> dict:
+    """Chat Completions ``response_format`` for a pydantic model"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "schema": model.model_json_schema(),
+        },
+    }
+
+
+def _impact_rank(item: NewsItem) -> int:
+    return {"high": 0, "medium": 1, "low": 2}.get((item.impact or "").lower(), 3)
+
+
+def render_news_text(feed: NewsFeed, title: str = "LIVE AI NEWS UPDATE") -> str:
+    """Render a feed in the agents' readable layout (the format the frontend parses)"""
+    breaking = [item for item in feed.items if item.breaking]
+    updates = [item for item in feed.items if not item.breaking]
+    highlights = sorted(feed.items, key=_impact_rank)[:5]
+
+    lines = [f"📰 {title}", DIVIDER, ""]
+
+    if breaking:
+        lines += ["🔥 BREAKING NEWS", DIVIDER, ""]
+        for item in breaking:
+            lines.append(f"🚨 {item.headline}")
+            if item.location:
+                lines.append(f"📍 Location: {item.location}")
+            if item.time:
+                lines.append(f"⏰ Time: {item.time}")
+            lines.append(f"📰 Source: {item.source}")
+            lines += ["", item.summary, ""]
+            if item.url:
+                lines += [f"🔗 Read more: {item.url}", ""]
+        lines += [DIVIDER, ""]
+
+    if updates:
+        lines += ["📊 LATEST UPDATES", DIVIDER, ""]
+        for item in updates:
+            meta = [f"📍 {item.location}" if item.location else None,
+                    f"⏰ {item.time}" if item.time else None,
+                    f"📰 {item.source}"]
+            lines.append(f"• {item.headline}")
+            lines.append("  " + " | ".join(part for part in meta if part))
+            lines.append(f"  {item.summary}")
+            if item.url:
+                lines.append(f"  🔗 {item.url}")
+            lines.append("")
+        lines += [DIVIDER, ""]
+
+    if highlights:
+        lines += ["💡 KEY HIGHLIGHTS", DIVIDER, ""]
+        for item in highlights:
+            lines.append(f"• {item.headline} - {item.summary} | 📰 {item.source} | 🔗 {item.url or '#'}")
+        lines += ["", DIVIDER, ""]
+
+    if feed.overview:
+        lines += ["📈 SUMMARY", DIVIDER, feed.overview, "", DIVIDER]
+
+    return "\n".join(lines).rstrip() + "\n"
+
+
+__all__ = [
+    "NewsItem",
+    "NewsFeed",
+    "IndexedSummary",
+    "SummaryBatch",
+    "STRUCTURED_OUTPUT_NOTE",
+    "output_note_for",
+    "response_format_for",
+    "render_news_text",
+]
@@ -56,6 +56,11 @@ Long-tail: [Long-tail AI keywords]
 [Suggestions for schema markup and structured data]
 
 Always ensure content is original, valuable, and follows Google's guidelines.
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=21600,
+            # Short inputs are fine on the small model and come back much faster
+            light_model="gpt-4o-mini",
+            fallback_models=["gpt-4o-mini"],
+            latency_slo=10
         )
 
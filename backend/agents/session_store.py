@@ -0,0 +1,160 @@
+"""
+Session Store - Bounded per-session conversation history for session_id
+Each session keeps its recent turns within a token budget; older turns are
+folded into a short running summary. Sessions are evicted LRU-first, when
+idle longer than the TTL, or when the global byte cap is reached, so memory
+stays bounded no matter how many sessions clients open.
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+import os
+import re
+import threading
+import time
+
+# Rough per-message overhead (dict, strings, list slot) for byte accounting
+MESSAGE_OVERHEAD = 120
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate (~4 characters per token for English)"""
+    return len(text) // 4 + 1
+
+
+def _first_sentence(text: str, limit: int = 200) -> str:
+    text = " ".join(text.split())
+    match = re.match(r"(.+?[.!?])(\s|$)", text)
+    sentence = match.group(1) if match else text
+    return sentence if len(sentence) <= limit else sentence[:limit - 1].rstrip() + "…"
+
+
+def extractive_summary(summary: str, dropped: List[Dict[str, str]], max_tokens: int) -> str:
+    """Append the first sentence of each dropped turn, keeping the newest lines within ``max_tokens``"""
+    lines = summary.splitlines() if summary else []
+    lines.extend(f"{message['role']}: {_first_sentence(message['content'])}" for message in dropped)
+    while lines and estimate_tokens("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+class _Session:
+    __slots__ = ("messages", "summary", "tokens", "bytes", "last_used")
+
+    def __init__(self):
+        self.messages: List[Dict[str, str]] = []
+        self.summary = ""
+        self.tokens = 0
+        self.bytes = 0
+        self.last_used = time.monotonic()
+
+
+class SessionStore:
+    """LRU + idle-TTL store of conversation history under a global byte cap.
+
+    ``summarize(summary, dropped_messages, max_tokens) -> str`` folds turns that
+    no longer fit the token budget into the running summary; the default is a
+    local extractive summary, so trimming never calls the model.
+    """
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        max_sessions: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        max_message_chars: Optional[int] = None,
+        summarize: Callable[[str, List[Dict[str, str]], int], str] = extractive_summary
+    ):
+        self.token_budget = token_budget or int(os.getenv("SESSION_TOKEN_BUDGET", "2000"))
+        self.max_sessions = max_sessions or int(os.getenv("SESSION_MAX_SESSIONS", "20000"))
+        self.max_bytes = max_bytes or int(os.getenv("SESSION_MAX_BYTES", str(64 * 1024 * 1024)))
+        self.idle_ttl = idle_ttl or float(os.getenv("SESSION_IDLE_TTL", "3600"))
+        # Long agent outputs are stored truncated so one turn cannot fill the budget
+        self.max_message_chars = max_message_chars or int(os.getenv("SESSION_MAX_MESSAGE_CHARS", "4000"))
+        self.summary_budget = max(self.token_budget // 4, 50)
+        self.summarize = summarize
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.evictions = 0
+
+    def _evict(self, now: float):
+        # Oldest-used first: drop idle sessions, then enforce the count and byte caps
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            idle = now - session.last_used > self.idle_ttl
+            if not (idle or len(self._sessions) > self.max_sessions or self.bytes_used > self.max_bytes):
+                break
+            self._sessions.popitem(last=False)
+            self.bytes_used -= session.bytes
+            self.evictions += 1
+
+    def history(self, session_id: Optional[str]) -> List[Dict[str, str]]:
+        """Messages to send before the next user turn (summary first, then recent turns)"""
+        if not session_id:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return []
+            if now - session.last_used > self.idle_ttl:
+                self._sessions.pop(session_id)
+                self.bytes_used -= session.bytes
+                self.evictions += 1
+                return []
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            messages = list(session.messages)
+            if session.summary:
+                messages.insert(0, {"role": "system", "content": f"Summary of the earlier conversation:\n{session.summary}"})
+            return messages
+
+    def append(self, session_id: str, user: str, assistant: str):
+        """Record one exchange and trim the session to its token budget"""
+        now = time.monotonic()
+        turn = [
+            {"role": "user", "content": user[:self.max_message_chars]},
+            {"role": "assistant", "content": assistant[:self.max_message_chars]},
+        ]
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = _Session()
+            self._sessions.move_to_end(session_id)
+            session.last_used = now
+            session.messages.extend(turn)
+            session.tokens += sum(estimate_tokens(m["content"]) for m in turn)
+
+            dropped = []
+            # Keep at least the newest exchange even if it alone exceeds the budget
+            while session.tokens > self.token_budget and len(session.messages) > 2:
+                message = session.messages.pop(0)
+                session.tokens -= estimate_tokens(message["content"])
+                dropped.append(message)
+            if dropped:
+                session.summary = self.summarize(session.summary, dropped, self.summary_budget)
+
+            size = sum(len(m["content"]) + MESSAGE_OVERHEAD for m in session.messages) + len(session.summary)
+            self.bytes_used += size - session.bytes
+            session.bytes = size
+            self._evict(now)
+
+    def clear(self, session_id: str):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self.bytes_used -= session.bytes
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "bytes_used": self.bytes_used,
+                "max_bytes": self.max_bytes,
+                "max_sessions": self.max_sessions,
+                "evictions": self.evictions,
+            }
+
+
+__all__ = ["SessionStore", "estimate_tokens", "extractive_summary"]
@@ -0,0 +1,239 @@
+"""
+Snapshot Scheduler - Background precompute of live and breaking news
+Snapshots are shared between uvicorn workers through files; a file lock elects
+one worker as the leader that refreshes them.
+"""
+from typing import Any, Callable, Dict, Optional, Tuple
+from datetime import datetime, timezone
+from functools import partial
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from utils.storage import data_path
+
+try:
+    import fcntl
+except ImportError:  # Windows - a single worker is assumed
+    fcntl = None
+
+
+class LeaderLock:
+    """Non-blocking exclusive file lock; the holder is the refresh leader"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        if fcntl is None:
+            self._fd = -1
+            return True
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        if self._fd >= 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+        self._fd = None
+
+
+class SnapshotStore:
+    """Stores the latest snapshot per name as JSON files, written atomically"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._memory: Dict[str, Tuple[float, dict]] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def write(self, name: str, snapshot: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(name))
+        self._memory[name] = (os.path.getmtime(self._path(name)), snapshot)
+
+    def read(self, name: str) -> Optional[dict]:
+        """Latest snapshot, re-read from disk only when another worker replaced it"""
+        path = self._path(name)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        cached = self._memory.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return cached[1] if cached else None
+        self._memory[name] = (mtime, snapshot)
+        return snapshot
+
+
+class SnapshotScheduler:
+    """Refreshes registered agent snapshots on an interval with jitter.
+
+    Endpoints call ``get`` and receive the latest snapshot immediately; stale
+    snapshots trigger a background revalidation (stale-while-revalidate).
+    """
+
+    def __init__(
+        self,
+        runner: Any,
+        directory: Optional[str] = None,
+        interval: Optional[float] = None,
+        jitter: Optional[float] = None,
+        stale_after: Optional[float] = None
+    ):
+        self.runner = runner
+        self.directory = directory or os.getenv("SNAPSHOT_DIR") or data_path("snapshots")
+        self.interval = interval if interval is not None else float(os.getenv("SNAPSHOT_REFRESH_INTERVAL", "60"))
+        self.jitter = jitter if jitter is not None else float(os.getenv("SNAPSHOT_REFRESH_JITTER", "10"))
+        self.stale_after = stale_after if stale_after is not None else float(os.getenv("SNAPSHOT_STALE_AFTER", str(self.interval * 2)))
+        self.store = SnapshotStore(self.directory)
+        self.lock = LeaderLock(os.path.join(self.directory, ".leader.lock"))
+        self._jobs: Dict[str, Tuple[Any, Any, Optional[type], Optional[Callable[[dict], dict]]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._revalidating: Dict[str, asyncio.Task] = {}
+
+    def register(
+        self,
+        name: str,
+        agent: Any,
+        query: Any,
+        response_model: Optional[type] = None,
+        postprocess: Optional[Callable[[dict], dict]] = None
+    ):
+        """Register an agent/query pair to keep precomputed under ``name``.
+
+        ``agent`` may also be a zero-argument callable returning the agent; it is
+        resolved on each refresh so lazily built agents stay unbuilt until then.
+        ``query`` may be a zero-argument coroutine function, awaited on each
+        refresh, for queries that carry fresh context.
+        With ``response_model`` the snapshot also stores the validated output as
+        ``data``, passed through ``postprocess`` once here rather than on every read.
+        """
+        self._jobs[name] = (agent, query, response_model, postprocess)
+
+    async def refresh(self, name: str) -> dict:
+        """Run the agent now and publish a new snapshot"""
+        agent, query, response_model, postprocess = self._jobs[name]
+        if callable(agent):
+            agent = agent()
+        if callable(query):
+            query = await query()
+        result = await self.runner.run_async(
+            agent=agent,
+            query=query,
+            use_cache=False,
+            response_model=response_model,
+            remember=False
+        )
+        data = result.parsed.model_dump(exclude_none=True) if result.parsed is not None else None
+        if data is not None and postprocess is not None:
+            data = postprocess(data)
+        now = time.time()
+        snapshot = {
+            "result": result.final_output,
+            "data": data,
+            "generated_at": datetime.fromtimestamp(now, tz=timezone.utc).isoformat(),
+            "generated_ts": now,
+            "model": result.model,
+        }
+        self.store.write(name, snapshot)
+        return snapshot
+
+    def _revalidate(self, name: str):
+        task = self._revalidating.get(name)
+        if task is not None and not task.done():
+            return
+        task = asyncio.ensure_future(self.refresh(name))
+        task.add_done_callback(partial(self._revalidated, name))
+        self._revalidating[name] = task
+
+    @staticmethod
+    def _revalidated(name: str, task: asyncio.Task):
+        # Retrieving the exception also keeps asyncio from warning it was never retrieved
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Snapshot revalidation failed for {name}: {task.exception()}")
+
+    async def get(self, name: str) -> dict:
+        """Latest snapshot with ``age`` and ``stale`` metadata, computing it if none exists"""
+        snapshot = self.store.read(name)
+        cached = snapshot is not None
+        if snapshot is None:
+            snapshot = await self.refresh(name)
+        age = max(time.time() - snapshot["generated_ts"], 0.0)
+        stale = age > self.stale_after
+        if stale:
+            self._revalidate(name)
+        return {
+            "result": snapshot["result"],
+            "data": snapshot.get("data"),
+            "generated_at": snapshot["generated_at"],
+            "model": snapshot.get("model"),
+            "age": round(age, 1),
+            "stale": stale,
+            "cached": cached,
+        }
+
+    async def _loop(self):
+        while True:
+            if self.lock.try_acquire():
+                for name in self._jobs:
+                    try:
+                        await self.refresh(name)
+                    except Exception as e:
+                        print(f"Snapshot refresh failed for {name}: {e}")
+            delay = self.interval + random.uniform(-self.jitter, self.jitter)
+            await asyncio.sleep(max(delay, 1.0))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self):
+        tasks = [t for t in [self._task, *self._revalidating.values()] if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._revalidating.clear()
+        self.lock.release()
+
+    def status(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "leader": self.lock.is_leader,
+            "interval": self.interval,
+            "jobs": list(self._jobs),
+        }
+
+
+__all__ = ["SnapshotScheduler", "SnapshotStore", "LeaderLock"]
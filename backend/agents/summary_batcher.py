@@ -0,0 +1,164 @@
+"""
+Summary Batcher - Summarizes many items with few model calls
+Short items with the same summary type are packed into one call that returns
+an indexed structured response; long items are summarized on their own, with
+the same prompt as /api/summarize so they share its cache, and items too long
+for one prompt go through the chunked summarizer. One semaphore bounds every
+model call of a request, chunk calls included, and results come back in input
+order.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import os
+import time
+
+from .schemas import SummaryBatch
+from .session_store import estimate_tokens
+
+
+def summary_prompt(content: str, summary_type: str) -> str:
+    """Prompt for one item (identical to /api/summarize)"""
+    return f"Create a {summary_type} summary of this content:\n\n{content}"
+
+
+def batch_prompt(items: List[Tuple[int, str]], summary_type: str) -> str:
+    """Prompt for several numbered items summarized in one call"""
+    blocks = "\n\n".join(f"[{index}]\n{content}" for index, content in items)
+    return (
+        f"Create a {summary_type} summary of each numbered item below. "
+        f"Summarize every item independently.\n\n{blocks}"
+    )
+
+
+class SummaryBatcher:
+    """Plans and runs batched summarization through an AgentRunner.
+
+    ``reuse`` (a ContentCache) serves items whose content was already
+    summarized and is filled with every new summary. ``chunker`` (a
+    ChunkedSummarizer) handles items over its threshold; those bypass
+    ``reuse`` and rely on the chunker's per-chunk cache instead.
+    """
+
+    def __init__(
+        self,
+        runner: Any,
+        reuse: Any = None,
+        chunker: Any = None,
+        max_batch_items: Optional[int] = None,
+        max_batch_tokens: Optional[int] = None,
+        long_item_tokens: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ):
+        self.runner = runner
+        self.reuse = reuse
+        self.chunker = chunker
+        self.max_batch_items = max_batch_items or int(os.getenv("SUMMARIZE_BATCH_ITEMS", "8"))
+        self.max_batch_tokens = max_batch_tokens or int(os.getenv("SUMMARIZE_BATCH_TOKENS", "3000"))
+        self.long_item_tokens = long_item_tokens or int(os.getenv("SUMMARIZE_LONG_ITEM_TOKENS", "1200"))
+        self.concurrency = concurrency or int(os.getenv("SUMMARIZE_BATCH_CONCURRENCY", "4"))
+
+    def _reusable(self, content: str) -> bool:
+        return self.reuse is not None and not (self.chunker is not None and self.chunker.needed(content))
+
+    def plan(self, items: List[Tuple[str, str]], indexes: List[int]) -> List[List[int]]:
+        """Group ``indexes`` of (content, summary_type) items into calls: long items alone, short ones packed per type"""
+        groups: List[List[int]] = []
+        open_groups: Dict[str, Tuple[List[int], int]] = {}
+        for index in indexes:
+            content, summary_type = items[index]
+            tokens = estimate_tokens(content)
+            if tokens > self.long_item_tokens:
+                groups.append([index])
+                continue
+            group, used = open_groups.get(summary_type, ([], 0))
+            if group and (len(group) >= self.max_batch_items or used + tokens > self.max_batch_tokens):
+                groups.append(group)
+                group, used = [], 0
+            group.append(index)
+            open_groups[summary_type] = (group, used + tokens)
+        groups.extend(group for group, _ in open_groups.values() if group)
+        return groups
+
+    async def _call(self, semaphore: asyncio.Semaphore, usage: Dict[str, int], **kwargs: Any) -> Any:
+        """One runner call under the request's semaphore; counted unless the cache answered it"""
+        async with semaphore:
+            result = await self.runner.run_async(**kwargs)
+        usage["calls"] += 0 if result.cached else 1
+        return result
+
+    async def _run_group(
+        self,
+        agent: Any,
+        items: List[Tuple[str, str]],
+        group: List[int],
+        semaphore: asyncio.Semaphore,
+        usage: Dict[str, int]
+    ) -> Dict[int, dict]:
+        summary_type = items[group[0]][1]
+        if len(group) == 1:
+            content = items[group[0]][0]
+            if self.chunker is not None and self.chunker.needed(content):
+                result, stats = await self.chunker.summarize(agent, content, summary_type, remember=False, semaphore=semaphore)
+                usage["calls"] += stats["calls"]
+                return {group[0]: {"result": result.final_output, "cached": result.cached, "model": result.model, "chunked": stats}}
+            result = await self._call(semaphore, usage, agent=agent, query=summary_prompt(content, summary_type), remember=False)
+            return {group[0]: {"result": result.final_output, "cached": result.cached, "model": result.model}}
+
+        result = await self._call(
+            semaphore,
+            usage,
+            agent=agent,
+            query=batch_prompt([(index, items[index][0]) for index in group], summary_type),
+            response_model=SummaryBatch,
+            remember=False
+        )
+        summaries = {entry.index: entry.summary for entry in result.parsed.summaries}
+        outputs = {
+            index: {"result": summaries[index], "cached": result.cached, "model": result.model, "batched": len(group)}
+            for index in group if summaries.get(index)
+        }
+        # The model skipped or garbled an index: summarize those items on their own
+        for index in group:
+            if index not in outputs:
+                outputs.update(await self._run_group(agent, items, [index], semaphore, usage))
+        return outputs
+
+    async def summarize(self, agent: Any, items: List[Tuple[str, str]]) -> Dict[str, Any]:
+        """Summaries of (content, summary_type) items, in input order, plus throughput stats"""
+        start = time.perf_counter()
+        results: List[Optional[dict]] = [None] * len(items)
+        pending = []
+        for index, (content, summary_type) in enumerate(items):
+            summary, key = self.reuse.get(content, summary_type) if self._reusable(content) else (None, None)
+            if summary is not None:
+                results[index] = {"result": summary, "cached": True, "model": None, "duplicate_of": key}
+            else:
+                pending.append(index)
+
+        groups = self.plan(items, pending)
+        # Shared by every model call below, including the chunker's, so it is the only limit
+        semaphore = asyncio.Semaphore(self.concurrency)
+        usage = {"calls": 0}
+
+        async def run(group: List[int]):
+            try:
+                outputs = await self._run_group(agent, items, group, semaphore, usage)
+            except Exception as e:
+                outputs = {index: {"error": str(e)} for index in group}
+            for index, output in outputs.items():
+                results[index] = output
+                if self._reusable(items[index][0]) and output.get("result"):
+                    self.reuse.set(items[index][0], output["result"], items[index][1])
+
+        await asyncio.gather(*(run(group) for group in groups))
+        elapsed = time.perf_counter() - start
+        return {
+            "results": [{"index": index, **result} for index, result in enumerate(results)],
+            "count": len(items),
+            "calls": usage["calls"],
+            "duration_ms": round(elapsed * 1000, 1),
+            "items_per_second": round(len(items) / elapsed, 2) if elapsed > 0 else None,
+        }
+
+
+__all__ = ["SummaryBatcher", "summary_prompt", "batch_prompt"]
@@ -86,6 +86,9 @@ Features Used: [List active features]
 [Overall comprehensive summary of AI news, trends, and developments]
 
 When responding, indicate which features you're using and provide comprehensive, well-formatted output.
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=900,
+            fallback_models=[],
+            latency_slo=120
         )
 
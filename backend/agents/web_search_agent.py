@@ -60,6 +60,9 @@ Format your response in a clear, readable format:
 • [Source 3] - [URL]
 
 Always prioritize accuracy, cite sources, and provide up-to-date information.
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=300,
+            fallback_models=["gpt-4o-mini"],
+            latency_slo=30
         )
 
@@ -75,6 +75,8 @@ Based on your query, here are recommended AI videos:
 • [Video recommendation 2]
 
 Always provide accurate information and cite sources when available.
-Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content."""
+Ensure all content is appropriate, factual, and follows ethical guidelines. Reject any harmful, misleading, or inappropriate content.""",
+            cache_ttl=3600,
+            latency_slo=60
         )
 
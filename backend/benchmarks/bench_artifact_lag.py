@@ -0,0 +1,86 @@
+"""
+Benchmark: event-loop lag while PDF and trend-graph artifacts render
+
+Compares rendering inline in the async handler (the old behaviour) with the
+render pool. Voice summaries are skipped because gTTS needs the network.
+
+Usage: python -m benchmarks.bench_artifact_lag [--rounds 3]
+"""
+from typing import Any, Awaitable, Callable, List, Tuple
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from utils.helpers import generate_pdf_report, generate_trend_graph
+from utils.render_pool import render_artifacts, get_render_executor, shutdown_render_pool
+
+CONTENT = "\n\n".join(f"## Story {i}\n\n" + "AI news paragraph. " * 80 for i in range(40))
+TICK = 0.01
+
+
+def artifact_inputs(variant: int) -> Tuple[str, dict]:
+    """Report content and trend data unique to ``variant``, so content-addressed artifacts are never reused"""
+    trend = {"dates": [f"2024-01-{d:02d}" for d in range(1, 29)], "values": [v + variant for v in range(28)]}
+    return f"{CONTENT}\n\nEdition {variant}", trend
+
+
+async def _watch_lag(stop: asyncio.Event, lags: list):
+    # A 10ms ticker; any overshoot is time the loop could not serve requests
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def render_inline(variant: int):
+    content, trend = artifact_inputs(variant)
+    generate_pdf_report(content, title="AI News Report")
+    generate_trend_graph(trend)
+
+
+async def render_pooled(variant: int):
+    content, trend = artifact_inputs(variant)
+    await render_artifacts(content, ["pdf_report", "trend_graph"], trend_data=trend)
+
+
+async def measure_lag(render: Callable[[int], Awaitable[Any]], rounds: int, first_variant: int = 0) -> Tuple[float, List[float]]:
+    """Wall time of ``rounds`` renders and the loop lag samples taken meanwhile"""
+    stop, lags = asyncio.Event(), []
+    watcher = asyncio.create_task(_watch_lag(stop, lags))
+    await asyncio.sleep(TICK * 2)
+    start = time.perf_counter()
+    for variant in range(first_variant, first_variant + rounds):
+        await render(variant)
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(TICK * 2)
+    stop.set()
+    await watcher
+    return elapsed, lags
+
+
+async def _report(label: str, render, rounds: int, first_variant: int):
+    elapsed, lags = await measure_lag(render, rounds, first_variant)
+    print(f"{label:<8} wall={elapsed:6.2f}s  max loop lag={max(lags) * 1000:8.1f}ms  "
+          f"mean loop lag={sum(lags) / len(lags) * 1000:6.1f}ms")
+
+
+async def main(rounds: int):
+    # Warm the pool (process start-up, imports) outside the measurement
+    await asyncio.get_running_loop().run_in_executor(get_render_executor(), time.sleep, 0)
+    try:
+        await _report("inline", render_inline, rounds, 0)
+        await _report("pooled", render_pooled, rounds, rounds)
+    finally:
+        shutdown_render_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        asyncio.run(main(args.rounds))
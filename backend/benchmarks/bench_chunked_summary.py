@@ -0,0 +1,72 @@
+"""
+Benchmark: long-document summarization through the chunked summarizer
+
+Summarizes a synthetic report of ``--paragraphs`` paragraphs against a local
+stub that answers after ``--delay`` seconds, then edits one paragraph and
+summarizes again. The second run should only re-summarize the chunks around
+the edit (and the merges above them); everything else comes from the chunk cache.
+
+Usage: python -m benchmarks.bench_chunked_summary [--paragraphs 120] [--delay 0.2]
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from benchmarks.stub_server import StubServer, create_stub_app
+
+WORDS = "model training inference chips datacenter regulation safety benchmark startup funding research open weights".split()
+
+
+def make_document(paragraphs: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        " ".join(
+            f"{' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 18))).capitalize()}."
+            for _ in range(rng.randint(3, 7))
+        )
+        for _ in range(paragraphs)
+    ]
+
+
+async def _run(label: str, summarizer, agent, content: str):
+    start = time.perf_counter()
+    result, stats = await summarizer.summarize(agent, content, "medium", remember=False)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(
+        f"{label:<9} {elapsed:8.1f}ms  chunks={stats['chunks']:<3} levels={stats['levels']} "
+        f"calls={stats['calls']:<3} cached={stats['cached']}"
+    )
+    return stats
+
+
+async def main(paragraphs: int, delay: float):
+    from agents.agent_runner import AgentRunner
+    from agents.chunked_summarizer import ChunkedSummarizer
+    from agents.client_pool import client_pool
+    from agents.registry import agent_registry
+
+    agent = agent_registry.get("news_summarizer")
+    summarizer = ChunkedSummarizer(AgentRunner())
+    document = make_document(paragraphs)
+    try:
+        await _run("cold", summarizer, agent, "\n\n".join(document))
+        await _run("unchanged", summarizer, agent, "\n\n".join(document))
+        edited = list(document)
+        edited[len(edited) // 2] += " A late correction was added to this paragraph."
+        await _run("edited", summarizer, agent, "\n\n".join(edited))
+    finally:
+        await client_pool.shutdown()
+    print(f"({delay * 1000:.0f}ms per model call, {summarizer.chunk_tokens} tokens per chunk)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paragraphs", type=int, default=120)
+    parser.add_argument("--delay", type=float, default=0.2)
+    args = parser.parse_args()
+    with StubServer(create_stub_app(reply="- Stub note about the section.", delay=args.delay)) as stub:
+        os.environ["OPENAI_API_KEY"] = "stub"
+        os.environ["OPENAI_BASE_URL"] = stub.base_url
+        asyncio.run(main(args.paragraphs, args.delay))
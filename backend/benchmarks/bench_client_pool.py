@@ -0,0 +1,62 @@
+"""
+Benchmark: fresh AsyncOpenAI client per call vs the process-wide pooled client
+
+Usage: python -m benchmarks.bench_client_pool [--requests 200]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from openai import AsyncOpenAI
+
+from agents.client_pool import ClientPool, PoolSettings
+from benchmarks.stub_server import StubServer
+
+MESSAGES = [{"role": "user", "content": "ping"}]
+
+
+async def _fresh_client_call(base_url: str):
+    # What Runner.run used to do: a new client (and connection pool) per call
+    client = AsyncOpenAI(api_key="stub", base_url=base_url)
+    try:
+        await client.chat.completions.create(model="gpt-4o", messages=MESSAGES)
+    finally:
+        await client.close()
+
+
+async def _pooled_call(pool: ClientPool, base_url: str):
+    client = pool.get_async_client(api_key="stub", base_url=base_url)
+    await client.chat.completions.create(model="gpt-4o", messages=MESSAGES)
+
+
+async def _measure(label: str, call, requests: int):
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<14} p50={p50:7.2f}ms  p95={p95:7.2f}ms  mean={statistics.mean(latencies):7.2f}ms")
+    return p50
+
+
+async def main(requests: int):
+    with StubServer() as stub:
+        pool = ClientPool(PoolSettings(prewarm_connections=1))
+        await pool.prewarm(api_key="stub", base_url=stub.base_url)
+        try:
+            fresh = await _measure("fresh client", lambda: _fresh_client_call(stub.base_url), requests)
+            pooled = await _measure("pooled client", lambda: _pooled_call(pool, stub.base_url), requests)
+        finally:
+            await pool.shutdown()
+    print(f"p50 speedup: {fresh / pooled:.2f}x (plain HTTP; TLS handshakes widen the gap)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
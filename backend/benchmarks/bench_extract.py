@@ -0,0 +1,135 @@
+"""
+Benchmark: article body extraction throughput (documents per second per core)
+
+Extracts every page of a local HTML corpus in-process, then through a
+ProcessPoolExecutor at increasing worker counts, and reports docs/s and
+docs/s per worker. Without ``--corpus`` a corpus of news-like pages (header,
+navigation, sidebar, comments, scripts around the article) is generated, and
+the extracted text is also checked: share of article paragraphs recovered and
+pages where boilerplate leaked in.
+
+Usage: python -m benchmarks.bench_extract [--docs 400] [--corpus DIR] [--workers 1,2,4]
+"""
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from utils.article_extractor import extract_html
+
+WORDS = (
+    "the model company researchers said on tuesday that its new system could reduce inference costs "
+    "while regulators in europe and the united states are still reviewing how training data was collected "
+    "according to people familiar with the matter chips datacenter benchmark safety"
+).split()
+BOILERPLATE_MARK = "BOILERPLATE"
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 24))).capitalize() + "."
+
+
+def make_page(seed: int) -> tuple:
+    """(html, article paragraphs) for one synthetic news page"""
+    rng = random.Random(seed)
+    paragraphs = [" ".join(_sentence(rng) for _ in range(rng.randint(2, 5))) for _ in range(rng.randint(6, 20))]
+    nav = "".join(f'<li><a href="/section/{i}">{BOILERPLATE_MARK} section {i}</a></li>' for i in range(15))
+    related = "".join(
+        f'<li><a href="/story/{seed}-{i}">{BOILERPLATE_MARK} related story headline number {i} about something else</a></li>'
+        for i in range(8)
+    )
+    comments = "".join(f'<div class="comment"><p>{BOILERPLATE_MARK} reader comment {i}: {_sentence(rng)}</p></div>' for i in range(6))
+    body = "".join(f"<p>{p}</p>" if i % 4 else f"<p>{p} <a href='/x/{i}'>link</a></p>" for i, p in enumerate(paragraphs))
+    page = f"""<!DOCTYPE html><html><head><meta charset="utf-8"><title>Story {seed} | Example News</title>
+<meta property="og:title" content="Story {seed}">
+<style>body {{ font-family: sans-serif; }} .{BOILERPLATE_MARK} {{ display: none; }}</style>
+<script>window.analytics = {{"id": "{BOILERPLATE_MARK}", "events": [1, 2, 3]}};</script></head>
+<body><header><div class="logo">{BOILERPLATE_MARK} Example News</div><nav><ul>{nav}</ul></nav></header>
+<div class="cookie-banner">{BOILERPLATE_MARK} We use cookies to improve your experience on this website.</div>
+<div class="layout"><div class="content"><article><h1>Story {seed}</h1>
+<div class="byline">By A. Reporter, {rng.randint(1, 28)} March 2026</div>
+<div class="article-body">{body}</div>
+<div class="share-tools"><a href="#">{BOILERPLATE_MARK} Share on X</a> <a href="#">Share by email</a></div>
+</article><section class="comments">{comments}</section></div>
+<aside class="sidebar"><h3>{BOILERPLATE_MARK} Most read</h3><ul>{related}</ul>
+<div class="newsletter"><p>{BOILERPLATE_MARK} Subscribe to our daily newsletter for the biggest stories of the day.</p></div></aside></div>
+<footer><p>{BOILERPLATE_MARK} Copyright 2026 Example News. All rights reserved. Terms, privacy and cookie policy.</p></footer>
+<script src="/app.js"></script></body></html>"""
+    return page, paragraphs
+
+
+def load_corpus(directory: str) -> list:
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith((".html", ".htm")):
+            with open(os.path.join(directory, name), "rb") as f:
+                pages.append(f.read())
+    return pages
+
+
+def write_corpus(directory: str, docs: int) -> list:
+    """Write ``docs`` generated pages to ``directory``; returns each page's article paragraphs"""
+    expected = []
+    for seed in range(docs):
+        page, paragraphs = make_page(seed)
+        with open(os.path.join(directory, f"page_{seed:05d}.html"), "w", encoding="utf-8") as f:
+            f.write(page)
+        expected.append(paragraphs)
+    return expected
+
+
+def check_quality(pages: list, expected: list):
+    recovered = total = leaked = 0
+    for page, paragraphs in zip(pages, expected):
+        text = extract_html(page, max_chars=1_000_000)["text"]
+        recovered += sum(1 for p in paragraphs if p in text)
+        total += len(paragraphs)
+        leaked += BOILERPLATE_MARK in text
+    print(f"quality: {recovered / total:.1%} of article paragraphs recovered, boilerplate leaked on {leaked}/{len(pages)} pages")
+
+
+def run_pool(pages: list, workers: int, max_chars: int) -> float:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Warm the workers so process start-up is not measured
+        list(pool.map(extract_html, pages[:workers], [None] * workers, [max_chars] * workers))
+        start = time.perf_counter()
+        list(pool.map(extract_html, pages, [None] * len(pages), [max_chars] * len(pages), chunksize=8))
+        return time.perf_counter() - start
+
+
+def main(pages: list, worker_counts: list, max_chars: int):
+    size = sum(len(p) for p in pages) / len(pages) / 1024
+    print(f"{len(pages)} documents, {size:.1f}KiB average, {os.cpu_count()} CPUs")
+    start = time.perf_counter()
+    for page in pages:
+        extract_html(page, max_chars=max_chars)
+    elapsed = time.perf_counter() - start
+    print(f"in-process  {len(pages) / elapsed:8.1f} docs/s")
+    for workers in worker_counts:
+        elapsed = run_pool(pages, workers, max_chars)
+        rate = len(pages) / elapsed
+        print(f"{workers:>2} workers  {rate:8.1f} docs/s  {rate / workers:8.1f} docs/s/core")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=400)
+    parser.add_argument("--corpus", help="Directory of .html files (default: generate one)")
+    parser.add_argument("--workers", default=None, help="Comma-separated worker counts (default: 1,2,4.. up to the CPU count)")
+    parser.add_argument("--max-chars", type=int, default=12000)
+    args = parser.parse_args()
+    cpus = os.cpu_count() or 1
+    worker_counts = (
+        [int(w) for w in args.workers.split(",")] if args.workers
+        else sorted({min(2 ** i, cpus) for i in range(cpus.bit_length() + 1)})
+    )
+    if args.corpus:
+        main(load_corpus(args.corpus), worker_counts, args.max_chars)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            expected = write_corpus(directory, args.docs)
+            pages = load_corpus(directory)
+            check_quality(pages, expected)
+            main(pages, worker_counts, args.max_chars)
@@ -0,0 +1,94 @@
+"""
+Benchmark: RSS/Atom ingestion against a local fixture server
+
+Polls ``--feeds`` generated feeds (RSS and Atom alternating) twice: the cold
+poll downloads and parses everything, and the warm poll revalidates with
+ETag so every feed answers 304. Then compares peak parser memory for one
+large feed, streamed through FeedParser vs parsed as a whole document.
+
+Usage: python -m benchmarks.bench_feed_ingest [--feeds 8] [--items 500] [--delay 0.05]
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from benchmarks.feed_fixture import atom_feed, create_feed_app, feed_url, rss_feed
+from benchmarks.stub_server import StubServer
+
+
+async def _poll(label: str, ingester) -> None:
+    start = time.perf_counter()
+    entries = await ingester.poll()
+    elapsed = (time.perf_counter() - start) * 1000
+    statuses = {}
+    for feed in ingester.stats()["feeds"].values():
+        statuses[feed["status"]] = statuses.get(feed["status"], 0) + 1
+    print(f"{label:<5} {elapsed:8.1f}ms  items={len(entries):<5} feeds={statuses}")
+
+
+async def main(base_url: str, names, max_items: int, host_concurrency: int):
+    from utils.feeds import FeedIngester, FeedSource
+
+    ingester = FeedIngester(
+        sources=[FeedSource(name, feed_url(base_url, name)) for name in names],
+        max_items=max_items,
+        host_concurrency=host_concurrency,
+        host_delay=0.0
+    )
+    try:
+        await _poll("cold", ingester)
+        await _poll("warm", ingester)
+    finally:
+        await ingester.shutdown()
+
+
+def _peak_kib(func) -> float:
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def compare_memory(items: int, max_items: int):
+    from utils.feeds import FeedParser
+
+    body = rss_feed(items, seed=99).encode("utf-8")
+
+    def streamed(limit: int):
+        parser = FeedParser("large", max_items=limit)
+        for i in range(0, len(body), 64 * 1024):
+            parser.feed(body[i:i + 64 * 1024])
+            if parser.full:
+                return
+        parser.close()
+
+    def whole():
+        ET.fromstring(body).findall("./channel/item")
+
+    print(f"parse {len(body) / 1024 / 1024:.1f}MiB feed ({items} items), peak memory excluding the body:")
+    print(f"  whole document        {_peak_kib(whole):9.0f}KiB")
+    print(f"  streamed, all items   {_peak_kib(lambda: streamed(items)):9.0f}KiB")
+    print(f"  streamed, {max_items:<3} items    {_peak_kib(lambda: streamed(max_items)):9.0f}KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--feeds", type=int, default=8)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--max-items", type=int, default=30)
+    parser.add_argument("--host-concurrency", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.05)
+    args = parser.parse_args()
+    feeds = {
+        f"feed{i}": (rss_feed if i % 2 == 0 else atom_feed)(args.items, seed=i)
+        for i in range(args.feeds)
+    }
+    app = create_feed_app(feeds, delay=args.delay)
+    with StubServer(app) as server:
+        base_url = f"http://127.0.0.1:{server.port}"
+        asyncio.run(main(base_url, list(feeds), args.max_items, args.host_concurrency))
+    print(f"server responses: {app.state.served}")
+    compare_memory(args.items * 20, args.max_items)
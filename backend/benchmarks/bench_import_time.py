@@ -0,0 +1,78 @@
+"""
+Benchmark: cold-start import time of the FastAPI app
+
+Runs ``python -X importtime -c "import main"`` in fresh interpreters and
+reports the best cumulative time of ``main`` plus the heaviest top-level
+packages. Exits non-zero when the import takes longer than ``--max-ms`` or
+when a module that should load lazily (reportlab, matplotlib, gtts, openai)
+is imported, so it can gate CI.
+
+Usage: python -m benchmarks.bench_import_time [--runs 5] [--max-ms 900] [--top 10]
+"""
+from typing import Dict, List, Tuple
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy packages that must only load when their feature is first used
+LAZY_MODULES = ("reportlab", "matplotlib", "gtts", "openai")
+
+
+def import_profile() -> Dict[str, Tuple[int, int]]:
+    """module -> (self us, cumulative us) for one cold ``import main``"""
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "sk-benchmark")}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        profile[module.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def top_level(profile: Dict[str, Tuple[int, int]], count: int) -> List[Tuple[str, int]]:
+    packages: Dict[str, int] = {}
+    for module, (_, cumulative) in profile.items():
+        if "." not in module and module != "main":
+            packages[module] = max(packages.get(module, 0), cumulative)
+    return sorted(packages.items(), key=lambda item: -item[1])[:count]
+
+
+def main(runs: int, max_ms: float, top: int) -> int:
+    profiles = [import_profile() for _ in range(runs)]
+    best = min(profiles, key=lambda p: p["main"][1])
+    total_ms = best["main"][1] / 1000
+    print(f"import main: {total_ms:.0f} ms (best of {runs}; threshold {max_ms:.0f} ms)")
+    print("heaviest top-level packages:")
+    for package, cumulative in top_level(best, top):
+        print(f"  {package:<28} {cumulative / 1000:7.1f} ms")
+
+    failed = False
+    eager = sorted({m.split(".")[0] for m in best if m.split(".")[0] in LAZY_MODULES})
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+        failed = True
+    if total_ms > max_ms:
+        print(f"FAIL: import time {total_ms:.0f} ms exceeds {max_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=float(os.getenv("IMPORT_TIME_MAX_MS", "900")))
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    sys.exit(main(args.runs, args.max_ms, args.top))
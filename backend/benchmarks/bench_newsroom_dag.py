@@ -0,0 +1,65 @@
+"""
+Benchmark: multi-agent newsroom wall-clock time, DAG executor vs sequential nodes
+
+Every node calls a local stub that answers after ``--delay`` seconds, with the
+result cache bypassed, so the difference is purely the orchestration: the DAG
+runs collector and breaking together and researches topics concurrently.
+
+Usage: python -m benchmarks.bench_newsroom_dag [--rounds 5] [--delay 0.2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+
+from benchmarks.stub_server import StubServer, create_stub_app
+
+FEED = json.dumps({
+    "items": [
+        {"headline": f"AI story {i}", "source": "Stub Wire", "summary": "A stubbed AI news item.", "impact": impact}
+        for i, impact in enumerate(["high", "medium", "low", "high"])
+    ],
+    "overview": "Stubbed overview."
+})
+
+
+async def _measure(label: str, run, rounds: int) -> float:
+    walls = []
+    nodes = {}
+    for _ in range(rounds):
+        result = await run()
+        walls.append(result.wall_ms)
+        nodes = result.nodes
+    median = statistics.median(walls)
+    print(f"{label:<11} median wall={median:8.1f}ms  min={min(walls):8.1f}ms")
+    print("            " + "  ".join(f"{name}={node['duration_ms']:.0f}ms" for name, node in nodes.items()))
+    return median
+
+
+async def main(rounds: int, delay: float):
+    from agents.agent_runner import AgentRunner
+    from agents.client_pool import client_pool
+    from agents.registry import agent_registry
+
+    newsroom = agent_registry.get("multi_agent_newsroom")
+    runner = AgentRunner()
+    try:
+        sequential = await _measure(
+            "sequential", lambda: newsroom.run(runner, "AI chips", use_cache=False, sequential=True), rounds
+        )
+        dag = await _measure("dag", lambda: newsroom.run(runner, "AI chips", use_cache=False), rounds)
+    finally:
+        await client_pool.shutdown()
+    print(f"speedup: {sequential / dag:.2f}x ({delay * 1000:.0f}ms per model call)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.2)
+    args = parser.parse_args()
+    with StubServer(create_stub_app(reply="Stub report.", delay=args.delay, structured_reply=FEED)) as stub:
+        os.environ["OPENAI_API_KEY"] = "stub"
+        os.environ["OPENAI_BASE_URL"] = stub.base_url
+        asyncio.run(main(args.rounds, args.delay))
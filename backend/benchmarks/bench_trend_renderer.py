@@ -0,0 +1,77 @@
+"""
+Benchmark: trend graph renders per second under a thread pool
+
+Compares the previous pyplot-based generate_trend_graph (global state, so it
+must be serialized behind a lock, dpi=300, written to disk and read back)
+with TrendRenderer rendering in memory, uncached and cached.
+
+Usage: python -m benchmarks.bench_trend_renderer [--renders 40] [--threads 4]
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from utils.trend_renderer import TrendRenderer
+
+_pyplot_lock = threading.Lock()
+
+
+def _series(i: int) -> dict:
+    return {"dates": [f"2024-01-{d:02d}" for d in range(1, 15)], "values": [(i + d) % 9 for d in range(14)]}
+
+
+def legacy_render(data: dict, workdir: str, i: int) -> bytes:
+    """The old generate_trend_graph + get_base64_image round trip"""
+    path = os.path.join(workdir, f"legacy_{i}.png")
+    with _pyplot_lock:
+        plt.figure(figsize=(12, 6))
+        dates = [datetime.strptime(d, '%Y-%m-%d') for d in data['dates']]
+        plt.plot(dates, data['values'], marker='o', linewidth=2, markersize=8)
+        plt.gcf().autofmt_xdate()
+        plt.xlabel('Date')
+        plt.ylabel('Trend Value')
+        plt.title('News Trend Analysis')
+        plt.grid(True, alpha=0.3)
+        plt.tight_layout()
+        plt.savefig(path, dpi=300, bbox_inches='tight')
+        plt.close()
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _measure(label: str, func, renders: int, threads: int):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(func, range(renders)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<26} {renders / elapsed:7.1f} renders/s  ({elapsed:5.2f}s for {renders})")
+
+
+def main(renders: int, threads: int):
+    with tempfile.TemporaryDirectory() as workdir:
+        _measure("legacy pyplot dpi=300", lambda i: legacy_render(_series(i), workdir, i), renders, threads)
+
+    uncached = TrendRenderer(dpi=150, cache_size=0)
+    _measure("TrendRenderer dpi=150", lambda i: uncached.render(_series(i)), renders, threads)
+
+    svg = TrendRenderer(cache_size=0)
+    _measure("TrendRenderer svg", lambda i: svg.render(_series(i), fmt="svg"), renders, threads)
+
+    cached = TrendRenderer(dpi=150)
+    _measure("TrendRenderer cached", lambda i: cached.render(_series(i % 4)), renders, threads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--renders", type=int, default=40)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+    main(args.renders, args.threads)
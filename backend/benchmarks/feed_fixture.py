@@ -0,0 +1,79 @@
+"""
+Local RSS/Atom fixture server used by the feed benchmarks
+
+Serves generated feeds at /feeds/{name} with ETag and Last-Modified, answers
+conditional requests with 304, and counts what it served. Run it with
+``StubServer(create_feed_app(...))``; point ``FeedIngester`` (or ``FEED_URLS``)
+at ``feed_url(base, name)``.
+"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict
+import asyncio
+import hashlib
+import random
+
+from fastapi import FastAPI, Request, Response
+
+WORDS = "model chips inference agents regulation safety startup funding research benchmark open weights robotics".split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def rss_feed(items: int, seed: int = 1, source: str = "Fixture Wire") -> str:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    entries = "".join(
+        f"<item><title>{_sentence(rng, 8)}</title>"
+        f"<link>https://news.example/{seed}/{i}</link>"
+        f"<guid>https://news.example/{seed}/{i}</guid>"
+        f"<description>&lt;p&gt;{_sentence(rng, 60)}.&lt;/p&gt;</description>"
+        f"<pubDate>{format_datetime(start + timedelta(minutes=i * 7 + seed))}</pubDate></item>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{source}</title>{entries}</channel></rss>'
+
+
+def atom_feed(items: int, seed: int = 1, source: str = "Fixture Atom") -> str:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    entries = "".join(
+        f"<entry><title>{_sentence(rng, 8)}</title>"
+        f'<link rel="alternate" href="https://atom.example/{seed}/{i}"/>'
+        f"<id>urn:fixture:{seed}:{i}</id>"
+        f'<summary type="html">&lt;p&gt;{_sentence(rng, 60)}.&lt;/p&gt;</summary>'
+        f"<updated>{(start + timedelta(minutes=i * 5 + seed)).isoformat()}</updated></entry>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>{source}</title>{entries}</feed>'
+
+
+def feed_url(base_url: str, name: str) -> str:
+    return f"{base_url}/feeds/{name}"
+
+
+def create_feed_app(feeds: Dict[str, str], delay: float = 0.0) -> FastAPI:
+    """App serving ``feeds`` ({name: xml}); ``app.state.served`` counts responses by status"""
+    app = FastAPI()
+    modified = format_datetime(datetime(2026, 1, 1, tzinfo=timezone.utc), usegmt=True)
+    app.state.served = {200: 0, 304: 0, 404: 0}
+
+    @app.get("/feeds/{name}")
+    async def feed(name: str, request: Request):
+        if delay:
+            await asyncio.sleep(delay)
+        body = feeds.get(name)
+        if body is None:
+            app.state.served[404] += 1
+            return Response(status_code=404)
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+        headers = {"ETag": etag, "Last-Modified": modified}
+        if request.headers.get("if-none-match") == etag:
+            app.state.served[304] += 1
+            return Response(status_code=304, headers=headers)
+        app.state.served[200] += 1
+        return Response(content=body, media_type="application/rss+xml", headers=headers)
+
+    return app
@@ -0,0 +1,71 @@
+"""
+Local OpenAI-compatible stub server used by the benchmarks
+"""
+from typing import Optional
+import socket
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI
+
+
+def create_stub_app(reply: str = "stub reply", delay: float = 0.0, structured_reply: Optional[str] = None) -> FastAPI:
+    """Build a tiny app that answers /models and /chat/completions like OpenAI.
+
+    ``structured_reply`` answers requests that set ``response_format``.
+    """
+    stub = FastAPI()
+
+    @stub.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "gpt-4o", "object": "model", "created": 0, "owned_by": "stub"}]}
+
+    @stub.post("/v1/chat/completions")
+    async def chat_completions(body: dict):
+        if delay:
+            import asyncio
+            await asyncio.sleep(delay)
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": structured_reply if structured_reply is not None and body.get("response_format") else reply
+                },
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+        }
+
+    return stub
+
+
+class StubServer:
+    """Runs the stub app on a free local port in a background thread"""
+
+    def __init__(self, app: Optional[FastAPI] = None):
+        self.app = app or create_stub_app()
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="error"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
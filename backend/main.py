@@ -3,26 +3,42 @@ AI News Backend - FastAPI application with OpenAI Agents SDK
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse, Response
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Any, AsyncIterator, Literal, Tuple
+from contextlib import asynccontextmanager
+from functools import partial
+import asyncio
+import json
+import math
 import os
+import time
 from dotenv import load_dotenv
-from utils.helpers import generate_pdf_report, generate_voice_summary, generate_trend_graph
+from utils.render_pool import render_artifacts, render_workers, shutdown_render_pool
+from utils.jobs import JobQueue, JOB_KINDS
+from utils.artifact_store import is_content_addressed
+from utils.trends import trend_engine
+from utils.trend_renderer import trend_renderer, MEDIA_TYPES
+from utils.article_store import article_store, extract_items_from_text
+from utils.feeds import feed_ingester, with_feed_context
+from utils.article_extractor import article_extractor, articles_context, ExtractionError
+from utils.dedup import story_index, merge_items, dedupe_items, ContentCache
+from utils.metrics import metrics, MetricsMiddleware, agent_in_flight, http_in_flight, renders_in_flight
 
 from agents import (
-    SEOAgent,
-    YouTubeAgent,
-    ForbesAgent,
-    WebSearchAgent,
-    DailyNewsCollectorAgent,
-    BreakingNewsAlertAgent,
-    NewsResearchAgent,
-    NewsSummarizerAgent,
-    MultiAgentNewsroomSystem,
-    UltimateAINewsAgent,
-    LiveNewsAgent,
-    AgentRunner
+    agent_registry,
+    AgentRunner,
+    SnapshotScheduler,
+    NewsFeed,
+    render_news_text,
+    client_pool,
+    AgentError,
+    NodeFailed,
+    rate_limiter,
+    model_router,
+    SummaryBatcher,
+    ChunkedSummarizer,
+    summary_prompt
 )
 
 # Try to load environment variables (ignore errors if .env file has issues)
@@ -34,12 +50,64 @@ try:
 except Exception:
     pass  # Environment variables may already be set
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start shared resources on startup and close them on shutdown"""
+    await client_pool.startup()
+    if SNAPSHOT_SCHEDULER_ENABLED:
+        snapshot_scheduler.start()
+    job_queue.start()
+    article_store.start()
+    try:
+        yield
+    finally:
+        await article_store.stop()
+        await job_queue.stop()
+        await snapshot_scheduler.stop()
+        trend_engine.flush()
+        await feed_ingester.shutdown()
+        await article_extractor.shutdown()
+        await client_pool.shutdown()
+        shutdown_render_pool()
+
 app = FastAPI(
     title="AI News API",
     description="AI News Backend with OpenAI Agents SDK",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Fan-out limits for /api/news
+NEWS_MAX_CONCURRENCY = int(os.getenv("NEWS_MAX_CONCURRENCY", "4"))
+NEWS_AGENT_TIMEOUT = float(os.getenv("NEWS_AGENT_TIMEOUT", "60"))
+
+# Largest /api/summarize/batch request
+SUMMARIZE_BATCH_MAX_ITEMS = int(os.getenv("SUMMARIZE_BATCH_MAX_ITEMS", "500"))
+
+# Feed items handed to the live and breaking news agents as context (0 disables)
+FEED_CONTEXT_ITEMS = int(os.getenv("FEED_CONTEXT_ITEMS", "20"))
+
+# Article bodies: URLs per request and characters of each body given to the research agent
+ARTICLE_MAX_URLS = int(os.getenv("ARTICLE_MAX_URLS", "10"))
+RESEARCH_ARTICLE_CHARS = int(os.getenv("RESEARCH_ARTICLE_CHARS", "4000"))
+
+# Background snapshots for /api/live-news and /api/breaking-news.
+# Serverless deployments have no long-lived process, so the loop is off there
+# and snapshots are refreshed on demand instead.
+SNAPSHOT_SCHEDULER_ENABLED = os.getenv(
+    "SNAPSHOT_SCHEDULER_ENABLED",
+    "0" if os.getenv("VERCEL") == "1" else "1"
+) == "1"
+
+LIVE_NEWS_QUERY = "Get the latest AI (Artificial Intelligence) related news updates from the web. Search for real AI news from sources like TechCrunch, The Verge, MIT Technology Review, Reuters Tech, and BBC Technology. Focus ONLY on: Machine Learning, Deep Learning, Neural Networks, AI Research, AI Companies, AI Tools, AI Ethics, AI Regulations, AI Breakthroughs, and AI Applications. Provide the news in the readable format as specified in your instructions. Include actual headlines, summaries, sources, URLs, and timestamps. Filter out any non-AI content. DO NOT mention JSON format - directly provide the news."
+BREAKING_NEWS_QUERY = "Check for breaking news and high-impact events"
+
+async def with_feeds(query: str) -> str:
+    """``query`` with the latest RSS/Atom items as context, so agents report real current stories"""
+    if FEED_CONTEXT_ITEMS <= 0:
+        return query
+    return with_feed_context(query, await feed_ingester.candidates(FEED_CONTEXT_ITEMS))
+
 # CORS middleware
 frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
 environment = os.getenv("ENVIRONMENT", "development")
@@ -79,6 +147,9 @@ else:
         expose_headers=["*"],
     )
 
+# Outermost, so request timings include CORS handling
+app.add_middleware(MetricsMiddleware)
+
 # Request/Response models
 class AgentRequest(BaseModel):
     query: str
@@ -89,6 +160,8 @@ class AgentResponse(BaseModel):
     result: str
     session_id: str
     agent_type: str
+    cached: bool = False
+    model: Optional[str] = None  # Model the router picked; None for cached results
 
 class NewsRequest(BaseModel):
     query: str
@@ -96,26 +169,44 @@ class NewsRequest(BaseModel):
     session_id: Optional[str] = None
 
 class NewsResponse(BaseModel):
-    results: dict
+    results: dict  # agent name -> {"status", "result" | "error", "cached", "duration_ms"}
+    items: List[dict] = []  # Stories from all agents, one entry per story (see utils/dedup.py)
     session_id: str
 
 class DailyNewsRequest(BaseModel):
     topics: Optional[List[str]] = None  # ["ai", "crypto", "politics", "health", "pakistan", "sports"]
+    format: Literal["text", "json"] = "text"  # "json" returns typed news items
+    render_text: bool = False  # With format="json", also include the rendered text
     session_id: Optional[str] = None
 
 class BreakingNewsRequest(BaseModel):
     query: Optional[str] = None
+    format: Literal["text", "json"] = "text"
+    render_text: bool = False
     session_id: Optional[str] = None
 
 class ResearchRequest(BaseModel):
     topic: str  # e.g., "Pakistan economic crisis summary"
+    urls: Optional[List[str]] = None  # Articles whose extracted text is given to the agent as sources
     session_id: Optional[str] = None
 
 class SummarizeRequest(BaseModel):
-    content: str
+    content: Optional[str] = None
+    url: Optional[str] = None  # Summarize the extracted article body instead of ``content``
     summary_type: Optional[str] = "medium"  # "ultra-short", "short", "medium"
     session_id: Optional[str] = None
 
+class ExtractRequest(BaseModel):
+    urls: List[str]
+
+class BatchSummarizeItem(BaseModel):
+    content: str
+    summary_type: Optional[str] = "medium"
+
+class BatchSummarizeRequest(BaseModel):
+    items: List[BatchSummarizeItem]
+    session_id: Optional[str] = None
+
 class NewsroomRequest(BaseModel):
     query: str
     session_id: Optional[str] = None
@@ -124,25 +215,176 @@ class UltimateNewsRequest(BaseModel):
     query: str
     features: Optional[List[str]] = None  # ["daily_collection", "summaries", "trends", "bilingual"]
     language: Optional[str] = "english"  # "english", "urdu", "bilingual"
+    async_artifacts: bool = False  # Queue PDF/voice/graph as jobs instead of rendering in the request
     session_id: Optional[str] = None
 
+class JobRequest(BaseModel):
+    kind: str  # "pdf_report", "voice_summary", "trend_graph"
+    content: Optional[str] = None
+    title: Optional[str] = None
+    language: Optional[str] = "english"
+    trend_data: Optional[dict] = None
+
 class LiveNewsRequest(BaseModel):
     categories: Optional[List[str]] = None  # ["ai", "crypto", "politics", "health", "pakistan", "sports", "world"]
+    format: Literal["text", "json"] = "text"
+    render_text: bool = False
     session_id: Optional[str] = None
 
-# Initialize all agents
-seo_agent = SEOAgent()
-youtube_agent = YouTubeAgent()
-forbes_agent = ForbesAgent()
-web_search_agent = WebSearchAgent()
-daily_news_collector = DailyNewsCollectorAgent()
-breaking_news_alert = BreakingNewsAlertAgent()
-news_research = NewsResearchAgent()
-news_summarizer = NewsSummarizerAgent()
-multi_agent_newsroom = MultiAgentNewsroomSystem()
-ultimate_ai_news = UltimateAINewsAgent()
-live_news_agent = LiveNewsAgent()
+# Agents are built on first lookup in agent_registry (see agents/registry.py)
 agent_runner = AgentRunner()
+job_queue = JobQueue()
+# Summaries reused for content already summarized (exact match after normalization)
+summary_reuse = ContentCache()
+# Content over SUMMARIZE_CHUNK_THRESHOLD_TOKENS is summarized chunk by chunk, then merged
+chunked_summarizer = ChunkedSummarizer(agent_runner)
+summary_batcher = SummaryBatcher(agent_runner, reuse=summary_reuse, chunker=chunked_summarizer)
+
+def record_trends(agent: Any, query: str, output: str, parsed: Any = None):
+    """Count keyword/entity/category mentions in every fresh agent output"""
+    if isinstance(parsed, NewsFeed):
+        for item in parsed.items:
+            trend_engine.ingest_text(f"{item.headline}. {item.summary}", categories=[item.category] if item.category else [])
+    else:
+        trend_engine.ingest_text(output)
+
+agent_runner.add_listener(record_trends)
+
+def record_articles(agent: Any, query: str, output: str, parsed: Any = None):
+    """Keep every news item an agent reports in the searchable article store"""
+    if isinstance(parsed, NewsFeed):
+        items = [item.model_dump() for item in parsed.items]
+    else:
+        items = extract_items_from_text(output)
+    if items:
+        article_store.add_items(items, agent=getattr(agent, "name", None))
+
+agent_runner.add_listener(record_articles)
+
+# Scrape-time views of existing stats
+metrics.counter("result_cache_lookups", "Result cache lookups by outcome", ("outcome",), collect=lambda: {
+    ("hit",): agent_runner.cache.stats()["hits"],
+    ("miss",): agent_runner.cache.stats()["misses"],
+})
+metrics.gauge("result_cache_bytes", "Approximate bytes held by the result cache", collect=lambda: {(): agent_runner.cache.stats()["bytes_used"]})
+metrics.counter("single_flight_coalesced", "Agent runs served by joining an identical in-flight run", collect=lambda: {(): agent_runner.single_flight.stats()["coalesced"]})
+metrics.gauge("artifact_jobs_queued", "Artifact jobs waiting for a worker", collect=lambda: {(): job_queue.queued()})
+
+def readiness() -> dict:
+    """Saturation of the shared resources; not ready while the OpenAI connection pool is full"""
+    capacity = client_pool.settings.max_connections
+    agent_calls = agent_in_flight.total()
+    return {
+        "ready": agent_calls < capacity,
+        "saturation": {
+            "agent_calls": {"in_flight": int(agent_calls), "capacity": capacity, "ratio": round(agent_calls / max(capacity, 1), 3)},
+            "http_requests_in_flight": int(http_in_flight.total()),
+            "render_pool": {"in_flight": int(renders_in_flight.total()), "workers": render_workers()},
+            "job_queue": {"queued": job_queue.queued(), "workers": job_queue.concurrency},
+            "news_fanout_limit": NEWS_MAX_CONCURRENCY,
+        },
+    }
+
+def dedupe_feed(data: dict) -> dict:
+    """Structured feed without repeated stories, each item tagged with its story_id"""
+    return {**data, "items": dedupe_items(data["items"], story_index)}
+
+# Snapshots are deduplicated once when produced, not on every poll
+snapshot_scheduler = SnapshotScheduler(agent_runner)
+snapshot_scheduler.register("live_news", partial(agent_registry.get, "live_news"), partial(with_feeds, LIVE_NEWS_QUERY), response_model=NewsFeed, postprocess=dedupe_feed)
+snapshot_scheduler.register("breaking_news", partial(agent_registry.get, "breaking_news_alert"), partial(with_feeds, BREAKING_NEWS_QUERY), response_model=NewsFeed, postprocess=dedupe_feed)
+
+def news_payload(text: str, data: Optional[dict], output_format: str, render_text: bool, title: str) -> dict:
+    """Response body for structured news (already deduplicated): typed items for "json", rendered text for "text"."""
+    if data is None:
+        # Snapshot written before structured output existed
+        return {"result": text}
+    if output_format == "json":
+        payload = {"items": data["items"], "overview": data.get("overview")}
+        if render_text:
+            payload["result"] = render_news_text(NewsFeed.model_validate(data), title)
+        return payload
+    return {"result": render_news_text(NewsFeed.model_validate(data), title)}
+
+def unwrap_node_error(e: Exception) -> Exception:
+    """The typed agent error behind a failed newsroom node, so it keeps its status"""
+    if isinstance(e, NodeFailed) and isinstance(e.cause, AgentError):
+        return e.cause
+    return e
+
+def http_error(e: Exception, prefix: str = "") -> HTTPException:
+    """HTTP error for a failed agent run: typed agent errors keep their status and Retry-After"""
+    e = unwrap_node_error(e)
+    if isinstance(e, AgentError):
+        headers = {"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after is not None else None
+        return HTTPException(status_code=e.status_code, detail=str(e), headers=headers)
+    return HTTPException(status_code=500, detail=f"{prefix}{e}")
+
+def article_info(article: dict) -> dict:
+    """An extracted article without its text"""
+    return {key: value for key, value in article.items() if key != "text"}
+
+async def summarize_content(request: SummarizeRequest) -> Tuple[str, Optional[dict]]:
+    """Text to summarize: ``content``, or the extracted body of ``url`` (with its article info)"""
+    if request.content:
+        return request.content, None
+    if not request.url:
+        raise HTTPException(status_code=400, detail="content or url is required")
+    try:
+        article = await article_extractor.extract(request.url)
+    except ExtractionError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    return article["text"], article_info(article)
+
+async def research_query(request: ResearchRequest) -> Tuple[str, List[dict]]:
+    """Research query for ``topic``, with the extracted ``urls`` appended as numbered sources"""
+    query = f"Research this topic in detail: {request.topic}"
+    if not request.urls:
+        return query, []
+    if len(request.urls) > ARTICLE_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {ARTICLE_MAX_URLS} urls per request")
+    articles = await article_extractor.extract_many(request.urls)
+    context = articles_context(articles, RESEARCH_ARTICLE_CHARS)
+    if context:
+        query += f"\n\nSource articles (cite them by number):\n\n{context}"
+    return query, [article_info(article) for article in articles]
+
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def sse_from_events(events: AsyncIterator[dict], extra: Optional[dict] = None) -> AsyncIterator[str]:
+    """Turn AgentRunner.stream_async events into SSE: delta*, then done or error"""
+    try:
+        async for event in events:
+            if event["type"] == "delta":
+                yield sse_event("delta", {"content": event["content"]})
+            elif event["type"] == "done":
+                done = {key: value for key, value in event.items() if key != "type"}
+                yield sse_event("done", {**done, **(extra or {})})
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        e = unwrap_node_error(e)
+        print(f"Error while streaming: {e}")
+        error = {"detail": str(e)}
+        if isinstance(e, AgentError):
+            error.update(status=e.status_code, error=e.kind, retry_after=e.retry_after)
+        yield sse_event("error", error)
+
+def sse_response(events: AsyncIterator[dict], extra: Optional[dict] = None) -> StreamingResponse:
+    return StreamingResponse(
+        sse_from_events(events, extra),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def stream_agent(agent: Any, query: str, session_id: Optional[str], extra: Optional[dict] = None) -> StreamingResponse:
+    """SSE response streaming one agent run"""
+    return sse_response(
+        agent_runner.stream_async(agent=agent, query=query, session_id=session_id),
+        extra
+    )
 
 @app.options("/{full_path:path}")
 async def options_handler(full_path: str):
@@ -161,45 +403,68 @@ async def options_handler(full_path: str):
 async def root():
     return {"message": "AI News API", "version": "1.0.0"}
 
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics (text exposition format)"""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    # Both read SQLite and may wait on a writer's lock: keep them off the event loop
+    jobs, articles = await asyncio.gather(
+        asyncio.to_thread(job_queue.stats),
+        asyncio.to_thread(article_store.count)
+    )
+    return {
+        "status": "healthy",
+        "readiness": readiness(),
+        "cache": agent_runner.cache.stats(),
+        "single_flight": agent_runner.single_flight.stats(),
+        "sessions": agent_runner.sessions.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "models": model_router.stats(),
+        "chunked_summaries": chunked_summarizer.stats(),
+        "feeds": feed_ingester.stats(),
+        "articles_extracted": article_extractor.stats(),
+        "snapshots": snapshot_scheduler.status(),
+        "trends": trend_engine.stats(),
+        "jobs": jobs,
+        "articles": articles,
+        "dedup": {**story_index.stats(), "summaries_reused": summary_reuse.hits}
+    }
+
+@app.get("/api/agents")
+async def list_agents():
+    """Registered agents with their model, sampling, cache TTL, priority and instructions hash/size"""
+    return {"agents": agent_registry.describe()}
 
 @app.post("/api/agent", response_model=AgentResponse)
 async def run_agent(request: AgentRequest):
     """Run a specific agent"""
     try:
-        agent_map = {
-            "seo": seo_agent,
-            "youtube": youtube_agent,
-            "forbes": forbes_agent,
-            "web_search": web_search_agent,
-            "daily_news_collector": daily_news_collector,
-            "breaking_news_alert": breaking_news_alert,
-            "news_research": news_research,
-            "news_summarizer": news_summarizer,
-            "multi_agent_newsroom": multi_agent_newsroom,
-            "ultimate_ai_news": ultimate_ai_news,
-            "live_news": live_news_agent,
-        }
-        
-        if request.agent_type not in agent_map:
+        if request.agent_type not in agent_registry:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid agent type. Must be one of: {list(agent_map.keys())}"
+                detail=f"Invalid agent type. Must be one of: {agent_registry.names()}"
             )
         
-        agent = agent_map[request.agent_type]
-        result = await agent_runner.run_async(
-            agent=agent,
-            query=request.query,
-            session_id=request.session_id
-        )
+        agent = agent_registry.get(request.agent_type)
+        if request.agent_type == "multi_agent_newsroom":
+            # The newsroom runs its sub-agents before the coordinator
+            result = await agent.run(agent_runner, request.query, request.session_id)
+        else:
+            result = await agent_runner.run_async(
+                agent=agent,
+                query=request.query,
+                session_id=request.session_id
+            )
         
         return AgentResponse(
             result=result.final_output,
             session_id=result.session_id,
-            agent_type=request.agent_type
+            agent_type=request.agent_type,
+            cached=result.cached,
+            model=result.model
         )
     except HTTPException:
         raise
@@ -207,47 +472,69 @@ async def run_agent(request: AgentRequest):
         import traceback
         error_details = traceback.format_exc()
         print(f"Error in run_agent: {error_details}")  # Log to console
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+        raise http_error(e, "Internal server error: ")
+
+@app.post("/api/agent/stream")
+async def stream_agent_endpoint(request: AgentRequest):
+    """Run a specific agent, streaming tokens as Server-Sent Events"""
+    if request.agent_type not in agent_registry:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid agent type. Must be one of: {agent_registry.names()}"
+        )
+    agent = agent_registry.get(request.agent_type)
+    extra = {"agent_type": request.agent_type}
+    if request.agent_type == "multi_agent_newsroom":
+        return sse_response(agent.stream(agent_runner, request.query, request.session_id), extra)
+    return stream_agent(agent, request.query, request.session_id, extra=extra)
 
 @app.post("/api/news", response_model=NewsResponse)
 async def get_news(request: NewsRequest):
-    """Get news from multiple agents"""
+    """Get news from multiple agents, running them concurrently"""
     try:
         agents_to_use = request.agents or ["seo", "youtube", "forbes", "web_search"]
-        results = {}
-        
-        agent_map = {
-            "seo": seo_agent,
-            "youtube": youtube_agent,
-            "forbes": forbes_agent,
-            "web_search": web_search_agent,
-            "daily_news_collector": daily_news_collector,
-            "breaking_news_alert": breaking_news_alert,
-            "news_research": news_research,
-            "news_summarizer": news_summarizer,
-            "multi_agent_newsroom": multi_agent_newsroom,
-            "ultimate_ai_news": ultimate_ai_news,
-            "live_news": live_news_agent,
-        }
         
         session_id = request.session_id or agent_runner.create_session_id()
+        semaphore = asyncio.Semaphore(NEWS_MAX_CONCURRENCY)
+        
+        async def run_one(agent_name: str) -> dict:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result = await asyncio.wait_for(
+                        agent_runner.run_async(
+                            agent=agent_registry.get(agent_name),
+                            query=request.query,
+                            session_id=session_id,
+                            # Fan-out results are not conversation turns
+                            remember=False
+                        ),
+                        timeout=NEWS_AGENT_TIMEOUT
+                    )
+                    entry = {"status": "ok", "result": result.final_output, "cached": result.cached, "model": result.model}
+                except asyncio.TimeoutError:
+                    entry = {"status": "timeout", "error": f"Agent timed out after {NEWS_AGENT_TIMEOUT}s"}
+                except Exception as e:
+                    entry = {"status": "error", "error": str(e)}
+                entry["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+                return entry
         
-        for agent_name in agents_to_use:
-            if agent_name in agent_map:
-                agent = agent_map[agent_name]
-                result = await agent_runner.run_async(
-                    agent=agent,
-                    query=request.query,
-                    session_id=session_id
-                )
-                results[agent_name] = result.final_output
+        names = [name for name in dict.fromkeys(agents_to_use) if name in agent_registry]
+        # Higher-priority agents get the semaphore first; results keep request order
+        tasks = {name: asyncio.ensure_future(run_one(name)) for name in agent_registry.by_priority(names)}
+        entries = await asyncio.gather(*[tasks[name] for name in names])
+        items = merge_items({
+            name: extract_items_from_text(entry["result"])
+            for name, entry in zip(names, entries) if entry["status"] == "ok"
+        }, story_index)
         
         return NewsResponse(
-            results=results,
+            results=dict(zip(names, entries)),
+            items=items,
             session_id=session_id
         )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
 
 @app.post("/api/daily-news")
 async def get_daily_news(request: DailyNewsRequest):
@@ -255,96 +542,205 @@ async def get_daily_news(request: DailyNewsRequest):
     try:
         topics = request.topics or ["ai", "crypto", "politics", "health", "pakistan", "sports"]
         query = f"Collect today's news on these topics: {', '.join(topics)}"
+        structured = request.format == "json"
         
         result = await agent_runner.run_async(
-            agent=daily_news_collector,
+            agent=agent_registry.get("daily_news_collector"),
             query=query,
-            session_id=request.session_id
+            session_id=request.session_id,
+            response_model=NewsFeed if structured else None
         )
         
+        body = {"result": result.final_output}
+        if structured:
+            body = news_payload(result.final_output, dedupe_feed(result.parsed.model_dump(exclude_none=True)), "json", request.render_text, "DAILY NEWS COLLECTION")
+        
         return {
-            "result": result.final_output,
+            **body,
             "session_id": result.session_id,
+            "cached": result.cached,
+            "model": result.model,
             "topics": topics
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
 
 @app.post("/api/breaking-news")
 async def get_breaking_news(request: BreakingNewsRequest):
-    """Get breaking news alerts"""
+    """Get breaking news alerts (default query is served from the background snapshot)"""
     try:
-        query = request.query or "Check for breaking news and high-impact events"
+        if request.query is None:
+            snapshot = await snapshot_scheduler.get("breaking_news")
+            return {
+                **news_payload(snapshot["result"], snapshot["data"], request.format, request.render_text, "BREAKING AI NEWS ALERT"),
+                "session_id": request.session_id or agent_runner.create_session_id(),
+                "cached": snapshot["cached"],
+                "alert_type": "breaking_news",
+                "generated_at": snapshot["generated_at"],
+                "model": snapshot["model"],
+                "age": snapshot["age"],
+                "stale": snapshot["stale"]
+            }
         
+        structured = request.format == "json"
         result = await agent_runner.run_async(
-            agent=breaking_news_alert,
-            query=query,
-            session_id=request.session_id
+            agent=agent_registry.get("breaking_news_alert"),
+            query=request.query,
+            session_id=request.session_id,
+            response_model=NewsFeed if structured else None
         )
         
+        body = {"result": result.final_output}
+        if structured:
+            body = news_payload(result.final_output, dedupe_feed(result.parsed.model_dump(exclude_none=True)), "json", request.render_text, "BREAKING AI NEWS ALERT")
+        
         return {
-            "result": result.final_output,
+            **body,
             "session_id": result.session_id,
+            "cached": result.cached,
+            "model": result.model,
             "alert_type": "breaking_news"
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
 
 @app.post("/api/research")
 async def research_topic(request: ResearchRequest):
-    """Deep research on a specific topic"""
+    """Deep research on a specific topic, optionally grounded in the articles at ``urls``"""
+    query, sources = await research_query(request)
     try:
         result = await agent_runner.run_async(
-            agent=news_research,
-            query=f"Research this topic in detail: {request.topic}",
+            agent=agent_registry.get("news_research"),
+            query=query,
             session_id=request.session_id
         )
         
-        return {
+        response = {
             "result": result.final_output,
             "session_id": result.session_id,
+            "cached": result.cached,
+            "model": result.model,
             "topic": request.topic
         }
+        if sources:
+            response["sources"] = sources
+        return response
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
+
+@app.post("/api/research/stream")
+async def research_topic_stream(request: ResearchRequest):
+    """Deep research on a specific topic, streamed as Server-Sent Events"""
+    query, sources = await research_query(request)
+    extra = {"topic": request.topic}
+    if sources:
+        extra["sources"] = sources
+    return stream_agent(agent_registry.get("news_research"), query, request.session_id, extra=extra)
 
 @app.post("/api/summarize")
 async def summarize_news(request: SummarizeRequest):
-    """Create TLDR summaries of news content"""
+    """Create TLDR summaries of news content, or of the article at ``url``"""
+    content, article = await summarize_content(request)
     try:
-        query = f"Create a {request.summary_type} summary of this content:\n\n{request.content}"
+        agent = agent_registry.get("news_summarizer")
+        long_content = chunked_summarizer.needed(content)
+        # Long content skips reuse: its chunks are cached, so an edit re-summarizes only the chunks around it
+        summary, key = (None, None) if long_content else summary_reuse.get(content, request.summary_type)
+        if summary is not None:
+            response = {
+                "result": summary,
+                "session_id": request.session_id or agent_runner.create_session_id(),
+                "cached": True,
+                "summary_type": request.summary_type,
+                "duplicate_of": key
+            }
+            if article is not None:
+                response["article"] = article
+            return response
         
-        result = await agent_runner.run_async(
-            agent=news_summarizer,
-            query=query,
-            session_id=request.session_id
-        )
+        chunked = None
+        if long_content:
+            result, chunked = await chunked_summarizer.summarize(
+                agent, content, request.summary_type, session_id=request.session_id
+            )
+        else:
+            result = await agent_runner.run_async(
+                agent=agent,
+                query=summary_prompt(content, request.summary_type),
+                session_id=request.session_id
+            )
+            if result.final_output:
+                summary_reuse.set(content, result.final_output, request.summary_type)
         
-        return {
+        response = {
             "result": result.final_output,
             "session_id": result.session_id,
+            "cached": result.cached,
+            "model": result.model,
             "summary_type": request.summary_type
         }
+        if chunked is not None:
+            response["chunked"] = chunked
+        if article is not None:
+            response["article"] = article
+        return response
+    except Exception as e:
+        raise http_error(e)
+
+@app.post("/api/summarize/batch")
+async def summarize_news_batch(request: BatchSummarizeRequest):
+    """Summarize many items: short ones share a model call, long ones run alone; results keep input order"""
+    if len(request.items) > SUMMARIZE_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {SUMMARIZE_BATCH_MAX_ITEMS} items per batch")
+    try:
+        body = await summary_batcher.summarize(
+            agent_registry.get("news_summarizer"),
+            [(item.content, item.summary_type or "medium") for item in request.items]
+        )
+        return {**body, "session_id": request.session_id or agent_runner.create_session_id()}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
+
+@app.post("/api/summarize/stream")
+async def summarize_news_stream(request: SummarizeRequest):
+    """Create TLDR summaries of news content, streamed as Server-Sent Events"""
+    agent = agent_registry.get("news_summarizer")
+    content, article = await summarize_content(request)
+    extra = {"summary_type": request.summary_type}
+    if article is not None:
+        extra["article"] = article
+    if chunked_summarizer.needed(content):
+        # Long content is condensed chunk by chunk first; only the final summary streams
+        try:
+            content, extra["chunked"] = await chunked_summarizer.condense(agent, content)
+        except Exception as e:
+            raise http_error(e)
+    return stream_agent(agent, summary_prompt(content, request.summary_type), request.session_id, extra=extra)
+
+@app.post("/api/extract")
+async def extract_articles(request: ExtractRequest):
+    """Main text of each article URL (boilerplate stripped, bounded size); failures carry ``error``"""
+    if len(request.urls) > ARTICLE_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {ARTICLE_MAX_URLS} urls per request")
+    return {"articles": await article_extractor.extract_many(request.urls)}
 
 @app.post("/api/newsroom")
 async def newsroom_system(request: NewsroomRequest):
-    """Multi-agent newsroom system"""
+    """Multi-agent newsroom system: collector, breaking, summarizer and research run as a DAG, then the coordinator merges them"""
     try:
-        result = await agent_runner.run_async(
-            agent=multi_agent_newsroom,
-            query=request.query,
-            session_id=request.session_id
-        )
+        result = await agent_registry.get("multi_agent_newsroom").run(agent_runner, request.query, request.session_id)
         
         return {
             "result": result.final_output,
             "session_id": result.session_id,
-            "system": "multi_agent_newsroom"
+            "cached": result.cached,
+            "model": result.model,
+            "system": "multi_agent_newsroom",
+            "nodes": result.nodes,
+            "duration_ms": result.wall_ms
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
 
 @app.post("/api/ultimate-news")
 async def ultimate_news_agent(request: UltimateNewsRequest):
@@ -356,7 +752,7 @@ async def ultimate_news_agent(request: UltimateNewsRequest):
         query = f"{request.query}\n\nUse features: {', '.join(features)}{language_note}"
         
         result = await agent_runner.run_async(
-            agent=ultimate_ai_news,
+            agent=agent_registry.get("ultimate_ai_news"),
             query=query,
             session_id=request.session_id
         )
@@ -364,40 +760,122 @@ async def ultimate_news_agent(request: UltimateNewsRequest):
         response_data = {
             "result": result.final_output,
             "session_id": result.session_id,
+            "cached": result.cached,
+            "model": result.model,
             "features": features,
             "language": request.language
         }
         
-        # Generate PDF if requested
-        if "pdf_report" in features:
-            pdf_path = generate_pdf_report(result.final_output, title="AI News Report")
-            response_data["pdf_path"] = pdf_path
+        # Mentions of the currently top entity over the last day, only when a trend graph is wanted
+        trend_data = await asyncio.to_thread(trend_engine.top_graph_data, 24) if "trend_graph" in features else None
         
-        # Generate voice summary if requested
-        if "voice_summary" in features:
-            voice_path = generate_voice_summary(result.final_output, language=request.language)
-            response_data["voice_path"] = voice_path
-        
-        # Generate trend graph if requested
-        if "trend_graph" in features:
-            # Example trend data - in production, this would come from actual analytics
-            trend_data = {
-                "dates": ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"],
-                "values": [10, 15, 13, 17, 20]
+        if request.async_artifacts:
+            # Queue artifacts and return job ids right away; poll GET /api/jobs/{job_id}
+            params = {
+                "content": result.final_output,
+                "title": "AI News Report",
+                "language": request.language,
+                "trend_data": trend_data
+            }
+            response_data["jobs"] = {
+                feature: await job_queue.submit_async(feature, params)
+                for feature in features if feature in JOB_KINDS
             }
-            graph_path = generate_trend_graph(trend_data)
-            response_data["graph_path"] = graph_path
+            return response_data
+        
+        # Render requested artifacts (PDF, voice summary, trend graph) concurrently off the event loop
+        response_data.update(await render_artifacts(
+            result.final_output,
+            features,
+            language=request.language,
+            trend_data=trend_data
+        ))
         
         return response_data
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise http_error(e)
+
+@app.get("/api/trends")
+async def get_trends(
+    terms: Optional[str] = None,
+    window: int = 24,
+    span: int = 3,
+    kind: Optional[str] = None,
+    top: int = 10,
+    by: Literal["count", "growth"] = "count"
+):
+    """Mention trends from agent outputs (no LLM call).
+
+    ``terms`` is a comma-separated list such as ``entity:openai,category:ai``;
+    without it the ``top`` terms (optionally of one ``kind``) are returned.
+    """
+    window = max(1, min(window, trend_engine.capacity))
+    ranking = trend_engine.top(top, window=window, kind=kind, by=by)
+    selected = [t.strip() for t in terms.split(",") if t.strip()] if terms else [r["term"] for r in ranking]
+    return {"top": ranking, **trend_engine.series(selected, window=window, span=span)}
+
+@app.get("/api/trends/graph")
+async def get_trend_graph(term: str, window: int = 24, fmt: Literal["png", "svg"] = "png", dpi: Optional[int] = None):
+    """Render one term's trend straight from memory"""
+    window = max(1, min(window, trend_engine.capacity))
+    image = await asyncio.to_thread(trend_renderer.render, trend_engine.graph_data(term, window), fmt, dpi)
+    return Response(content=image, media_type=MEDIA_TYPES[fmt], headers={"Cache-Control": "no-cache"})
+
+@app.get("/api/articles")
+async def list_articles(limit: int = 20, cursor: Optional[str] = None, category: Optional[str] = None, source: Optional[str] = None):
+    """Stored news items, newest first; follow ``next_cursor`` for the next page"""
+    try:
+        return await asyncio.to_thread(article_store.list, max(1, min(limit, 100)), cursor, category, source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/articles/search")
+async def search_articles(q: str, limit: int = 20, cursor: Optional[str] = None, category: Optional[str] = None):
+    """Full-text search over stored headlines, summaries and sources"""
+    try:
+        return await asyncio.to_thread(article_store.search, q, max(1, min(limit, 100)), cursor, category)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/feeds")
+async def list_feed_items(limit: int = 50):
+    """Latest RSS/Atom items from the configured feeds, newest first, with per-feed fetch status"""
+    entries = await feed_ingester.candidates(max(1, min(limit, 200)))
+    return {"items": [entry.to_dict() for entry in entries], **feed_ingester.stats()}
+
+@app.post("/api/jobs")
+async def create_job(request: JobRequest):
+    """Queue an artifact job; returns its id immediately"""
+    if request.kind not in JOB_KINDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid job kind. Must be one of: {list(JOB_KINDS.keys())}"
+        )
+    if request.kind != "trend_graph" and not request.content:
+        raise HTTPException(status_code=400, detail="content is required for this job kind")
+    job_id = await job_queue.submit_async(request.kind, request.model_dump(exclude={"kind"}))
+    return {"job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status: queued, running, done (with download url) or failed"""
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+def artifact_headers(filename: str) -> dict:
+    """Content-addressed artifacts never change, so clients and CDNs may cache them for good"""
+    if is_content_addressed(filename):
+        return {"Cache-Control": "public, max-age=31536000, immutable"}
+    return {}
 
 @app.get("/api/download-pdf/{filename}")
 async def download_pdf(filename: str):
     """Download generated PDF file"""
     file_path = f"reports/{filename}"
     if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="application/pdf", filename=filename)
+        return FileResponse(file_path, media_type="application/pdf", filename=filename, headers=artifact_headers(filename))
     raise HTTPException(status_code=404, detail="PDF file not found")
 
 @app.get("/api/download-audio/{filename}")
@@ -405,28 +883,35 @@ async def download_audio(filename: str):
     """Download generated audio file"""
     file_path = f"audio/{filename}"
     if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="audio/mpeg", filename=filename)
+        return FileResponse(file_path, media_type="audio/mpeg", filename=filename, headers=artifact_headers(filename))
     raise HTTPException(status_code=404, detail="Audio file not found")
 
+@app.get("/api/download-graph/{filename}")
+async def download_graph(filename: str):
+    """Download generated trend graph"""
+    file_path = f"graphs/{filename}"
+    if os.path.exists(file_path):
+        media_type = "image/svg+xml" if filename.endswith(".svg") else "image/png"
+        return FileResponse(file_path, media_type=media_type, filename=filename, headers=artifact_headers(filename))
+    raise HTTPException(status_code=404, detail="Graph file not found")
+
 @app.post("/api/live-news")
 async def get_live_news(request: LiveNewsRequest):
     """Get live news updates in real-time - AI news only"""
     try:
-        import traceback
-        # Force AI category only - ignore other categories
-        query = "Get the latest AI (Artificial Intelligence) related news updates from the web. Search for real AI news from sources like TechCrunch, The Verge, MIT Technology Review, Reuters Tech, and BBC Technology. Focus ONLY on: Machine Learning, Deep Learning, Neural Networks, AI Research, AI Companies, AI Tools, AI Ethics, AI Regulations, AI Breakthroughs, and AI Applications. Provide the news in the readable format as specified in your instructions. Include actual headlines, summaries, sources, URLs, and timestamps. Filter out any non-AI content. DO NOT mention JSON format - directly provide the news."
-        
-        result = await agent_runner.run_async(
-            agent=live_news_agent,
-            query=query,
-            session_id=request.session_id
-        )
+        # Force AI category only - ignore other categories; served from the background snapshot
+        snapshot = await snapshot_scheduler.get("live_news")
         
         return {
-            "result": result.final_output,
-            "session_id": result.session_id,
+            **news_payload(snapshot["result"], snapshot["data"], request.format, request.render_text, "LIVE AI NEWS UPDATE"),
+            "session_id": request.session_id or agent_runner.create_session_id(),
+            "cached": snapshot["cached"],
             "categories": ["ai"],  # Always AI only
-            "update_time": "live"
+            "update_time": "live",
+            "generated_at": snapshot["generated_at"],
+            "model": snapshot["model"],
+            "age": snapshot["age"],
+            "stale": snapshot["stale"]
         }
     except HTTPException:
         raise
@@ -435,22 +920,32 @@ async def get_live_news(request: LiveNewsRequest):
         error_details = traceback.format_exc()
         error_message = str(e)
         
-        # Check for quota errors and return appropriate status code
-        if "quota" in error_message.lower() or "429" in error_message:
-            print(f"Quota error in /api/live-news: {error_message}\n{error_details}")
-            raise HTTPException(
-                status_code=402,  # Payment Required
-                detail=error_message
-            )
-        elif "invalid" in error_message.lower() and "api" in error_message.lower():
-            print(f"API key error in /api/live-news: {error_message}\n{error_details}")
-            raise HTTPException(
-                status_code=401,  # Unauthorized
-                detail=error_message
-            )
-        else:
-            print(f"Error in /api/live-news: {error_message}\n{error_details}")
-            raise HTTPException(status_code=500, detail=f"Internal Server Error: {error_message}")
+        # Quota (402), bad key (401) and rate limits (429) keep their status code
+        print(f"Error in /api/live-news: {error_message}\n{error_details}")
+        raise http_error(e, "Internal Server Error: ")
+
+@app.post("/api/live-news/stream")
+async def get_live_news_stream(request: LiveNewsRequest):
+    """Live AI news as Server-Sent Events; a fresh snapshot is sent as one delta"""
+    snapshot = snapshot_scheduler.store.read("live_news")
+    extra = {"categories": ["ai"], "update_time": "live"}
+    
+    if snapshot is not None and time.time() - snapshot["generated_ts"] <= snapshot_scheduler.stale_after:
+        text = news_payload(snapshot["result"], snapshot.get("data"), "text", False, "LIVE AI NEWS UPDATE")["result"]
+        
+        async def snapshot_events():
+            yield {"type": "delta", "content": text}
+            yield {
+                "type": "done",
+                "session_id": request.session_id or agent_runner.create_session_id(),
+                "usage": None,
+                "cached": True,
+                "generated_at": snapshot["generated_at"]
+            }
+        return sse_response(snapshot_events(), extra)
+    
+    # Only a client-supplied session is remembered; stream_async names anonymous polls itself
+    return stream_agent(agent_registry.get("live_news"), await with_feeds(LIVE_NEWS_QUERY), request.session_id, extra)
 
 if __name__ == "__main__":
     import uvicorn
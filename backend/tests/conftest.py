@@ -0,0 +1,42 @@
+"""
+Shared fixtures: local HTTP servers for code that talks to the network
+"""
+from contextlib import ExitStack
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+
+
+class LocalServer:
+    """Runs an ASGI app with uvicorn on a free local port in a background thread"""
+
+    def __init__(self, app):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="error"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+@pytest.fixture
+def serve():
+    """Start an ASGI app on a free local port; returns its base URL (``http://127.0.0.1:<port>``)"""
+    with ExitStack() as stack:
+        def start(app) -> str:
+            server = stack.enter_context(LocalServer(app))
+            return f"http://127.0.0.1:{server.port}"
+
+        yield start
@@ -0,0 +1,152 @@
+"""
+AgentRunner: result cache, single-flight coalescing, fallback handling and sessions (upstream faked)
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from agents import agent_runner as runner_module
+from agents.agent_runner import AgentRunner
+from agents.base import Agent
+from agents.result_cache import ResultCache, expires_at, make_cache_key
+from agents.session_store import SessionStore
+
+
+@pytest.fixture
+def agent():
+    agent = Agent(name="Test Agent", instructions="Answer.", model="gpt-main", cache_ttl=3600, fallback_models=["gpt-small"])
+    agent.agent_id = "test"
+    return agent
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Fake Runner.run: answers "<query> #<call>" from ``upstream.model`` after ``upstream.delay``"""
+    state = SimpleNamespace(calls=0, model="gpt-main", delay=0.0, histories=[])
+
+    async def run(agent, query, response_model=None, history=None):
+        state.calls += 1
+        state.histories.append(list(history or []))
+        await asyncio.sleep(state.delay)
+        return SimpleNamespace(final_output=f"{query} #{state.calls}", parsed=None, model=state.model)
+
+    monkeypatch.setattr(runner_module.Runner, "run", staticmethod(run))
+    return state
+
+
+def test_cache_key_ignores_spacing_and_case(agent):
+    assert make_cache_key(agent, "Latest  AI news") == make_cache_key(agent, "latest ai news")
+    assert make_cache_key(agent, "latest ai news") != make_cache_key(agent, "latest ai news", "Structured")
+
+
+def test_exact_cache_keys_keep_case_and_spacing(agent):
+    assert make_cache_key(agent, "Apple  results", exact=True) != make_cache_key(agent, "apple results", exact=True)
+    agent.cache_exact_query = True
+    assert make_cache_key(agent, "US policy") != make_cache_key(agent, "us policy")
+
+
+def test_result_cache_expiry_and_byte_budget(monkeypatch):
+    cache = ResultCache(max_bytes=2 * (ResultCache.ENTRY_OVERHEAD + 20))
+    cache.set("a", "x" * 10, ttl=60)
+    cache.set("b", "y" * 10, ttl=60)
+    cache.set("c", "z" * 10, ttl=60)
+    assert cache.get("a") is None and cache.get("c") == "z" * 10
+    assert cache.stats()["evictions"] == 1
+    now = time.time()
+    monkeypatch.setattr("agents.result_cache.time.time", lambda: now + 61)
+    assert cache.get("c") is None
+
+
+def test_bucketed_expiry_is_the_window_boundary():
+    assert expires_at(60, bucketed=True, now=125) == 180
+    assert expires_at(60, now=125) == 185
+
+
+def test_repeat_runs_are_served_from_the_cache(agent, upstream):
+    runner = AgentRunner(cache=ResultCache())
+
+    async def run():
+        first = await runner.run_async(agent, "latest news", remember=False)
+        second = await runner.run_async(agent, "Latest  News", remember=False)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert upstream.calls == 1
+    assert not first.cached and first.model == "gpt-main"
+    assert second.cached and second.final_output == first.final_output
+
+
+def test_concurrent_identical_runs_share_one_call(agent, upstream):
+    upstream.delay = 0.05
+    runner = AgentRunner(cache=ResultCache())
+
+    async def run():
+        return await asyncio.gather(*(runner.run_async(agent, "same", use_cache=False, remember=False) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert upstream.calls == 1
+    assert {result.final_output for result in results} == {"same #1"}
+    assert runner.single_flight.stats()["coalesced"] == 4
+
+
+def test_fallback_output_is_cached_briefly(agent, upstream):
+    upstream.model = "gpt-small"
+    runner = AgentRunner(cache=ResultCache())
+    runner.fallback_cache_ttl = 60
+    asyncio.run(runner.run_async(agent, "latest news", remember=False))
+    (_, expiry, _), = runner.cache._entries.values()
+    assert expiry - time.time() <= 60
+
+    upstream.model = "gpt-main"
+    runner.cache.clear()
+    asyncio.run(runner.run_async(agent, "latest news", remember=False))
+    (_, expiry, _), = runner.cache._entries.values()
+    assert expiry - time.time() > 3000
+
+
+def test_only_caller_supplied_sessions_are_remembered(agent, upstream):
+    runner = AgentRunner(cache=ResultCache())
+
+    async def run():
+        anonymous = await runner.run_async(agent, "first question")
+        assert runner.sessions.stats()["sessions"] == 0
+        assert runner.sessions.history(anonymous.session_id) == []
+        await runner.run_async(agent, "question one", session_id="chat-1")
+        await runner.run_async(agent, "question two", session_id="chat-1")
+
+    asyncio.run(run())
+    assert runner.sessions.stats()["sessions"] == 1
+    # The follow-up was sent with the first exchange
+    assert [m["content"] for m in upstream.histories[-1]] == ["question one", "question one #2"]
+
+
+def test_anonymous_streams_are_not_remembered(agent, monkeypatch):
+    async def stream(agent, query, history=None):
+        yield {"type": "delta", "content": "hello"}
+        yield {"type": "usage", "usage": None, "model": "gpt-main"}
+
+    monkeypatch.setattr(runner_module.Runner, "stream", staticmethod(stream))
+    runner = AgentRunner(cache=ResultCache())
+
+    async def run():
+        events = [event async for event in runner.stream_async(agent, "hi")]
+        events += [event async for event in runner.stream_async(agent, "hi again", session_id="chat-2")]
+        return events
+
+    events = asyncio.run(run())
+    assert events[1]["session_id"] and events[-1]["session_id"] == "chat-2"
+    assert runner.sessions.stats()["sessions"] == 1
+
+
+def test_session_history_is_trimmed_into_a_summary():
+    store = SessionStore(token_budget=60, max_sessions=2)
+    for i in range(6):
+        store.append("s", f"Question {i}. With detail.", f"Answer {i}. " + "words " * 20)
+    history = store.history("s")
+    assert history[0]["role"] == "system" and "Question 0." in history[0]["content"]
+    assert history[-1]["content"].startswith("Answer 5.")
+    store.append("t", "q", "a")
+    store.append("u", "q", "a")
+    assert store.history("s") == []
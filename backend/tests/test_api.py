@@ -0,0 +1,83 @@
+"""
+HTTP endpoints: session handling of the SSE routes and error statuses (upstream faked)
+"""
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import main
+from agents import agent_runner as runner_module
+from agents.agent_runner import AgentRunner
+from agents.errors import RateLimitedError
+from agents.result_cache import ResultCache
+from utils.trends import TrendEngine
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    """A fresh AgentRunner behind the app, with Runner.stream faked"""
+    async def stream(agent, query, history=None):
+        yield {"type": "delta", "content": "news"}
+        yield {"type": "usage", "usage": None, "model": "gpt-test"}
+
+    async def no_feeds(query):
+        return query
+
+    monkeypatch.setattr(runner_module.Runner, "stream", staticmethod(stream))
+    monkeypatch.setattr(main, "with_feeds", no_feeds)
+    runner = AgentRunner(cache=ResultCache())
+    monkeypatch.setattr(main, "agent_runner", runner)
+    return runner
+
+
+def post(path: str, body: dict) -> httpx.Response:
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(path, json=body)
+
+    return asyncio.run(run())
+
+
+def test_anonymous_live_news_streams_are_not_remembered(runner, monkeypatch):
+    monkeypatch.setattr(main.snapshot_scheduler.store, "read", lambda name: None)
+    for _ in range(3):
+        response = post("/api/live-news/stream", {})
+        assert response.status_code == 200 and '"session_id"' in response.text
+    assert runner.sessions.stats()["sessions"] == 0
+
+    post("/api/live-news/stream", {"session_id": "reader-1"})
+    assert runner.sessions.stats()["sessions"] == 1
+
+
+def test_newsroom_node_errors_keep_their_status(runner, monkeypatch):
+    async def limited(agent, query, response_model=None, history=None):
+        raise RateLimitedError("slow down", retry_after=7)
+
+    monkeypatch.setattr(runner_module.Runner, "run", staticmethod(limited))
+    response = post("/api/newsroom", {"query": "AI chips"})
+    # Sub-agents are optional; the coordinator's failure is the one surfaced
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "7"
+    assert response.json()["detail"] == "slow down"
+
+
+def test_ultimate_news_builds_trend_data_only_for_a_trend_graph(runner, monkeypatch):
+    async def answer(agent, query, response_model=None, history=None):
+        return SimpleNamespace(final_output="Nothing new today", usage=None, model="gpt-test")
+
+    async def render_artifacts(content, features, language="english", trend_data=None):
+        rendered.append(trend_data)
+        return {}
+
+    rendered = []
+    monkeypatch.setattr(runner_module.Runner, "run", staticmethod(answer))
+    monkeypatch.setattr(main, "render_artifacts", render_artifacts)
+    monkeypatch.setattr(main, "trend_engine", TrendEngine(directory=""))
+
+    assert post("/api/ultimate-news", {"query": "AI", "features": ["summaries"]}).status_code == 200
+    assert post("/api/ultimate-news", {"query": "AI", "features": ["trend_graph"]}).status_code == 200
+    # Nothing counted yet: an empty, flagged series rather than example values
+    assert rendered[0] is None and rendered[1]["empty"] and rendered[1]["values"] == []
@@ -0,0 +1,183 @@
+"""
+Article extraction: boilerplate stripping, the ETag disk cache, and refusing non-public URLs
+"""
+import asyncio
+import random
+
+import pytest
+from fastapi import FastAPI, Request, Response
+
+from utils.article_extractor import ArticleExtractor, ExtractionError, extract_html, is_public_address
+
+WORDS = "model training inference chips datacenter regulation safety benchmark startup funding".split()
+# Every piece of page chrome carries this marker, so a leak shows up in the text
+BOILERPLATE_MARK = "BOILERPLATE"
+
+
+def make_page(seed: int) -> tuple:
+    """(html, article paragraphs) for a news page wrapped in navigation, comments and footer"""
+    rng = random.Random(seed)
+    paragraphs = [
+        " ".join(" ".join(rng.choice(WORDS) for _ in range(16)).capitalize() + "." for _ in range(3))
+        for _ in range(8)
+    ]
+    nav = "".join(f'<li><a href="/section/{i}">{BOILERPLATE_MARK} section {i}</a></li>' for i in range(15))
+    related = "".join(f'<li><a href="/story/{i}">{BOILERPLATE_MARK} related story headline {i}</a></li>' for i in range(8))
+    comments = "".join(f'<div class="comment"><p>{BOILERPLATE_MARK} reader comment {i}</p></div>' for i in range(6))
+    body = "".join(f"<p>{p}</p>" if i % 4 else f"<p>{p} <a href='/x/{i}'>link</a></p>" for i, p in enumerate(paragraphs))
+    page = f"""<!DOCTYPE html><html><head><meta charset="utf-8"><title>Story {seed} | Example News</title>
+<meta property="og:title" content="Story {seed}">
+<script>window.analytics = {{"id": "{BOILERPLATE_MARK}"}};</script></head>
+<body><header><div class="logo">{BOILERPLATE_MARK} Example News</div><nav><ul>{nav}</ul></nav></header>
+<div class="layout"><div class="content"><article><h1>Story {seed}</h1>
+<div class="article-body">{body}</div>
+<div class="share-tools"><a href="#">{BOILERPLATE_MARK} Share on X</a></div>
+</article><section class="comments">{comments}</section></div>
+<aside class="sidebar"><h3>{BOILERPLATE_MARK} Most read</h3><ul>{related}</ul></aside></div>
+<footer><p>{BOILERPLATE_MARK} Copyright 2026 Example News. All rights reserved.</p></footer></body></html>"""
+    return page, paragraphs
+
+
+def test_extract_html_keeps_article_and_drops_boilerplate():
+    page, paragraphs = make_page(3)
+    result = extract_html(page.encode("utf-8"))
+    assert result["title"] == "Story 3"
+    assert all(paragraph in result["text"] for paragraph in paragraphs)
+    assert BOILERPLATE_MARK not in result["text"]
+
+
+def test_extract_html_bounds_the_body_at_a_paragraph():
+    page = make_page(5)[0].encode("utf-8")
+    first = extract_html(page, max_chars=1_000_000)["text"].split("\n\n")[0]
+    result = extract_html(page, max_chars=len(first) + 10)
+    assert result["truncated"]
+    assert result["text"] == first
+
+
+@pytest.mark.parametrize("address, public", [
+    ("127.0.0.1", False),
+    ("10.1.2.3", False),
+    ("192.168.0.10", False),
+    ("169.254.169.254", False),
+    ("100.64.0.1", False),
+    ("::1", False),
+    ("fe80::1%eth0", False),
+    ("::ffff:127.0.0.1", False),
+    ("0.0.0.0", False),
+    ("93.184.216.34", True),
+    ("2606:4700::1111", True),
+])
+def test_is_public_address(address, public):
+    assert is_public_address(address) is public
+
+
+def _site(pages: dict) -> FastAPI:
+    app = FastAPI()
+    app.state.served = {200: 0, 304: 0}
+
+    @app.get("/page/{name}")
+    async def page(name: str, request: Request):
+        if request.headers.get("if-none-match") == '"v1"':
+            app.state.served[304] += 1
+            return Response(status_code=304, headers={"ETag": '"v1"'})
+        app.state.served[200] += 1
+        return Response(pages[name], media_type="text/html; charset=utf-8", headers={"ETag": '"v1"'})
+
+    @app.get("/plain")
+    async def plain():
+        return Response("ami-id: secret", media_type="text/plain")
+
+    @app.get("/redirect")
+    async def redirect(to: str):
+        return Response(status_code=302, headers={"Location": to})
+
+    return app
+
+
+def test_private_and_metadata_urls_are_refused(tmp_path):
+    extractor = ArticleExtractor(directory=str(tmp_path), allow_private=False)
+    for url in (
+        "http://127.0.0.1:1/page",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://[::1]/",
+        "http://localhost/admin",
+        "file:///etc/passwd",
+        "gopher://example.com/",
+    ):
+        with pytest.raises(ExtractionError):
+            asyncio.run(extractor.extract(url))
+
+
+def test_redirect_to_private_address_is_refused(serve, tmp_path):
+    base = serve(_site({}))
+    extractor = ArticleExtractor(directory=str(tmp_path), allow_private=False)
+
+    async def run():
+        # The first hop is allowed here; the redirect target must still be checked
+        original = extractor.check_url
+
+        async def check(url):
+            if url.startswith(base):
+                extractor.check_scheme(url)
+                return
+            await original(url)
+
+        extractor.check_url = check
+        extractor._check_peer = lambda url, response: None
+        try:
+            await extractor.extract(f"{base}/redirect?to=http://169.254.169.254/latest/meta-data/")
+        finally:
+            await extractor.shutdown()
+
+    with pytest.raises(ExtractionError, match="not a public address"):
+        asyncio.run(run())
+
+
+def test_connection_to_private_peer_is_refused(serve, tmp_path):
+    # DNS said "public" but the socket ended up on loopback (rebinding)
+    base = serve(_site({"a": make_page(1)[0]}))
+    extractor = ArticleExtractor(directory=str(tmp_path), allow_private=False)
+
+    async def run():
+        extractor.check_url = lambda url: asyncio.sleep(0)
+        try:
+            await extractor.extract(f"{base}/page/a")
+        finally:
+            await extractor.shutdown()
+
+    with pytest.raises(ExtractionError, match="non-public address"):
+        asyncio.run(run())
+
+
+def test_non_html_responses_are_refused(serve, tmp_path):
+    base = serve(_site({}))
+    extractor = ArticleExtractor(directory=str(tmp_path), allow_private=True)
+
+    async def run():
+        try:
+            await extractor.extract(f"{base}/plain")
+        finally:
+            await extractor.shutdown()
+
+    with pytest.raises(ExtractionError, match="Not an HTML page"):
+        asyncio.run(run())
+
+
+def test_redirects_are_followed_and_bodies_cached_by_etag(serve, tmp_path):
+    app = _site({"a": make_page(1)[0]})
+    base = serve(app)
+    extractor = ArticleExtractor(directory=str(tmp_path), fresh_for=0, allow_private=True)
+
+    async def run():
+        try:
+            first = await extractor.extract(f"{base}/redirect?to=/page/a")
+            second = await extractor.extract(f"{base}/redirect?to=/page/a")
+            return first, second
+        finally:
+            await extractor.shutdown()
+
+    first, second = asyncio.run(run())
+    assert first["title"] == "Story 1" and not first["cached"]
+    # Revalidated with If-None-Match after the redirect: served from disk without parsing
+    assert second["cached"] and second["text"] == first["text"]
+    assert app.state.served == {200: 1, 304: 1}
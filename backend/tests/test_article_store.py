@@ -0,0 +1,99 @@
+"""
+Article store: data-directory placement, URL deduplication, keyset pagination and FTS search
+"""
+import pytest
+
+from utils import storage
+from utils.article_store import ArticleStore, decode_cursor, extract_items_from_text
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(db_path=str(tmp_path / "articles.sqlite3"), batch_size=1000)
+    yield store
+    if store._conn is not None:
+        store._conn.close()
+
+
+def add(store, count, now, **fields):
+    for i in range(count):
+        store.add_items([{"headline": f"Story number {i}", "url": f"https://example.com/{now}/{i}", **fields}])
+    # Every row of one batch shares first_seen, so the id breaks ties
+    with store._lock:
+        store._pending = [row[:8] + (now, now) for row in store._pending]
+    store.flush()
+
+
+def test_default_database_lives_in_the_data_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(storage, "_data_dir", str(tmp_path))
+    monkeypatch.delenv("ARTICLES_DB_PATH", raising=False)
+    assert ArticleStore().db_path == str(tmp_path / "articles.sqlite3")
+
+
+def test_same_canonical_url_is_stored_once(store):
+    store.add_items([
+        {"headline": "A model launch", "url": "https://example.com/a?utm_source=x"},
+        {"headline": "A model launch, reworded", "url": "https://www.example.com/a"},
+        {"headline": "No url here at all"},
+        {"headline": "No  URL here at all"},
+    ])
+    assert store.flush() == 4
+    assert store.count() == 2
+
+
+def test_keyset_pages_cover_every_row_once_in_order(store):
+    add(store, 25, now=1000.0)
+    add(store, 10, now=2000.0, category="AI")
+    pages, cursor = [], None
+    while True:
+        page = store.list(limit=7, cursor=cursor)
+        pages.append(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    ids = [item["id"] for items in pages for item in items]
+    assert len(ids) == len(set(ids)) == 35
+    keys = [(item["first_seen"], item["id"]) for items in pages for item in items]
+    assert keys == sorted(keys, reverse=True)
+    assert [len(items) for items in pages] == [7, 7, 7, 7, 7]
+
+    first = store.list(limit=4, category="ai")
+    assert len(first["items"]) == 4 and all(item["category"] == "ai" for item in first["items"])
+    rest = store.list(limit=10, cursor=first["next_cursor"], category="ai")
+    assert len(rest["items"]) == 6 and rest["next_cursor"] is None
+
+
+def test_search_matches_prefixes_and_paginates(store):
+    store.add_items([{"headline": f"Datacenter expansion {i}", "url": f"https://example.com/{i}"} for i in range(5)])
+    store.add_items([{"headline": "Unrelated sports result", "url": "https://example.com/s"}])
+    store.flush()
+    first = store.search("datacen", limit=3)
+    second = store.search("datacen", limit=3, cursor=first["next_cursor"])
+    assert len(first["items"]) == 3 and len(second["items"]) == 2
+    assert second["next_cursor"] is None
+    # FTS syntax in user input is quoted, not interpreted
+    assert store.search('"OR (') == {"items": [], "next_cursor": None}
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_items_are_parsed_from_the_text_layout():
+    text = "\n".join([
+        "🚨 Lab releases open model",
+        "📰 Source: Example News | ⏰ Time: 2h ago",
+        "The weights are public.",
+        "🔗 https://example.com/model",
+        "• Chip maker expands - New fab announced | 📰 Wire | 🔗 https://example.com/fab",
+    ])
+    items = extract_items_from_text(text)
+    assert items[0] == {
+        "headline": "Lab releases open model",
+        "summary": "The weights are public.",
+        "source": "Example News",
+        "time": "2h ago",
+        "url": "https://example.com/model",
+    }
+    assert items[1]["headline"] == "Chip maker expands" and items[1]["url"] == "https://example.com/fab"
@@ -0,0 +1,84 @@
+"""
+Story deduplication: canonical URLs, MinHash/LSH matching and exact summary reuse
+"""
+from utils.dedup import ContentCache, NearDuplicateIndex, canonicalize_url, dedupe_items, merge_items
+
+
+HEADLINE = "OpenAI raises $6.6 billion in new funding round led by Thrive Capital"
+
+
+def test_canonicalize_url_drops_tracking_and_www():
+    assert canonicalize_url("http://www.example.com/story/?utm_source=x&id=3&fbclid=y#top") == "https://example.com/story?id=3"
+    assert canonicalize_url("example.com//a//b/") == "https://example.com/a/b"
+    assert canonicalize_url("#") is None
+
+
+def test_reworded_headline_is_the_same_story():
+    index = NearDuplicateIndex(threshold=0.5, capacity=100)
+    first = index.add(HEADLINE)
+    again = index.add("OpenAI raises $6.6 billion in a new funding round led by Thrive Capital.")
+    other = index.add("Nvidia unveils Blackwell Ultra chips at GTC keynote")
+    assert not first.duplicate
+    assert again.duplicate and again.story_id == first.story_id
+    assert not other.duplicate and other.story_id != first.story_id
+
+
+def test_same_url_is_the_same_story_whatever_the_text():
+    index = NearDuplicateIndex(capacity=100)
+    first = index.add("One headline", "https://example.com/a?utm_medium=social")
+    second = index.add("Entirely different words", "https://www.example.com/a")
+    assert second.duplicate and second.story_id == first.story_id
+
+
+def test_match_does_not_add():
+    index = NearDuplicateIndex(capacity=100)
+    assert index.match(HEADLINE) is None
+    assert index.stats()["stories"] == 0
+
+
+def test_capacity_evicts_oldest_stories():
+    index = NearDuplicateIndex(capacity=2)
+    index.add("first story about chips and datacenters", "https://a.example/1")
+    index.add("second story about model releases", "https://a.example/2")
+    index.add("third story about regulation in europe", "https://a.example/3")
+    assert index.stats()["stories"] == 2 and index.stats()["urls"] == 2
+    assert index.match("first story about chips and datacenters") is None
+    assert index.match("unrelated words", "https://a.example/1") is None
+    assert index.match("unrelated words", "https://a.example/3") is not None
+
+
+def test_merge_items_collects_sources():
+    index = NearDuplicateIndex(capacity=100)
+    merged = merge_items({
+        "live": [{"headline": HEADLINE, "url": "https://example.com/openai"}],
+        "breaking": [{"headline": HEADLINE.upper(), "summary": "Details"}],
+    }, index)
+    assert len(merged) == 1
+    assert merged[0]["sources"] == ["live", "breaking"]
+    assert merged[0]["duplicates"] == 1
+    assert merged[0]["summary"] == "Details"
+
+
+def test_dedupe_items_keeps_first_report():
+    items = [{"headline": HEADLINE}, {"headline": HEADLINE + "!"}, {"headline": "Something else entirely happened"}]
+    deduped = dedupe_items(items, NearDuplicateIndex(capacity=100))
+    assert [item["headline"] for item in deduped] == [HEADLINE, "Something else entirely happened"]
+
+
+def test_content_cache_reuses_only_identical_content():
+    cache = ContentCache(capacity=10)
+    cache.set("Revenue rose 12% to $4.1bn in the third quarter.", "summary", "short")
+    value, key = cache.get("  revenue ROSE 12% to $4.1bn in the third quarter ", "short")
+    assert value == "summary" and key
+    # A changed figure is a different document, however similar
+    assert cache.get("Revenue rose 21% to $4.1bn in the third quarter.", "short") == (None, None)
+    assert cache.get("Revenue rose 12% to $4.1bn in the third quarter.", "long") == (None, None)
+    assert cache.hits == 1
+
+
+def test_content_cache_is_bounded():
+    cache = ContentCache(capacity=2)
+    for text in ("a one", "b two", "c three"):
+        cache.set(text, text)
+    assert cache.get("a one") == (None, None)
+    assert cache.get("c three")[0] == "c three"
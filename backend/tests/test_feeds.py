@@ -0,0 +1,188 @@
+"""
+Feeds: incremental RSS/Atom parsing, conditional polling and per-host throttling (fixture server)
+"""
+import asyncio
+import hashlib
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from fastapi import FastAPI, Request, Response
+
+from utils.feeds import FeedIngester, FeedParser, FeedSource, parse_sources, with_feed_context
+
+RSS = """<?xml version="1.0"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel><title>Wire</title>
+<item>
+  <title>Lab &amp; partners release a model</title>
+  <link>https://news.example/a</link>
+  <description>&lt;p&gt;Weights are &lt;b&gt;public&lt;/b&gt;.&lt;/p&gt;</description>
+  <pubDate>Tue, 06 Jan 2026 10:30:00 +0200</pubDate>
+</item>
+<item><title></title><link>https://news.example/untitled</link></item>
+<item><title>Guid only</title><guid>https://news.example/guid</guid><pubDate>not a date</pubDate></item>
+</channel></rss>"""
+
+ATOM = """<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Blog</title>
+<entry>
+  <title>Atom story</title>
+  <link rel="self" href="https://blog.example/self"/>
+  <link rel="alternate" href="https://blog.example/story"/>
+  <summary type="html">Short summary</summary>
+  <updated>2026-01-06T08:00:00Z</updated>
+</entry>
+</feed>"""
+
+
+WORDS = "model chips inference agents regulation safety startup funding research benchmark".split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def rss_feed(items: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    entries = "".join(
+        f"<item><title>{sentence(rng, 8)}</title><link>https://news.example/{seed}/{i}</link>"
+        f"<description>&lt;p&gt;{sentence(rng, 60)}.&lt;/p&gt;</description>"
+        f"<pubDate>{format_datetime(start + timedelta(minutes=i * 7 + seed))}</pubDate></item>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Wire</title>{entries}</channel></rss>'
+
+
+def atom_feed(items: int, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    entries = "".join(
+        f'<entry><title>{sentence(rng, 8)}</title><link rel="alternate" href="https://atom.example/{seed}/{i}"/>'
+        f'<summary type="html">{sentence(rng, 30)}</summary>'
+        f"<updated>{(start + timedelta(minutes=i * 5 + seed)).isoformat()}</updated></entry>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Blog</title>{entries}</feed>'
+
+
+def feed_url(base_url: str, name: str) -> str:
+    return f"{base_url}/feeds/{name}"
+
+
+def create_feed_app(feeds: dict) -> FastAPI:
+    """Serves ``feeds`` ({name: xml}) with ETags and 304s; ``app.state.served`` counts responses by status"""
+    app = FastAPI()
+    app.state.served = {200: 0, 304: 0, 404: 0}
+
+    @app.get("/feeds/{name}")
+    async def feed(name: str, request: Request):
+        body = feeds.get(name)
+        if body is None:
+            app.state.served[404] += 1
+            return Response(status_code=404)
+        etag = '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+        if request.headers.get("if-none-match") == etag:
+            app.state.served[304] += 1
+            return Response(status_code=304, headers={"ETag": etag})
+        app.state.served[200] += 1
+        return Response(content=body, media_type="application/rss+xml", headers={"ETag": etag})
+
+    return app
+
+
+def parse(xml: str, max_items: int = 10, chunk: int = 7, summary_chars: int = 400) -> FeedParser:
+    parser = FeedParser("Source", max_items, summary_chars)
+    data = xml.encode("utf-8")
+    for start in range(0, len(data), chunk):
+        parser.feed(data[start:start + chunk])
+        if parser.full:
+            return parser
+    parser.close()
+    return parser
+
+
+def test_rss_items_parsed_across_chunk_boundaries():
+    first, second = parse(RSS).entries
+    assert first.title == "Lab & partners release a model"
+    assert first.url == "https://news.example/a"
+    assert first.summary == "Weights are public ."
+    assert first.published == "2026-01-06T08:30:00+00:00"
+    # Untitled items are skipped; guid stands in for a missing link; bad dates are dropped
+    assert (second.url, second.published) == ("https://news.example/guid", None)
+
+
+def test_atom_uses_the_alternate_link():
+    entry, = parse(ATOM).entries
+    assert entry.url == "https://blog.example/story"
+    assert entry.summary == "Short summary"
+    assert entry.published == "2026-01-06T08:00:00+00:00"
+
+
+def test_parser_stops_at_max_items_and_bounds_summaries():
+    parser = parse(rss_feed(50), max_items=3, chunk=256, summary_chars=40)
+    assert parser.full and len(parser.entries) == 3
+    assert all(len(entry.summary) <= 41 for entry in parser.entries)
+
+
+def test_parse_sources():
+    assert parse_sources("Wire|https://a.example/rss, https://b.example/feed,") == [
+        FeedSource("Wire", "https://a.example/rss"),
+        FeedSource("b.example", "https://b.example/feed"),
+    ]
+
+
+def test_poll_merges_newest_first_and_revalidates(serve):
+    app = create_feed_app({"rss": rss_feed(5, seed=1), "atom": atom_feed(5, seed=2)})
+    base = serve(app)
+    ingester = FeedIngester(
+        sources=[FeedSource("RSS", feed_url(base, "rss")), FeedSource("Atom", feed_url(base, "atom")), FeedSource("Gone", feed_url(base, "gone"))],
+        host_delay=0,
+        poll_interval=0
+    )
+
+    async def run():
+        try:
+            first = await ingester.poll()
+            second = await ingester.poll()
+            return first, second
+        finally:
+            await ingester.shutdown()
+
+    first, second = asyncio.run(run())
+    assert len(first) == 10
+    published = [entry.published for entry in first]
+    assert published == sorted(published, reverse=True)
+    # Unchanged feeds answer 304 and keep their items
+    assert [entry.url for entry in second] == [entry.url for entry in first]
+    assert app.state.served == {200: 2, 304: 2, 404: 2}
+    feeds = ingester.stats()["feeds"]
+    assert feeds["RSS"]["status"] == "not_modified" and feeds["Gone"]["error"] == "HTTP 404"
+    assert "URL: https://news.example/1/0" in with_feed_context("Latest AI news", first)
+
+
+def test_throttled_host_is_skipped_until_retry_after(serve):
+    app = FastAPI()
+    app.state.hits = 0
+
+    @app.get("/feeds/{name}")
+    async def busy(name: str):
+        app.state.hits += 1
+        return Response(status_code=429, headers={"Retry-After": "120"})
+
+    base = serve(app)
+    ingester = FeedIngester(sources=[FeedSource("A", feed_url(base, "a")), FeedSource("B", feed_url(base, "b"))], host_delay=0, host_concurrency=1)
+
+    async def run():
+        try:
+            await ingester.fetch(ingester.sources[0])
+            await ingester.fetch(ingester.sources[1])
+        finally:
+            await ingester.shutdown()
+
+    asyncio.run(run())
+    # The 429 on A blocks the whole host, so B is not requested
+    assert app.state.hits == 1
+    feeds = ingester.stats()["feeds"]
+    assert feeds["A"]["error"] == "HTTP 429, retry after 120s"
+    assert feeds["B"]["status"] == "throttled"
@@ -0,0 +1,42 @@
+"""
+/health: slow SQLite-backed stats must not stall the event loop
+"""
+import asyncio
+import time
+
+import main
+
+
+async def max_loop_lag(coro, interval: float = 0.01):
+    """Result of ``coro`` and the longest the loop went without running a ticker"""
+    lag = 0.0
+    done = asyncio.Event()
+
+    async def tick():
+        nonlocal lag
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = max(lag, time.perf_counter() - start - interval)
+
+    ticker = asyncio.create_task(tick())
+    try:
+        return await coro, lag
+    finally:
+        done.set()
+        await ticker
+
+
+def test_health_reads_sqlite_stats_off_the_loop(monkeypatch):
+    def slow(value):
+        def read():
+            time.sleep(0.2)
+            return value
+        return read
+
+    monkeypatch.setattr(main.job_queue, "stats", slow({"done": 3}))
+    monkeypatch.setattr(main.article_store, "count", slow(7))
+
+    body, lag = asyncio.run(max_loop_lag(main.health()))
+    assert body["jobs"] == {"done": 3} and body["articles"] == 7
+    assert lag < 0.1
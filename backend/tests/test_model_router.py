@@ -0,0 +1,118 @@
+"""
+Model routing: circuit breakers, candidate ordering and fallback in routed_call
+"""
+import asyncio
+
+import pytest
+
+from agents import base
+from agents.base import Agent, routed_call
+from agents.errors import AuthError, BadRequestError, QuotaExceededError, UpstreamUnavailableError
+from agents.model_router import CircuitBreaker, ModelRouter
+from agents.rate_limiter import RateLimiter
+
+MESSAGES = [{"role": "system", "content": "Answer."}, {"role": "user", "content": "news"}]
+
+
+@pytest.fixture
+def router(monkeypatch):
+    router = ModelRouter(breaker_threshold=2, breaker_reset=30)
+    monkeypatch.setattr(base, "model_router", router)
+    monkeypatch.setattr(base, "rate_limiter", RateLimiter(rpm=1000, tpm=1_000_000))
+    return router
+
+
+@pytest.fixture
+def agent():
+    agent = Agent(name="Test Agent", instructions="Answer.", model="gpt-main", fallback_models=["gpt-small"], latency_slo=5)
+    agent.agent_id = "test"
+    return agent
+
+
+def trip(router: ModelRouter, model: str, monkeypatch, half_open: bool = False):
+    breaker = router.breaker(model)
+    for _ in range(router.breaker_threshold):
+        breaker.failure()
+    if half_open:
+        monkeypatch.setattr(breaker, "opened_at", breaker.opened_at - router.breaker_reset)
+
+
+def test_breaker_opens_then_lets_one_probe_through(monkeypatch):
+    breaker = CircuitBreaker(threshold=2, reset_after=30)
+    breaker.failure()
+    assert breaker.state == "closed"
+    breaker.failure()
+    assert breaker.state == "open" and not breaker.allow()
+    breaker.opened_at -= 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.success()
+    assert breaker.state == "closed"
+
+
+def test_light_model_for_small_inputs(router):
+    agent = Agent(name="A", instructions="x", model="gpt-main", light_model="gpt-small", light_input_tokens=100, fallback_models=[])
+    assert router.route(agent, "run", 50).models == ("gpt-small", "gpt-main")
+    assert router.route(agent, "run", 500).models == ("gpt-main",)
+    assert router.route(agent, "stream", 500).slo == router.stream_slo
+
+
+def test_candidates_do_not_take_the_probe_slot(router, agent, monkeypatch):
+    trip(router, "gpt-main", monkeypatch, half_open=True)
+    for _ in range(3):
+        models, _ = router.candidates(agent, "run", 10)
+        assert models == ["gpt-main", "gpt-small"]
+    # The probe is still available to the call that actually goes out
+    assert router.allow("gpt-main")
+    assert not router.allow("gpt-main")
+
+
+def test_open_primary_is_skipped_and_half_open_primary_probed(router, agent, monkeypatch):
+    calls = []
+
+    async def request(model):
+        calls.append(model)
+        return f"answer from {model}"
+
+    trip(router, "gpt-main", monkeypatch)
+    assert asyncio.run(routed_call(agent, "run", MESSAGES, request))[1] == "gpt-small"
+    assert calls == ["gpt-small"]
+
+    trip(router, "gpt-main", monkeypatch, half_open=True)
+    assert asyncio.run(routed_call(agent, "run", MESSAGES, request))[1] == "gpt-main"
+    assert router.breaker("gpt-main").state == "closed"
+
+
+def test_failure_falls_through_to_the_fallback(router, agent):
+    async def request(model):
+        if model == "gpt-main":
+            raise UpstreamUnavailableError("down")
+        return "ok"
+
+    response, model, _ = asyncio.run(routed_call(agent, "run", MESSAGES, request))
+    assert (response, model) == ("ok", "gpt-small")
+    assert router.breaker("gpt-main").failures == 1
+    assert router.fallbacks == 1
+
+
+@pytest.mark.parametrize("error", [BadRequestError("context too long"), AuthError("bad key"), QuotaExceededError("no credits")])
+def test_caller_errors_do_not_count_against_the_breaker(router, agent, error):
+    async def request(model):
+        raise error
+
+    for _ in range(router.breaker_threshold + 1):
+        with pytest.raises(type(error)):
+            asyncio.run(routed_call(agent, "run", MESSAGES, request))
+    assert router.breaker("gpt-main").failures == 0
+    assert router.breaker("gpt-main").state == "closed"
+
+
+def test_long_form_agents_never_fall_back():
+    from agents.registry import agent_registry
+
+    for agent_id in ("news_research", "multi_agent_newsroom", "ultimate_ai_news"):
+        info = agent_registry.info(agent_id)
+        assert info.fallback_models == ()
+        assert info.latency_slo >= 120
+    assert agent_registry.info("live_news").fallback_models == ("gpt-4o-mini",)
@@ -0,0 +1,133 @@
+"""
+Newsroom: the DAG executor and the coordinator's session history (upstream faked)
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agents import agent_runner as runner_module
+from agents.agent_runner import AgentRunner
+from agents.dag import DAGExecutor, Node, NodeFailed, topological_order
+from agents.multi_agent_newsroom_system import MultiAgentNewsroomSystem
+from agents.result_cache import ResultCache
+from agents.schemas import NewsFeed
+
+
+def _node(name, log, deps=(), delay=0.0, result=None, error=None, **options):
+    async def run(values):
+        log.append(("start", name, dict(values)))
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        log.append(("end", name))
+        return result if result is not None else name
+
+    return Node(name, run, deps=deps, **options)
+
+
+def test_topological_order_rejects_cycles_and_unknown_deps():
+    log = []
+    assert [n.name for n in topological_order([_node("b", log, deps=("a",)), _node("a", log)])] == ["a", "b"]
+    with pytest.raises(ValueError, match="cycle"):
+        topological_order([_node("a", log, deps=("b",)), _node("b", log, deps=("a",))])
+    with pytest.raises(ValueError, match="Unknown dependency"):
+        topological_order([_node("a", log, deps=("missing",))])
+
+
+def test_independent_nodes_overlap_and_dependents_get_results():
+    log = []
+    nodes = [
+        _node("a", log, delay=0.05),
+        _node("b", log, delay=0.05),
+        _node("c", log, deps=("a", "b")),
+    ]
+    outcome = asyncio.run(DAGExecutor(nodes).run())
+    # Both roots start before either finishes
+    assert [entry[:2] for entry in log[:2]] == [("start", "a"), ("start", "b")]
+    assert ("start", "c", {"a": "a", "b": "b"}) in log
+    assert outcome.results == {"a": "a", "b": "b", "c": "c"}
+    assert outcome.wall_ms < 95
+
+    sequential = asyncio.run(DAGExecutor(nodes).run(sequential=True))
+    assert sequential.results == outcome.results and sequential.wall_ms >= 100
+
+
+def test_optional_failures_become_none_and_required_ones_cancel_the_rest():
+    log = []
+    outcome = asyncio.run(DAGExecutor([
+        _node("slow", log, delay=1.0, timeout=0.01, optional=True),
+        _node("broken", log, error=RuntimeError("boom"), optional=True),
+        _node("after", log, deps=("slow", "broken")),
+    ]).run())
+    assert outcome.results["after"] == "after"
+    assert outcome.reports["slow"].status == "timeout" and outcome.reports["broken"].error == "boom"
+
+    log = []
+    with pytest.raises(NodeFailed) as failed:
+        asyncio.run(DAGExecutor([
+            _node("fails", log, error=RuntimeError("boom")),
+            _node("long", log, delay=1.0),
+        ]).run())
+    assert failed.value.node == "fails"
+    assert ("end", "long") not in log
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Fake Runner.run/stream recording the history each agent was sent"""
+    state = SimpleNamespace(histories={})
+
+    def record(agent, history):
+        state.histories.setdefault(agent.name, []).append([m["content"] for m in history or []])
+
+    async def run(agent, query, response_model=None, history=None):
+        record(agent, history)
+        if response_model is NewsFeed:
+            feed = NewsFeed(items=[])
+            return SimpleNamespace(final_output=feed.model_dump_json(), parsed=feed, model="gpt-test")
+        return SimpleNamespace(final_output=f"report for {len(history or [])} turns", parsed=None, model="gpt-test")
+
+    async def stream(agent, query, history=None):
+        record(agent, history)
+        yield {"type": "delta", "content": f"report for {len(history or [])} turns"}
+        yield {"type": "usage", "usage": None, "model": "gpt-test"}
+
+    monkeypatch.setattr(runner_module.Runner, "run", staticmethod(run))
+    monkeypatch.setattr(runner_module.Runner, "stream", staticmethod(stream))
+    return state
+
+
+def test_run_and_stream_send_the_coordinator_the_same_history(upstream):
+    runner = AgentRunner(cache=ResultCache())
+    newsroom = MultiAgentNewsroomSystem()
+
+    async def run():
+        await newsroom.run(runner, "first question", session_id="room")
+        await newsroom.run(runner, "second question", session_id="room", use_cache=False)
+        return [event async for event in newsroom.stream(runner, "third question", session_id="room")]
+
+    events = asyncio.run(run())
+    assert events[-1]["type"] == "done" and "nodes" in events[-1]
+    coordinator = upstream.histories[newsroom.agent.name]
+    # Each turn records the user's query and the report, and the next turn sees them
+    assert coordinator == [
+        [],
+        ["first question", "report for 0 turns"],
+        ["first question", "report for 0 turns", "second question", "report for 2 turns"],
+    ]
+    assert runner.sessions.history("room")[-2]["content"] == "third question"
+
+
+def test_anonymous_newsroom_runs_are_not_remembered(upstream):
+    runner = AgentRunner(cache=ResultCache())
+    newsroom = MultiAgentNewsroomSystem()
+
+    async def run():
+        result = await newsroom.run(runner, "question")
+        events = [event async for event in newsroom.stream(runner, "question")]
+        return result, events
+
+    result, events = asyncio.run(run())
+    assert result.session_id and events[-1]["session_id"]
+    assert runner.sessions.stats()["sessions"] == 0
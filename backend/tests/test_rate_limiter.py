@@ -0,0 +1,107 @@
+"""
+Rate limiter: token buckets, queueing within max_wait, and shared pauses on 429
+"""
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+from agents.errors import AuthError, RateLimitedError
+from agents.rate_limiter import RateLimiter, TokenBucket, parse_limits
+
+
+def rate_limit_error(retry_after_ms: int) -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers={"retry-after-ms": str(retry_after_ms)}, request=request)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def test_bucket_refills_continuously_and_queues_debt():
+    bucket = TokenBucket(per_minute=60, capacity=2)  # one token per second
+    bucket.updated = now = 100.0
+    assert bucket.reserve(1, now) == 0.0
+    assert bucket.reserve(1, now) == 0.0
+    # Empty: the next reservation goes into debt and waits for its refill
+    assert bucket.reserve(1, now) == pytest.approx(1.0)
+    assert bucket.reserve(1, now) == pytest.approx(2.0)
+    assert bucket.wait_time(1, now + 3) == pytest.approx(0.0)
+    # Refills never exceed the capacity
+    assert bucket.wait_time(1, now + 1000) == 0.0 and bucket.tokens == 2
+
+
+def test_oversized_request_is_capped_at_the_capacity():
+    bucket = TokenBucket(per_minute=600, capacity=100)
+    bucket.updated = 0.0
+    assert bucket.reserve(10_000, 0.0) == 0.0
+    assert bucket.tokens == 0
+
+
+def test_parse_limits():
+    assert parse_limits("gpt-4o=500:30000, gpt-4o-mini=100:200000,") == {
+        "gpt-4o": (500.0, 30000.0),
+        "gpt-4o-mini": (100.0, 200000.0),
+    }
+
+
+def test_calls_queue_then_fail_fast_beyond_max_wait():
+    limiter = RateLimiter(rpm=60, tpm=1_000_000, overrides={}, max_wait=0.5)
+    requests, _ = limiter.buckets("gpt-test")
+    requests.tokens = 0.2  # the next request is 0.8s away
+
+    async def call():
+        return await limiter.call("gpt-test", 10, lambda: asyncio.sleep(0, "ok"))
+
+    with pytest.raises(RateLimitedError) as rejected:
+        asyncio.run(call())
+    assert 0.5 < rejected.value.retry_after <= 0.8
+    assert limiter.rejected == 1
+
+    requests.tokens = 0.8  # 0.2s away: within max_wait
+    start = time.perf_counter()
+    assert asyncio.run(call()) == "ok"
+    assert time.perf_counter() - start >= 0.15
+    assert limiter.throttled == 1
+
+
+def test_429_pauses_the_model_for_every_caller_and_is_retried():
+    limiter = RateLimiter(rpm=10_000, tpm=1_000_000, overrides={}, max_wait=5, max_retries=2)
+    attempts = []
+
+    async def flaky():
+        attempts.append(time.perf_counter())
+        if len(attempts) == 1:
+            raise rate_limit_error(200)
+        return "ok"
+
+    start = time.perf_counter()
+    result = asyncio.run(limiter.call("gpt-test", 10, flaky))
+    assert result == "ok" and limiter.retries == 1
+    assert attempts[1] - start >= 0.2
+    # The pause applies to the model's buckets, so other callers wait too
+    limiter._failed("gpt-test", 10, rate_limit_error(1000), 0, 2, 5)
+    assert limiter.wait_time("gpt-test", 10) > 0.9
+
+
+def test_non_retryable_errors_are_raised_at_once():
+    limiter = RateLimiter(rpm=10_000, tpm=1_000_000, overrides={}, max_retries=3)
+    calls = []
+
+    async def unauthorized():
+        calls.append(1)
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        raise openai.AuthenticationError("bad key", response=httpx.Response(401, request=request), body=None)
+
+    with pytest.raises(AuthError):
+        asyncio.run(limiter.call("gpt-test", 10, unauthorized))
+    assert len(calls) == 1 and limiter.retries == 0
+
+
+def test_settle_charges_the_real_token_count():
+    limiter = RateLimiter(rpm=100, tpm=10_000, overrides={})
+    _, tokens = limiter.buckets("gpt-test")
+    asyncio.run(limiter.call("gpt-test", 1000, lambda: asyncio.sleep(0)))
+    before = tokens.tokens
+    limiter.settle("gpt-test", 1000, {"total_tokens": 400})
+    assert tokens.tokens == pytest.approx(min(before + 600, tokens.capacity), abs=5)
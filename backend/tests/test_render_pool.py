@@ -0,0 +1,67 @@
+"""
+Render pool: PDF and trend-graph rendering must not stall the event loop
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from utils import render_pool
+
+# Rendering inline stalls the loop for the whole render, typically over a second
+MAX_LOOP_LAG = 0.25
+TICK = 0.01
+CONTENT = "\n\n".join(f"## Story {i}\n\n" + "AI news paragraph. " * 80 for i in range(40))
+
+
+async def render_lags(rounds: int) -> list:
+    """Overshoot of a 10ms ticker while ``rounds`` distinct PDF + graph pairs render"""
+    stop, lags = asyncio.Event(), []
+
+    async def watch():
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(TICK)
+            lags.append(time.perf_counter() - start - TICK)
+
+    watcher = asyncio.create_task(watch())
+    for variant in range(rounds):
+        # Unique inputs, so content-addressed artifacts are never reused
+        trend = {"dates": [f"2024-01-{d:02d}" for d in range(1, 29)], "values": [v + variant for v in range(28)]}
+        await render_pool.render_artifacts(f"{CONTENT}\n\nEdition {variant}", ["pdf_report", "trend_graph"], trend_data=trend)
+    await asyncio.sleep(TICK * 2)
+    stop.set()
+    await watcher
+    return lags
+
+
+@pytest.fixture
+def pool(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    yield
+    render_pool.shutdown_render_pool()
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_loop_stays_responsive_while_artifacts_render(pool, monkeypatch, tmp_path, executor):
+    monkeypatch.setenv("ARTIFACT_EXECUTOR", executor)
+
+    async def run():
+        # Start the workers outside the measurement, as the server does on its first render
+        await asyncio.get_running_loop().run_in_executor(render_pool.get_render_executor(), abs, 0)
+        return await render_lags(rounds=2)
+
+    lags = asyncio.run(run())
+    rendered = [name for directory in ("reports", "graphs") for name in os.listdir(tmp_path / directory)]
+    assert len(rendered) == 4
+    assert max(lags) < MAX_LOOP_LAG
+
+
+def test_rendered_artifacts_come_with_download_urls(pool, monkeypatch, tmp_path):
+    monkeypatch.setenv("ARTIFACT_EXECUTOR", "thread")
+    trend = {"dates": ["2026-01-05", "2026-01-06"], "values": [1, 3], "title": "Mentions of openai"}
+    response = asyncio.run(render_pool.render_artifacts("AI news", ["trend_graph"], trend_data=trend))
+    filename = os.path.basename(response["graph_path"])
+    assert response["graph_url"] == f"/api/download-graph/{filename}"
+    assert os.path.exists(tmp_path / "graphs" / filename)
@@ -0,0 +1,74 @@
+"""
+Snapshot scheduler: post-processing once per snapshot, and background revalidation failures
+"""
+import asyncio
+from types import SimpleNamespace
+
+from agents.schemas import NewsFeed
+from agents.snapshot_scheduler import SnapshotScheduler
+from utils import storage
+from utils.dedup import NearDuplicateIndex, dedupe_items
+
+ITEM = {"headline": "OpenAI ships a new model", "source": "Example", "summary": "The model is faster.", "url": "https://example.com/a"}
+
+
+class FakeRunner:
+    def __init__(self):
+        self.calls = 0
+
+    async def run_async(self, agent, query, use_cache=True, response_model=None, remember=True):
+        self.calls += 1
+        feed = NewsFeed.model_validate({"items": [ITEM, {**ITEM, "url": "https://www.example.com/a?utm_source=x"}]})
+        return SimpleNamespace(final_output=feed.model_dump_json(), parsed=feed, model="gpt-test")
+
+
+def test_postprocess_runs_once_per_snapshot(tmp_path):
+    index = NearDuplicateIndex(capacity=100)
+    processed = []
+
+    def dedupe(data):
+        processed.append(data)
+        return {**data, "items": dedupe_items(data["items"], index)}
+
+    scheduler = SnapshotScheduler(FakeRunner(), directory=str(tmp_path), interval=60, jitter=0, stale_after=60)
+    scheduler.register("live", object(), "news", response_model=NewsFeed, postprocess=dedupe)
+
+    async def run():
+        return [await scheduler.get("live") for _ in range(5)]
+
+    snapshots = asyncio.run(run())
+    assert len(processed) == 1 and scheduler.runner.calls == 1
+    assert all(len(snapshot["data"]["items"]) == 1 for snapshot in snapshots)
+    assert snapshots[0]["data"]["items"][0]["story_id"]
+    assert [snapshot["cached"] for snapshot in snapshots] == [False] + [True] * 4
+
+
+def test_failed_background_revalidation_is_logged(tmp_path, capsys):
+    class FailingRunner(FakeRunner):
+        async def run_async(self, **kwargs):
+            self.calls += 1
+            if self.calls > 1:
+                raise RuntimeError("upstream down")
+            return await super().run_async(**kwargs)
+
+    scheduler = SnapshotScheduler(FailingRunner(), directory=str(tmp_path), interval=60, jitter=0, stale_after=0)
+    scheduler.register("live", object(), "news", response_model=NewsFeed)
+
+    async def run():
+        await scheduler.get("live")
+        # Stale right away: served, with a revalidation in the background
+        snapshot = await scheduler.get("live")
+        await asyncio.gather(*scheduler._revalidating.values(), return_exceptions=True)
+        return snapshot
+
+    snapshot = asyncio.run(run())
+    assert snapshot["stale"] and snapshot["data"]["items"]
+    assert "Snapshot revalidation failed for live: upstream down" in capsys.readouterr().out
+
+
+def test_default_directory_is_in_the_data_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(storage, "_data_dir", str(tmp_path))
+    monkeypatch.delenv("SNAPSHOT_DIR", raising=False)
+    scheduler = SnapshotScheduler(FakeRunner())
+    assert scheduler.directory == str(tmp_path / "snapshots")
+    assert scheduler.lock.path == str(tmp_path / "snapshots" / ".leader.lock")
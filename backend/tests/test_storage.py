@@ -0,0 +1,32 @@
+"""
+Runtime data directory selection
+"""
+import os
+import tempfile
+
+import pytest
+
+from utils import storage
+
+
+@pytest.fixture(autouse=True)
+def fresh(monkeypatch):
+    monkeypatch.setattr(storage, "_data_dir", None)
+    monkeypatch.delenv("DATA_DIR", raising=False)
+    monkeypatch.delenv("VERCEL", raising=False)
+
+
+def test_data_dir_env_wins(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("VERCEL", "1")
+    assert storage.data_path("jobs.sqlite3") == str(tmp_path / "jobs.sqlite3")
+
+
+def test_writable_working_directory_is_used(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    assert storage.data_path("jobs.sqlite3") == "jobs.sqlite3"
+
+
+def test_vercel_falls_back_to_temp(monkeypatch):
+    monkeypatch.setenv("VERCEL", "1")
+    assert storage.data_dir() == os.path.join(tempfile.gettempdir(), "ai-news-data")
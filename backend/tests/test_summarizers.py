@@ -0,0 +1,136 @@
+"""
+Chunked and batched summarization against a scripted runner (no model calls)
+"""
+import asyncio
+import random
+from types import SimpleNamespace
+
+from agents.chunked_summarizer import ChunkedSummarizer, pack, split_units
+from agents.registry import agent_registry
+from agents.schemas import SummaryBatch
+from agents.summary_batcher import SummaryBatcher
+from utils.dedup import ContentCache
+
+WORDS = "model training inference chips datacenter regulation safety benchmark startup funding".split()
+AGENT = agent_registry.get("news_summarizer")
+
+
+def document(paragraphs: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [
+        " ".join(" ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "." for _ in range(5))
+        for _ in range(paragraphs)
+    ]
+
+
+class FakeRunner:
+    """Answers every prompt with a short note and records the prompts"""
+
+    def __init__(self):
+        self.queries = []
+
+    async def run_async(self, agent, query, session_id=None, response_model=None, use_cache=True, remember=True):
+        self.queries.append(query)
+        parsed = None
+        if response_model is SummaryBatch:
+            indexes = [int(line[1:-1]) for line in query.splitlines() if line.startswith("[") and line.endswith("]")]
+            parsed = SummaryBatch(summaries=[{"index": index, "summary": f"summary {index}"} for index in indexes])
+        return SimpleNamespace(final_output=f"- note {len(self.queries)}", parsed=parsed, cached=False, model="gpt-test", session_id=session_id)
+
+
+def test_split_units_respects_the_budget():
+    text = "Short paragraph.\n\n" + " ".join(["A long sentence with many words in it."] * 200)
+    units = split_units(text, max_tokens=50)
+    assert units[0] == "Short paragraph."
+    assert all(len(unit) <= 50 * 4 for unit in units)
+
+
+def test_pack_boundaries_are_local_to_an_edit():
+    paragraphs = document(200)
+    before = pack(paragraphs, 300)
+    edited = list(paragraphs)
+    edited[100] += " A late correction."
+    after = pack(edited, 300)
+    changed = len(set(after) - set(before))
+    assert len(before) > 10
+    assert 1 <= changed <= 2
+
+
+def test_edited_long_document_only_resummarizes_changed_chunks():
+    runner = FakeRunner()
+    summarizer = ChunkedSummarizer(runner, threshold_tokens=500, chunk_tokens=300)
+    paragraphs = document(120)
+
+    async def run(text):
+        return (await summarizer.summarize(AGENT, text, "short", remember=False))[1]
+
+    cold = asyncio.run(run("\n\n".join(paragraphs)))
+    paragraphs[60] += " A late correction."
+    edited = asyncio.run(run("\n\n".join(paragraphs)))
+    assert cold["cached"] == 0 and cold["chunks"] > 10
+    assert edited["cached"] >= cold["chunks"] - 2
+    assert edited["calls"] < cold["calls"] // 2
+
+
+def test_batcher_packs_short_items_and_keeps_order():
+    runner = FakeRunner()
+    batcher = SummaryBatcher(runner, max_batch_items=3, long_item_tokens=1000)
+    items = [(f"Item {i} about chips.", "short") for i in range(6)] + [("Item 6 about chips.", "long")]
+    body = asyncio.run(batcher.summarize(AGENT, items))
+    # Two packed calls of three, and the lone "long" item on its own
+    assert body["calls"] == 3
+    assert [result["result"] for result in body["results"][:6]] == [f"summary {i}" for i in range(6)]
+    assert body["results"][6]["result"].startswith("- note")
+
+
+def test_batcher_reuses_short_items_only():
+    runner = FakeRunner()
+    reuse = ContentCache(capacity=100)
+    chunker = ChunkedSummarizer(runner, threshold_tokens=500, chunk_tokens=300)
+    batcher = SummaryBatcher(runner, reuse=reuse, chunker=chunker, long_item_tokens=200)
+    long_text = "\n\n".join(document(40))
+    items = [("A short item about chips.", "short"), (long_text, "short")]
+
+    asyncio.run(batcher.summarize(AGENT, items))
+    second = asyncio.run(batcher.summarize(AGENT, items))["results"]
+    assert second[0]["duplicate_of"]
+    # The long item goes back through the chunker, whose chunk cache answers it
+    assert "duplicate_of" not in second[1]
+    assert second[1]["chunked"]["cached"] == second[1]["chunked"]["chunks"]
+
+
+def test_batcher_limits_every_call_and_counts_model_calls():
+    class SlowRunner(FakeRunner):
+        def __init__(self):
+            super().__init__()
+            self.in_flight = self.peak = 0
+
+        async def run_async(self, agent, query, **kwargs):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return await super().run_async(agent, query, **kwargs)
+
+    runner = SlowRunner()
+    chunker = ChunkedSummarizer(runner, threshold_tokens=500, chunk_tokens=300, concurrency=4)
+    batcher = SummaryBatcher(runner, chunker=chunker, long_item_tokens=200, concurrency=2)
+    items = [("\n\n".join(document(40, seed=seed)), "short") for seed in range(3)]
+    body = asyncio.run(batcher.summarize(AGENT, items))
+    assert runner.peak == 2
+    # Chunk, merge and final calls of each long item, not one per item
+    assert body["calls"] == len(runner.queries) > len(items)
+    assert body["calls"] == sum(result["chunked"]["calls"] for result in body["results"])
+
+
+def test_chunk_cache_is_case_sensitive():
+    runner = FakeRunner()
+    summarizer = ChunkedSummarizer(runner, threshold_tokens=500, chunk_tokens=300)
+    text = "\n\n".join(document(40))
+
+    async def run(content):
+        return (await summarizer.condense(AGENT, content))[1]
+
+    cold = asyncio.run(run(text))
+    assert asyncio.run(run(text))["cached"] == cold["chunks"]
+    assert asyncio.run(run(text.lower()))["cached"] == 0
@@ -0,0 +1,102 @@
+"""
+Trend engine: ring-buffer buckets, growth windows and the bounded term table
+"""
+import numpy as np
+
+from utils.trends import TrendEngine, extract_terms
+
+HOUR = 3600
+
+
+def engine(**kwargs) -> TrendEngine:
+    return TrendEngine(bucket_seconds=HOUR, directory="", **kwargs)
+
+
+def fill(trends: TrendEngine, term: str, per_bucket: list, now: float):
+    """``per_bucket`` counts, oldest first, ending in the bucket holding ``now``"""
+    for age, count in enumerate(reversed(per_bucket)):
+        if count:
+            trends.add({term: count}, timestamp=now - age * HOUR)
+
+
+def test_extract_terms_finds_categories_and_entities():
+    counts = extract_terms("OpenAI and Google DeepMind ship a new LLM", categories=["Tech"])
+    assert counts["category:ai"] == 1
+    assert counts["category:tech"] == 1
+    assert counts["entity:openai"] == 1
+    assert counts["entity:google deepmind"] == 1
+
+
+def test_ring_buffer_forgets_buckets_older_than_capacity(monkeypatch):
+    now = 1_000 * HOUR
+    monkeypatch.setattr("utils.trends.time.time", lambda: now)
+    trends = engine(capacity=4)
+    fill(trends, "entity:x", [5, 0, 0, 0, 0, 1], now)
+    assert trends.matrix(["entity:x"], 4)[0].tolist() == [0, 0, 0, 1]
+
+
+def test_rolling_mean():
+    series = np.array([[2.0, 4.0, 6.0, 8.0]])
+    assert TrendEngine.rolling_mean(series, 2).tolist() == [[2.0, 3.0, 5.0, 7.0]]
+
+
+def test_growth_window_larger_than_half_the_capacity(monkeypatch):
+    now = 1_000 * HOUR
+    monkeypatch.setattr("utils.trends.time.time", lambda: now)
+    trends = engine(capacity=10)
+    fill(trends, "entity:x", [1] * 10, now)
+    # All of the last 8 buckets count, and the 2 before them are scaled to 8
+    assert trends.top(window=8) == [{"term": "entity:x", "count": 8, "growth": 0.0}]
+    # No earlier buckets are kept at all: counts are reported with zero growth
+    assert trends.top(window=10) == [{"term": "entity:x", "count": 10, "growth": 0.0}]
+
+
+def test_growth_compares_consecutive_windows(monkeypatch):
+    now = 1_000 * HOUR
+    monkeypatch.setattr("utils.trends.time.time", lambda: now)
+    trends = engine(capacity=24)
+    fill(trends, "entity:rising", [1, 1, 1, 3, 3, 3], now)
+    fill(trends, "entity:steady", [2, 2, 2, 2, 2, 2], now)
+    assert trends.growth(window=3) == {"entity:rising": 2.0, "entity:steady": 0.0}
+    assert [row["term"] for row in trends.top(window=3, by="growth")] == ["entity:rising", "entity:steady"]
+    assert trends.top(window=3, by="count")[0] == {"term": "entity:rising", "count": 9, "growth": 2.0}
+
+
+def test_full_term_table_evicts_the_least_mentioned(monkeypatch):
+    now = 1_000 * HOUR
+    monkeypatch.setattr("utils.trends.time.time", lambda: now)
+    trends = engine(capacity=4, max_terms=10)
+    trends.add({f"entity:busy{i}": 5 for i in range(5)}, timestamp=now)
+    trends.add({f"entity:rare{i}": 1 for i in range(5)}, timestamp=now)
+    trends.add({"entity:new": 2}, timestamp=now)
+    terms = trends.terms()
+    assert "entity:new" in terms and "entity:rare0" not in terms
+    assert all(f"entity:busy{i}" in terms for i in range(5))
+    assert trends.stats()["evicted"] == 1
+    # The freed row was zeroed before reuse
+    assert trends.matrix(["entity:new"], 1)[0].tolist() == [2]
+
+
+def test_term_rows_survive_a_restart(tmp_path, monkeypatch):
+    now = 1_000 * HOUR
+    monkeypatch.setattr("utils.trends.time.time", lambda: now)
+    trends = TrendEngine(bucket_seconds=HOUR, capacity=4, directory=str(tmp_path), max_terms=4)
+    trends.add({"entity:a": 3, "entity:b": 1, "entity:c": 2, "entity:d": 4}, timestamp=now)
+    trends.add({"entity:e": 1}, timestamp=now)
+    trends.flush()
+    reloaded = TrendEngine(bucket_seconds=HOUR, capacity=4, directory=str(tmp_path), max_terms=4)
+    assert sorted(reloaded.terms()) == ["entity:a", "entity:c", "entity:d", "entity:e"]
+    assert reloaded.matrix(["entity:a", "entity:e"], 1).tolist() == [[3], [1]]
+
+
+def test_top_graph_data_prefers_entities_and_flags_an_empty_engine(monkeypatch):
+    now = 1_000 * HOUR
+    monkeypatch.setattr("utils.trends.time.time", lambda: now)
+    trends = engine(capacity=4)
+    empty = trends.top_graph_data(window=4)
+    assert empty["empty"] and empty["values"] == []
+    fill(trends, "category:ai", [5, 5], now)
+    fill(trends, "entity:openai", [1, 2], now)
+    data = trends.top_graph_data(window=4)
+    assert data["title"] == "Mentions of openai" and data["values"] == [0, 0, 1, 2]
+    assert "empty" not in data
@@ -7,12 +7,34 @@ from .helpers import (
     generate_trend_graph,
     get_base64_image
 )
+from .trend_renderer import TrendRenderer, trend_renderer
+from .trends import TrendEngine, trend_engine
+from .article_store import ArticleStore, article_store
+from .dedup import NearDuplicateIndex, story_index
+from .feeds import FeedIngester, feed_ingester
+from .article_extractor import ArticleExtractor, article_extractor
+from .render_pool import render_artifacts, run_in_render_pool, shutdown_render_pool
 
 __all__ = [
     "generate_pdf_report",
     "generate_voice_summary",
     "generate_trend_graph",
     "get_base64_image",
+    "TrendRenderer",
+    "trend_renderer",
+    "TrendEngine",
+    "trend_engine",
+    "ArticleStore",
+    "article_store",
+    "NearDuplicateIndex",
+    "story_index",
+    "FeedIngester",
+    "feed_ingester",
+    "ArticleExtractor",
+    "article_extractor",
+    "render_artifacts",
+    "run_in_render_pool",
+    "shutdown_render_pool",
 ]
 
 
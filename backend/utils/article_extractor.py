@@ -0,0 +1,480 @@
+"""
+Article extractor - Downloads article pages and reduces them to their main text
+Pages are parsed in a process pool (HTML parsing is CPU bound) by a
+readability-style pass: scripts, navigation, sidebars, comments and link
+lists are dropped, paragraphs are scored, and the container holding the best
+paragraphs is kept. Bodies are cut at a paragraph boundary to a bounded size.
+Results are cached on disk per URL together with the page's ETag, so a
+revalidated (304) or unchanged page is never downloaded or parsed again.
+URLs come from API clients, so only http(s) pages on public addresses are
+fetched: every redirect hop is resolved and checked before it is requested,
+and the address actually connected to is checked again before reading.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+import asyncio
+import hashlib
+import ipaddress
+import json
+import os
+import re
+import socket
+import tempfile
+import time
+
+from .metrics import article_extractions
+from .storage import data_path
+
+if TYPE_CHECKING:
+    import httpx
+
+# Subtrees that never hold article text
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "iframe", "form", "nav", "header",
+    "footer", "aside", "button", "select", "textarea", "canvas", "object", "embed",
+}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"}
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "h1", "h2", "h3", "h4", "h5", "h6", "li", "ul", "ol",
+    "blockquote", "pre", "table", "tr", "td", "th", "dd", "dt", "dl", "figure", "figcaption", "body",
+}
+CONTAINER_TAGS = {"div", "section", "article", "main", "td", "body"}
+HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# class/id values of page chrome
+BOILERPLATE = re.compile(
+    r"comment|sidebar|footer|masthead|navbar|\bnav\b|menu|share|social|related|promo|advert|\bads?\b|"
+    r"sponsor|cookie|newsletter|subscribe|breadcrumb|popup|modal|banner|widget|toolbar|byline-tools",
+    re.IGNORECASE
+)
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+# Content types that are parsed; anything else (text/plain, JSON, ...) is refused
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+MAX_REDIRECTS = 5
+
+# Paragraphs shorter than this only count as headings
+MIN_BLOCK_CHARS = 25
+# Blocks whose text is mostly links are navigation
+MAX_LINK_DENSITY = 0.5
+
+
+class _Block:
+    __slots__ = ("text", "link_chars", "heading", "ancestors")
+
+    def __init__(self, text: str, link_chars: int, heading: bool, ancestors: Tuple[int, ...]):
+        self.text = text
+        self.link_chars = link_chars
+        self.heading = heading
+        self.ancestors = ancestors
+
+    @property
+    def is_content(self) -> bool:
+        if self.link_chars > len(self.text) * MAX_LINK_DENSITY:
+            return False
+        return self.heading or len(self.text) >= MIN_BLOCK_CHARS
+
+
+class _BlockParser(HTMLParser):
+    """Splits a page into text blocks, remembering which containers each sits in"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[_Block] = []
+        self.title = ""
+        self.og_title = ""
+        self._stack: List[Tuple[str, int, bool]] = []  # (tag, element id, skipped)
+        self._next_id = 0
+        self._parts: List[str] = []
+        self._link_chars = 0
+        self._links = 0
+        self._in_title = False
+
+    @property
+    def _skipped(self) -> bool:
+        return bool(self._stack) and self._stack[-1][2]
+
+    def _flush(self):
+        text = " ".join("".join(self._parts).split())
+        if text:
+            heading = any(tag in HEADINGS for tag, _, _ in self._stack[-1:])
+            ancestors = tuple(element for tag, element, _ in self._stack if tag in CONTAINER_TAGS)
+            self.blocks.append(_Block(text, self._link_chars, heading, ancestors))
+        self._parts = []
+        self._link_chars = 0
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if tag == "meta":
+            values = dict(attrs)
+            if values.get("property") == "og:title" and values.get("content"):
+                self.og_title = values["content"].strip()
+            return
+        if tag == "br":
+            self._parts.append(" ")
+            return
+        if tag in VOID_TAGS:
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        markers = " ".join(value for name, value in attrs if name in ("class", "id") and value)
+        skipped = (
+            self._skipped
+            or tag in SKIP_TAGS
+            or (tag not in ("body", "main", "article") and markers and BOILERPLATE.search(markers) is not None)
+        )
+        self._stack.append((tag, self._next_id, bool(skipped)))
+        self._next_id += 1
+        if tag == "a" and not skipped:
+            self._links += 1
+
+    def handle_endtag(self, tag: str):
+        if tag == "title":
+            self._in_title = False
+            return
+        # Tolerate unclosed tags: close everything down to the matching start tag
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
+                if tag in BLOCK_TAGS or any(t in BLOCK_TAGS for t, _, _ in self._stack[depth:]):
+                    self._flush()
+                if tag == "a" and not self._stack[depth][2]:
+                    self._links -= 1
+                del self._stack[depth:]
+                return
+
+    def handle_data(self, data: str):
+        if self._in_title:
+            self.title += data
+            return
+        if self._skipped:
+            return
+        self._parts.append(data)
+        if self._links > 0:
+            self._link_chars += len(data.strip())
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _main_blocks(blocks: List[_Block]) -> List[_Block]:
+    """Content blocks of the best-scoring container (paragraphs score their parent fully, grandparent half)"""
+    scores: Dict[int, float] = {}
+    for block in blocks:
+        if block.heading or not block.is_content:
+            continue
+        score = 1 + block.text.count(",") + min(len(block.text) // 100, 3)
+        if block.ancestors:
+            scores[block.ancestors[-1]] = scores.get(block.ancestors[-1], 0) + score
+        if len(block.ancestors) > 1:
+            scores[block.ancestors[-2]] = scores.get(block.ancestors[-2], 0) + score / 2
+    if not scores:
+        return [block for block in blocks if block.is_content]
+    best = max(scores, key=scores.get)
+    return [block for block in blocks if best in block.ancestors and block.is_content]
+
+
+def _decode(data: bytes, encoding: Optional[str]) -> str:
+    if not encoding:
+        match = _META_CHARSET.search(data[:4096])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return data.decode(encoding, errors="replace")
+    except LookupError:
+        return data.decode("utf-8", errors="replace")
+
+
+def extract_html(data: bytes, encoding: Optional[str] = None, max_chars: int = 12000) -> Dict[str, Any]:
+    """Title and main text of an HTML page, cut at a paragraph boundary to ``max_chars``.
+
+    Pure and picklable, so it runs in the extraction process pool.
+    """
+    parser = _BlockParser()
+    parser.feed(_decode(data, encoding))
+    parser.close()
+    paragraphs: List[str] = []
+    used = 0
+    truncated = False
+    for block in _main_blocks(parser.blocks):
+        if used + len(block.text) > max_chars:
+            truncated = True
+            if not paragraphs:
+                paragraphs.append(block.text[:max_chars].rsplit(" ", 1)[0] + "…")
+            break
+        paragraphs.append(block.text)
+        used += len(block.text) + 2
+    text = "\n\n".join(paragraphs)
+    title = parser.og_title or " ".join(parser.title.split())
+    return {"title": title, "text": text, "chars": len(text), "truncated": truncated}
+
+
+_executor: Optional[Executor] = None
+
+
+def get_extract_executor() -> Executor:
+    """Shared executor for HTML extraction: a process pool (ARTICLE_EXECUTOR=thread where processes cannot be spawned)"""
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("ARTICLE_WORKERS", str(os.cpu_count() or 1)))
+        if os.getenv("ARTICLE_EXECUTOR", "process") == "thread":
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract")
+        else:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+    return _executor
+
+
+def shutdown_extract_pool():
+    """Stop the extraction executor (called on app shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class ExtractionError(Exception):
+    """A page could not be downloaded or holds no readable text"""
+
+
+def is_public_address(address: str) -> bool:
+    """True for globally routable unicast IPs (not loopback, private, link-local/metadata, reserved...)"""
+    try:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+    except ValueError:
+        return False
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+class ArticleExtractor:
+    """Downloads and extracts article bodies, cached on disk by URL and ETag.
+
+    Cached bodies younger than ``fresh_for`` seconds are served without a
+    request; older ones are revalidated with If-None-Match/If-Modified-Since.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_chars: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        fresh_for: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        allow_private: Optional[bool] = None
+    ):
+        self.directory = directory or os.getenv("ARTICLE_CACHE_DIR") or data_path("article_cache")
+        self.max_chars = max_chars or int(os.getenv("ARTICLE_MAX_CHARS", "12000"))
+        self.max_bytes = max_bytes or int(os.getenv("ARTICLE_MAX_BYTES", str(2 * 1024 * 1024)))
+        self.fresh_for = fresh_for if fresh_for is not None else float(os.getenv("ARTICLE_CACHE_FRESH", "3600"))
+        self.timeout = timeout or float(os.getenv("ARTICLE_TIMEOUT", "15"))
+        # Only for local testing against fixture servers
+        self.allow_private = allow_private if allow_private is not None else os.getenv("ARTICLE_ALLOW_PRIVATE_HOSTS") == "1"
+        self._semaphore = asyncio.Semaphore(concurrency or int(os.getenv("ARTICLE_FETCH_CONCURRENCY", "8")))
+        self._client: Optional["httpx.AsyncClient"] = None
+        self.outcomes = {"extracted": 0, "cached": 0, "not_modified": 0, "error": 0}
+
+    def _count(self, outcome: str):
+        self.outcomes[outcome] += 1
+        article_extractions.labels(outcome).inc()
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=int(os.getenv("ARTICLE_MAX_CONNECTIONS", "20"))),
+                timeout=self.timeout,
+                # Redirects are followed by _download so every hop is checked
+                follow_redirects=False,
+                headers={"User-Agent": os.getenv("FEED_USER_AGENT", "AI-News-Feed-Ingester/1.0"), "Accept": "text/html, application/xhtml+xml;q=0.9"}
+            )
+        return self._client
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + ".json")
+
+    def _read(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Entries extracted under a different size bound are re-extracted
+        return entry if entry.get("url") == url and entry.get("max_chars") == self.max_chars else None
+
+    def _write(self, url: str, entry: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(url))
+
+    @staticmethod
+    def _public(entry: dict, outcome: str) -> dict:
+        return {
+            "url": entry["url"],
+            "title": entry["title"],
+            "text": entry["text"],
+            "chars": entry["chars"],
+            "truncated": entry["truncated"],
+            "cached": outcome != "extracted",
+        }
+
+    @staticmethod
+    def check_scheme(url: str):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ExtractionError(f"Unsupported URL: {url}")
+
+    async def check_url(self, url: str):
+        """Raise ExtractionError unless ``url`` is http(s) and its host resolves only to public addresses"""
+        self.check_scheme(url)
+        if self.allow_private:
+            return
+        parts = urlsplit(url)
+        try:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            infos = await asyncio.get_running_loop().getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+        except (ValueError, OSError) as e:
+            raise ExtractionError(f"Cannot resolve {parts.hostname}: {e}") from e
+        if not infos or not all(is_public_address(info[4][0]) for info in infos):
+            raise ExtractionError(f"Refusing to fetch {url}: {parts.hostname} is not a public address")
+
+    def _check_peer(self, url: str, response: "httpx.Response"):
+        # The address actually connected to, in case DNS changed since check_url
+        if self.allow_private:
+            return
+        stream = response.extensions.get("network_stream")
+        peer = stream.get_extra_info("server_addr") if stream is not None else None
+        if peer and not is_public_address(peer[0]):
+            raise ExtractionError(f"Refusing to fetch {url}: connected to a non-public address")
+
+    async def _download(self, url: str, cached: Optional[dict]) -> Tuple[Optional[bytes], Optional[str], "httpx.Response"]:
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        async with self._semaphore:
+            for _ in range(MAX_REDIRECTS + 1):
+                await self.check_url(url)
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    self._check_peer(url, response)
+                    if response.has_redirect_location:
+                        # Validators stay: the cached ETag was served by the final hop
+                        url = urljoin(url, response.headers["location"])
+                        continue
+                    if response.status_code == 304:
+                        return None, None, response
+                    if response.status_code >= 400:
+                        raise ExtractionError(f"HTTP {response.status_code} from {url}")
+                    content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+                    if content_type not in HTML_TYPES:
+                        raise ExtractionError(f"Not an HTML page ({content_type or 'no content type'})")
+                    chunks, received = [], 0
+                    async for chunk in response.aiter_bytes():
+                        chunks.append(chunk)
+                        received += len(chunk)
+                        if received >= self.max_bytes:
+                            break
+                    return b"".join(chunks)[:self.max_bytes], response.charset_encoding, response
+        raise ExtractionError(f"Too many redirects from {url}")
+
+    async def extract(self, url: str) -> dict:
+        """Main text of the page at ``url``: url, title, text, chars, truncated and cached"""
+        self.check_scheme(url)
+        cached = await asyncio.to_thread(self._read, url)
+        if cached is not None and time.time() - cached["fetched_at"] < self.fresh_for:
+            self._count("cached")
+            return self._public(cached, "cached")
+        try:
+            data, encoding, response = await self._download(url, cached)
+        except ExtractionError:
+            self._count("error")
+            raise
+        except Exception as e:
+            self._count("error")
+            raise ExtractionError(f"Could not download {url}: {type(e).__name__}: {e}") from e
+
+        etag = response.headers.get("etag")
+        if cached is not None and (data is None or (etag and cached.get("etag") == etag)):
+            # Not modified: keep the cached body and restart its freshness window
+            cached["fetched_at"] = time.time()
+            await asyncio.to_thread(self._write, url, cached)
+            self._count("not_modified")
+            return self._public(cached, "not_modified")
+        if data is None:
+            # 304 without a cached body (the entry was removed meanwhile)
+            self._count("error")
+            raise ExtractionError(f"Unexpected 304 from {url}")
+
+        loop = asyncio.get_running_loop()
+        extracted = await loop.run_in_executor(get_extract_executor(), extract_html, data, encoding, self.max_chars)
+        if not extracted["text"]:
+            self._count("error")
+            raise ExtractionError(f"No article text found at {url}")
+        entry = {
+            "url": url,
+            **extracted,
+            "etag": etag,
+            "last_modified": response.headers.get("last-modified"),
+            "max_chars": self.max_chars,
+            "fetched_at": time.time(),
+        }
+        await asyncio.to_thread(self._write, url, entry)
+        self._count("extracted")
+        return self._public(entry, "extracted")
+
+    async def extract_many(self, urls: List[str]) -> List[dict]:
+        """``extract`` for several URLs concurrently; failures become {"url", "error"} entries"""
+        async def one(url: str) -> dict:
+            try:
+                return await self.extract(url)
+            except ExtractionError as e:
+                return {"url": url, "error": str(e)}
+
+        return list(await asyncio.gather(*(one(url) for url in urls)))
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "max_chars": self.max_chars,
+            "outcomes": dict(self.outcomes),
+        }
+
+    async def shutdown(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        shutdown_extract_pool()
+
+
+def articles_context(articles: List[dict], max_chars: int) -> str:
+    """Extracted articles as a numbered source list, each body cut to ``max_chars``"""
+    blocks = []
+    for number, article in enumerate((a for a in articles if a.get("text")), 1):
+        text = article["text"]
+        if len(text) > max_chars:
+            text = text[:max_chars].rsplit(" ", 1)[0] + "…"
+        blocks.append(f"[{number}] {article['title'] or article['url']}\nURL: {article['url']}\n{text}")
+    return "\n\n".join(blocks)
+
+
+article_extractor = ArticleExtractor()
+
+
+__all__ = [
+    "ArticleExtractor",
+    "ExtractionError",
+    "article_extractor",
+    "articles_context",
+    "extract_html",
+    "is_public_address",
+    "get_extract_executor",
+    "shutdown_extract_pool",
+]
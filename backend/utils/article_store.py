@@ -0,0 +1,303 @@
+"""
+Article store - Persistent SQLite store of news items pulled from agent outputs
+Items are deduplicated by canonical URL, indexed with FTS5 for search, and
+listed with keyset (cursor) pagination so deep pages stay fast.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import base64
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from .dedup import canonicalize_url
+from .storage import data_path
+
+
+def _dedup_key(item: Dict[str, Any]) -> str:
+    canonical = canonicalize_url(item.get("url"))
+    if canonical:
+        return canonical
+    headline = " ".join(re.findall(r"\w+", (item.get("headline") or "").lower()))
+    return "headline:" + hashlib.sha1(headline.encode("utf-8")).hexdigest()
+
+
+# Lines of the agents' readable layout
+_BLOCK_START = re.compile(r"^\s*(?:🚨|•)\s*(.+)$")
+_URL = re.compile(r"https?://\S+")
+
+
+def extract_items_from_text(text: str) -> List[Dict[str, Any]]:
+    """Best-effort news items from the agents' emoji layout (used when no structured output exists)"""
+    items: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        start = _BLOCK_START.match(line)
+        if start:
+            if current:
+                items.append(current)
+            headline = start.group(1)
+            current = {"headline": headline, "summary": ""}
+            # Highlight lines: "• Headline - Summary | 📰 Source | 🔗 URL"
+            if "|" in headline:
+                parts = [p.strip() for p in headline.split("|")]
+                title, _, summary = parts[0].partition(" - ")
+                current.update(headline=title.strip(), summary=summary.strip())
+                for part in parts[1:]:
+                    if part.startswith("📰"):
+                        current["source"] = part.lstrip("📰").strip()
+                    elif part.startswith("🔗"):
+                        current["url"] = part.lstrip("🔗").strip()
+            continue
+        if current is None or not line or "━━" in line:
+            continue
+        if line.startswith("🔗"):
+            match = _URL.search(line)
+            if match:
+                current["url"] = match.group(0)
+        elif "|" in line and ("📰" in line or "⏰" in line):
+            for part in (p.strip() for p in line.split("|")):
+                if part.startswith("📰"):
+                    current["source"] = re.sub(r"^📰\s*(Source:)?\s*", "", part)
+                elif part.startswith("⏰"):
+                    current["time"] = re.sub(r"^⏰\s*(Time:)?\s*", "", part)
+                elif part.startswith("📍"):
+                    current["location"] = re.sub(r"^📍\s*(Location:)?\s*", "", part)
+        elif line.startswith("📰"):
+            current["source"] = re.sub(r"^📰\s*(Source:)?\s*", "", line)
+        elif line.startswith("⏰"):
+            current["time"] = re.sub(r"^⏰\s*(Time:)?\s*", "", line)
+        elif line.startswith("📍"):
+            current["location"] = re.sub(r"^📍\s*(Location:)?\s*", "", line)
+        elif len(current["summary"]) < 500:
+            current["summary"] = (current["summary"] + " " + line).strip()
+    if current:
+        items.append(current)
+    return [item for item in items if len(item["headline"]) > 5]
+
+
+def encode_cursor(first_seen: float, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{first_seen!r}:{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        first_seen, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(first_seen), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def fts_query(text: str) -> str:
+    """Quote user terms so FTS5 syntax characters cannot break the query.
+
+    The last term is matched as a prefix, so partially typed words still hit.
+    """
+    terms = ['"' + term + '"' for term in re.findall(r"\w+", text)]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+class ArticleStore:
+    """SQLite article store with FTS5 search, batched writes and keyset pagination"""
+
+    COLUMNS = ("id", "url", "headline", "source", "published", "category", "summary", "agent", "first_seen", "last_seen")
+
+    def __init__(self, db_path: Optional[str] = None, batch_size: Optional[int] = None, flush_interval: Optional[float] = None):
+        self.db_path = db_path or os.getenv("ARTICLES_DB_PATH") or data_path("articles.sqlite3")
+        self.batch_size = batch_size or int(os.getenv("ARTICLES_BATCH_SIZE", "50"))
+        self.flush_interval = flush_interval or float(os.getenv("ARTICLES_FLUSH_INTERVAL", "2"))
+        self._lock = threading.Lock()
+        self._pending: List[tuple] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY,
+                    dedup_key TEXT NOT NULL UNIQUE,
+                    url TEXT,
+                    headline TEXT NOT NULL,
+                    source TEXT,
+                    published TEXT,
+                    category TEXT,
+                    summary TEXT,
+                    agent TEXT,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS articles_recent ON articles (first_seen DESC, id DESC);
+                CREATE INDEX IF NOT EXISTS articles_category ON articles (category, first_seen DESC, id DESC);
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    headline, summary, source, content='articles', content_rowid='id'
+                );
+                CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                    INSERT INTO articles_fts (rowid, headline, summary, source)
+                    VALUES (new.id, new.headline, new.summary, new.source);
+                END;
+                CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, headline, summary, source)
+                    VALUES ('delete', old.id, old.headline, old.summary, old.source);
+                END;
+                CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF headline, summary, source ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, headline, summary, source)
+                    VALUES ('delete', old.id, old.headline, old.summary, old.source);
+                    INSERT INTO articles_fts (rowid, headline, summary, source)
+                    VALUES (new.id, new.headline, new.summary, new.source);
+                END;
+                """
+            )
+            self._conn = conn
+        return self._conn
+
+    # Writes
+
+    def add_items(self, items: Iterable[Dict[str, Any]], agent: Optional[str] = None):
+        """Buffer items for the next batched insert.
+
+        With the background flusher running, writes happen off the event loop
+        every ``flush_interval``; otherwise a full batch is written inline.
+        """
+        now = time.time()
+        rows = []
+        for item in items:
+            headline = (item.get("headline") or "").strip()
+            if not headline:
+                continue
+            rows.append((
+                _dedup_key(item),
+                canonicalize_url(item.get("url")),
+                headline,
+                item.get("source"),
+                item.get("time"),
+                (item.get("category") or "").lower() or None,
+                item.get("summary"),
+                agent,
+                now,
+                now,
+            ))
+        with self._lock:
+            self._pending.extend(rows)
+            full = len(self._pending) >= self.batch_size
+        if full and self._flusher is None:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered items in one transaction; duplicates only refresh last_seen"""
+        with self._lock:
+            rows, self._pending = self._pending, []
+            if not rows:
+                return 0
+            conn = self._db()
+            with conn:
+                conn.executemany(
+                    """INSERT INTO articles
+                        (dedup_key, url, headline, source, published, category, summary, agent, first_seen, last_seen)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (dedup_key) DO UPDATE SET last_seen = excluded.last_seen""",
+                    rows
+                )
+            return len(rows)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except sqlite3.Error as e:
+                print(f"Article store flush failed: {e}")
+
+    def start(self):
+        if self._flusher is None:
+            self._flusher = asyncio.ensure_future(self._flush_loop())
+
+    async def stop(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # Reads
+
+    def _page(self, sql: str, args: list, limit: int) -> dict:
+        with self._lock:
+            rows = self._db().execute(sql, args + [limit + 1]).fetchall()
+        items = [{column: row[column] for column in self.COLUMNS} for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last["first_seen"], last["id"])
+        return {"items": items, "next_cursor": next_cursor}
+
+    def list(self, limit: int = 20, cursor: Optional[str] = None, category: Optional[str] = None, source: Optional[str] = None) -> dict:
+        """Newest first; pass the returned ``next_cursor`` to get the following page"""
+        where, args = [], []
+        if cursor:
+            first_seen, row_id = decode_cursor(cursor)
+            where.append("(first_seen, id) < (?, ?)")
+            args += [first_seen, row_id]
+        if category:
+            where.append("category = ?")
+            args.append(category.lower())
+        if source:
+            where.append("source = ?")
+            args.append(source)
+        sql = f"SELECT {', '.join(self.COLUMNS)} FROM articles"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY first_seen DESC, id DESC LIMIT ?"
+        return self._page(sql, args, limit)
+
+    def search(self, query: str, limit: int = 20, cursor: Optional[str] = None, category: Optional[str] = None) -> dict:
+        """Full-text search over headline, summary and source; newest matches first"""
+        match = fts_query(query)
+        if not match:
+            return {"items": [], "next_cursor": None}
+        where, args = ["articles_fts MATCH ?"], [match]
+        if cursor:
+            first_seen, row_id = decode_cursor(cursor)
+            where.append("(a.first_seen, a.id) < (?, ?)")
+            args += [first_seen, row_id]
+        if category:
+            where.append("a.category = ?")
+            args.append(category.lower())
+        sql = (
+            f"SELECT {', '.join('a.' + c for c in self.COLUMNS)} FROM articles_fts "
+            "JOIN articles a ON a.id = articles_fts.rowid WHERE " + " AND ".join(where) +
+            " ORDER BY a.first_seen DESC, a.id DESC LIMIT ?"
+        )
+        return self._page(sql, args, limit)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+article_store = ArticleStore()
+
+
+__all__ = [
+    "ArticleStore",
+    "article_store",
+    "canonicalize_url",
+    "extract_items_from_text",
+]
@@ -0,0 +1,67 @@
+"""
+Content-addressed artifact storage
+Artifacts are named by a hash of (renderer, content, options), so identical
+requests reuse the existing file and names never collide. Writes go to a
+temporary file that is atomically renamed into place.
+"""
+from typing import Any, Callable, Optional
+import hashlib
+import json
+import os
+import re
+import uuid
+
+HASH_LENGTH = 32
+
+# Matches the names produced by artifact_path, e.g. news_report_<hash>.pdf
+CONTENT_ADDRESSED_NAME = re.compile(rf"_[0-9a-f]{{{HASH_LENGTH}}}\.[a-z0-9]+$")
+
+
+def artifact_key(renderer: str, content: Any, options: Optional[dict] = None) -> str:
+    """Stable hash of everything that determines an artifact's bytes"""
+    payload = json.dumps(
+        {"renderer": renderer, "content": content, "options": options or {}},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+
+
+def artifact_path(directory: str, prefix: str, key: str, extension: str) -> str:
+    return os.path.join(directory, f"{prefix}_{key}.{extension}")
+
+
+def is_content_addressed(filename: str) -> bool:
+    """True for names produced by artifact_path; their bytes never change"""
+    return CONTENT_ADDRESSED_NAME.search(filename) is not None
+
+
+def store_artifact(path: str, render: Callable[[str], None], reuse: bool = True) -> str:
+    """Render into ``path`` atomically; an existing file is returned as-is when ``reuse``.
+
+    ``render`` receives a temporary path with the same extension (matplotlib and
+    friends infer the format from it).
+    """
+    if reuse and os.path.exists(path):
+        return path
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    base, extension = os.path.splitext(path)
+    tmp_path = f"{base}.{uuid.uuid4().hex}.tmp{extension}"
+    try:
+        render(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+__all__ = [
+    "artifact_key",
+    "artifact_path",
+    "is_content_addressed",
+    "store_artifact",
+]
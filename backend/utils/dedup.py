@@ -0,0 +1,283 @@
+"""
+Story deduplication - canonical URLs and MinHash signatures with LSH
+banding for near-duplicate headlines/summaries.
+Agents report the same story with different wording; the index assigns
+each story a stable id so results from several agents can be merged.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import hashlib
+import os
+import re
+import threading
+import uuid
+import zlib
+
+import numpy as np
+
+# Query parameters that only track the click, not the article
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|ref|ref_src|cmpid|ocid|guccounter|_ga)$", re.IGNORECASE)
+
+# Mersenne prime for the MinHash permutations (a * x + b) mod P
+_PRIME = np.uint64((1 << 61) - 1)
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    """Normalize a URL so the same article found via different links compares equal"""
+    if not url or not url.strip() or url.strip() == "#":
+        return None
+    url = url.strip().strip("<>()[]")
+    if "://" not in url:
+        url = "https://" + url
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if not host:
+        return None
+    if host.startswith("www.") or host.startswith("m."):
+        host = host.split(".", 1)[1]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ))
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def story_text(item: Dict[str, Any]) -> str:
+    """Text compared for near duplicates: headline plus summary"""
+    return f"{item.get('headline') or ''} {item.get('summary') or ''}"
+
+
+def shingles(text: str, size: int = 4) -> List[str]:
+    """Character ``size``-grams of the lowercased words (robust to rewording and punctuation)"""
+    normalized = " ".join(re.findall(r"\w+", text.lower()))
+    if len(normalized) <= size:
+        return [normalized] if normalized else []
+    return [normalized[i:i + size] for i in range(len(normalized) - size + 1)]
+
+
+@dataclass
+class StoryMatch:
+    story_id: str
+    duplicate: bool
+    similarity: float = 1.0
+
+
+class NearDuplicateIndex:
+    """Bounded index of recent stories matched by canonical URL, then by MinHash/LSH.
+
+    Signatures of ``num_perm`` hashes are split into ``bands``; two stories are
+    compared only when a whole band collides, so lookups touch a handful of
+    candidates instead of the whole corpus. Candidates are confirmed when the
+    estimated Jaccard similarity reaches ``threshold``. The oldest stories are
+    evicted beyond ``capacity`` together with their URLs.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        num_perm: int = 64,
+        bands: int = 16,
+        capacity: Optional[int] = None,
+        seed: int = 1
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold if threshold is not None else float(os.getenv("DEDUP_THRESHOLD", "0.5"))
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.capacity = capacity or int(os.getenv("DEDUP_CAPACITY", "20000"))
+        rng = np.random.default_rng(seed)
+        # a * x wraps around 2**64 before the modulo, which is what mixes the bits
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._lock = threading.Lock()
+        self._stories: "OrderedDict[str, Tuple[np.ndarray, List[tuple], Optional[str]]]" = OrderedDict()
+        self._buckets: Dict[tuple, set] = {}
+        self._urls: Dict[str, str] = {}
+        self.lookups = 0
+        self.duplicates = 0
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        grams = shingles(text)
+        if not grams:
+            return None
+        hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in set(grams)), dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) % _PRIME
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[tuple]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+
+    def _best_candidate(self, signature: np.ndarray, keys: List[tuple]) -> Tuple[Optional[str], float]:
+        candidates = set()
+        for key in keys:
+            candidates |= self._buckets.get(key, set())
+        best_id, best = None, 0.0
+        for story_id in candidates:
+            similarity = float(np.mean(self._stories[story_id][0] == signature))
+            if similarity > best:
+                best_id, best = story_id, similarity
+        if best_id is not None and best >= self.threshold:
+            return best_id, best
+        return None, best
+
+    def _evict(self):
+        while len(self._stories) > self.capacity:
+            story_id, (_, keys, url) = self._stories.popitem(last=False)
+            for key in keys:
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(story_id)
+                    if not bucket:
+                        del self._buckets[key]
+            if url is not None and self._urls.get(url) == story_id:
+                del self._urls[url]
+
+    def match(self, text: str, url: Optional[str] = None) -> Optional[StoryMatch]:
+        """The indexed story ``text``/``url`` duplicates, without adding it"""
+        canonical = canonicalize_url(url)
+        with self._lock:
+            if canonical is not None and canonical in self._urls:
+                return StoryMatch(self._urls[canonical], True)
+            signature = self.signature(text)
+            if signature is None:
+                return None
+            story_id, similarity = self._best_candidate(signature, self._band_keys(signature))
+            return StoryMatch(story_id, True, round(similarity, 3)) if story_id else None
+
+    def add(self, text: str, url: Optional[str] = None) -> StoryMatch:
+        """Assign ``text``/``url`` to an existing story or start a new one"""
+        canonical = canonicalize_url(url)
+        with self._lock:
+            self.lookups += 1
+            story_id = self._urls.get(canonical) if canonical is not None else None
+            if story_id is not None:
+                self._stories.move_to_end(story_id)
+                self.duplicates += 1
+                return StoryMatch(story_id, True)
+            signature = self.signature(text)
+            keys = self._band_keys(signature) if signature is not None else []
+            story_id, similarity = self._best_candidate(signature, keys) if signature is not None else (None, 0.0)
+            if story_id is not None:
+                self._stories.move_to_end(story_id)
+                if canonical is not None:
+                    self._urls.setdefault(canonical, story_id)
+                self.duplicates += 1
+                return StoryMatch(story_id, True, round(similarity, 3))
+
+            story_id = uuid.uuid4().hex[:12]
+            if signature is not None:
+                self._stories[story_id] = (signature, keys, canonical)
+                for key in keys:
+                    self._buckets.setdefault(key, set()).add(story_id)
+                if canonical is not None:
+                    self._urls[canonical] = story_id
+                self._evict()
+            return StoryMatch(story_id, False)
+
+    def add_item(self, item: Dict[str, Any]) -> StoryMatch:
+        return self.add(story_text(item), item.get("url"))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "stories": len(self._stories),
+                "buckets": len(self._buckets),
+                "urls": len(self._urls),
+                "lookups": self.lookups,
+                "duplicates": self.duplicates,
+            }
+
+
+def merge_items(items_by_source: Dict[str, List[Dict[str, Any]]], index: "NearDuplicateIndex") -> List[Dict[str, Any]]:
+    """One entry per story across sources, in first-seen order.
+
+    Each entry is the first report of the story plus ``story_id``, the
+    ``sources`` that reported it and the number of ``duplicates`` dropped.
+    """
+    merged: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    for source, items in items_by_source.items():
+        for item in items:
+            story_id = index.add_item(item).story_id
+            entry = merged.get(story_id)
+            if entry is None:
+                merged[story_id] = {**item, "story_id": story_id, "sources": [source], "duplicates": 0}
+                continue
+            entry["duplicates"] += 1
+            if source not in entry["sources"]:
+                entry["sources"].append(source)
+            for field, value in item.items():
+                if value and not entry.get(field):
+                    entry[field] = value
+    return list(merged.values())
+
+
+def dedupe_items(items: List[Dict[str, Any]], index: "NearDuplicateIndex") -> List[Dict[str, Any]]:
+    """``items`` without repeated stories, each tagged with its ``story_id``"""
+    merged = merge_items({"": items}, index)
+    for entry in merged:
+        entry.pop("sources")
+    return merged
+
+
+def content_key(text: str) -> str:
+    """Hash of ``text`` with case, punctuation and whitespace normalized away"""
+    normalized = " ".join(re.findall(r"\w+", text.lower()))
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=12).hexdigest()
+
+
+class ContentCache:
+    """Values (e.g. summaries) reused only for the same content up to case, punctuation and whitespace.
+
+    Near-duplicates are deliberately not matched: an edited figure or name
+    leaves most shingles intact but makes an old summary wrong.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.capacity = capacity or int(os.getenv("DEDUP_CAPACITY", "20000"))
+        self._values: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def get(self, text: str, variant: str = "") -> Tuple[Optional[Any], Optional[str]]:
+        """``(value, content key)`` for content seen before, or ``(None, None)``"""
+        key = content_key(text)
+        with self._lock:
+            value = self._values.get((key, variant))
+            if value is None:
+                return None, None
+            self._values.move_to_end((key, variant))
+            self.hits += 1
+            return value, key
+
+    def set(self, text: str, value: Any, variant: str = ""):
+        key = (content_key(text), variant)
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.capacity:
+                self._values.popitem(last=False)
+
+
+story_index = NearDuplicateIndex()
+
+
+__all__ = [
+    "ContentCache",
+    "NearDuplicateIndex",
+    "StoryMatch",
+    "canonicalize_url",
+    "content_key",
+    "dedupe_items",
+    "merge_items",
+    "story_index",
+    "story_text",
+]
@@ -0,0 +1,371 @@
+"""
+Feed ingester - Async RSS/Atom polling for fresh candidate news items
+All feeds share one pooled httpx client. Requests to each host are capped in
+number and spaced out, and they revalidate with ETag/Last-Modified, so an
+unchanged feed costs a 304 and keeps its previous items. Responses are parsed
+incrementally while they stream in, so a large feed never sits in memory as
+one document, and reading stops once enough items have been collected.
+httpx is imported when the first request is made, keeping it off cold starts.
+"""
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+import asyncio
+import html
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+
+from .dedup import canonicalize_url
+from .metrics import feed_fetches
+
+if TYPE_CHECKING:
+    import httpx
+
+
+@dataclass(frozen=True)
+class FeedSource:
+    name: str
+    url: str
+
+
+# The outlets the agents' instructions point at (Reuters has no public feed)
+DEFAULT_FEEDS = (
+    FeedSource("TechCrunch", "https://techcrunch.com/category/artificial-intelligence/feed/"),
+    FeedSource("The Verge", "https://www.theverge.com/rss/ai-artificial-intelligence/index.xml"),
+    FeedSource("MIT Technology Review", "https://www.technologyreview.com/topic/artificial-intelligence/feed"),
+    FeedSource("BBC Technology", "https://feeds.bbci.co.uk/news/technology/rss.xml"),
+)
+
+
+def parse_sources(spec: str) -> List[FeedSource]:
+    """Sources from "Name|url, Name|url" (a bare url is named after its host)"""
+    sources = []
+    for part in spec.split(","):
+        name, _, url = part.strip().rpartition("|")
+        if url:
+            sources.append(FeedSource(name.strip() or urlsplit(url).hostname or url, url.strip()))
+    return sources
+
+
+@dataclass
+class FeedEntry:
+    title: str
+    url: Optional[str]
+    summary: str
+    source: str
+    published: Optional[str] = None  # ISO 8601, UTC
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+_TAG = re.compile(r"<[^>]+>")
+
+
+def _local(tag: str) -> str:
+    """Tag name without its namespace"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _clean(text: Optional[str], limit: int) -> str:
+    """Plain text from an HTML fragment, whitespace collapsed and cut to ``limit`` characters"""
+    text = " ".join(html.unescape(_TAG.sub(" ", text or "")).split())
+    return text if len(text) <= limit else text[:limit].rsplit(" ", 1)[0] + "…"
+
+
+def _parse_date(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        parsed = parsedate_to_datetime(text)  # RSS (RFC 822)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(text)  # Atom (RFC 3339)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _entry(element: ET.Element, source: str, summary_chars: int) -> Optional[FeedEntry]:
+    """FeedEntry from an RSS <item> or Atom <entry>"""
+    fields: Dict[str, str] = {}
+    link = None
+    for child in element:
+        name = _local(child.tag)
+        if name == "link":
+            href = child.get("href")
+            if href is None:
+                link = link or (child.text or "").strip() or None
+            elif child.get("rel", "alternate") == "alternate":
+                link = link or href
+        elif name not in fields and child.text:
+            fields[name] = child.text
+    title = _clean(fields.get("title"), 300)
+    if not title:
+        return None
+    summary = fields.get("description") or fields.get("summary") or fields.get("encoded") or fields.get("content")
+    published = fields.get("pubDate") or fields.get("published") or fields.get("updated") or fields.get("date")
+    return FeedEntry(
+        title=title,
+        url=link or (fields.get("guid") or "").strip() or None,
+        summary=_clean(summary, summary_chars),
+        source=source,
+        published=_parse_date(published)
+    )
+
+
+class FeedParser:
+    """Incremental RSS/Atom parser: feed it the response body chunk by chunk"""
+
+    def __init__(self, source: str, max_items: int, summary_chars: int = 400):
+        self.source = source
+        self.max_items = max_items
+        self.summary_chars = summary_chars
+        self.entries: List[FeedEntry] = []
+        self._parser = ET.XMLPullParser(events=("end",))
+
+    @property
+    def full(self) -> bool:
+        return len(self.entries) >= self.max_items
+
+    def feed(self, data: bytes):
+        self._parser.feed(data)
+        self._drain()
+
+    def close(self):
+        self._parser.close()
+        self._drain()
+
+    def _drain(self):
+        for _, element in self._parser.read_events():
+            if _local(element.tag) not in ("item", "entry"):
+                continue
+            if not self.full:
+                entry = _entry(element, self.source, self.summary_chars)
+                if entry is not None:
+                    self.entries.append(entry)
+            # Parsed items are dropped from the tree as soon as they are read
+            element.clear()
+
+
+class _Host:
+    """Per-host concurrency cap and request spacing"""
+
+    def __init__(self, concurrency: int):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.next_at = 0.0
+        # Set from Retry-After on 429/503; fetches are skipped until then
+        self.blocked_until = 0.0
+
+
+class _Throttled(Exception):
+    pass
+
+
+def _retry_after(response: "httpx.Response") -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+
+class FeedIngester:
+    """Polls a set of feeds and keeps the merged, newest-first candidate items.
+
+    ``candidates`` re-polls at most every ``poll_interval`` seconds, and
+    concurrent callers share one poll. Fetch errors never raise: a failing
+    feed keeps its previous items and reports the error in ``stats``.
+    """
+
+    def __init__(
+        self,
+        sources: Optional[Iterable[FeedSource]] = None,
+        max_items: Optional[int] = None,
+        host_concurrency: Optional[int] = None,
+        host_delay: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_bytes: Optional[int] = None
+    ):
+        if sources is None:
+            spec = os.getenv("FEED_URLS")
+            sources = parse_sources(spec) if spec else DEFAULT_FEEDS
+        self.sources = list(sources)
+        self.max_items = max_items or int(os.getenv("FEED_MAX_ITEMS", "30"))
+        self.host_concurrency = host_concurrency or int(os.getenv("FEED_HOST_CONCURRENCY", "2"))
+        self.host_delay = host_delay if host_delay is not None else float(os.getenv("FEED_HOST_DELAY", "1.0"))
+        self.poll_interval = poll_interval if poll_interval is not None else float(os.getenv("FEED_POLL_INTERVAL", "300"))
+        self.timeout = timeout or float(os.getenv("FEED_TIMEOUT", "10"))
+        self.max_bytes = max_bytes or int(os.getenv("FEED_MAX_BYTES", str(5 * 1024 * 1024)))
+        self.user_agent = os.getenv("FEED_USER_AGENT", "AI-News-Feed-Ingester/1.0")
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._hosts: Dict[str, _Host] = {}
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._entries: Dict[str, List[FeedEntry]] = {}
+        self._status: Dict[str, dict] = {}
+        self._latest: List[FeedEntry] = []
+        self._polled_at = 0.0
+        self._poll_lock = asyncio.Lock()
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv("FEED_MAX_CONNECTIONS", "20")),
+                    max_keepalive_connections=int(os.getenv("FEED_MAX_KEEPALIVE_CONNECTIONS", "10"))
+                ),
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": self.user_agent, "Accept": "application/rss+xml, application/atom+xml, application/xml;q=0.9, */*;q=0.8"}
+            )
+        return self._client
+
+    async def _wait_turn(self, host: _Host):
+        # Reserve the next start slot for this host before sleeping, so waiters queue in order
+        now = time.monotonic()
+        start = max(now, host.next_at)
+        host.next_at = start + self.host_delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def _read(self, source: FeedSource, response: "httpx.Response") -> List[FeedEntry]:
+        parser = FeedParser(source.name, self.max_items)
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            parser.feed(chunk)
+            if parser.full or received > self.max_bytes:
+                # Enough items (or too large): stop reading without parsing the rest
+                return parser.entries
+        parser.close()
+        return parser.entries
+
+    async def fetch(self, source: FeedSource) -> List[FeedEntry]:
+        """Current items of one feed; a 304 or an error keeps the previous items"""
+        host_name = urlsplit(source.url).hostname or source.url
+        host = self._hosts.setdefault(host_name, _Host(self.host_concurrency))
+        headers = {}
+        etag, last_modified = self._validators.get(source.url, (None, None))
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        start = time.perf_counter()
+        status, error = "ok", None
+        try:
+            if time.monotonic() < host.blocked_until:
+                raise _Throttled(f"host throttled for {host.blocked_until - time.monotonic():.0f}s more")
+            async with host.semaphore:
+                await self._wait_turn(host)
+                async with self.client.stream("GET", source.url, headers=headers) as response:
+                    if response.status_code == 304:
+                        status = "not_modified"
+                    elif response.status_code in (429, 503):
+                        # Back off from the whole host for as long as it asks
+                        wait = _retry_after(response) or 60.0
+                        host.blocked_until = time.monotonic() + wait
+                        status, error = "throttled", f"HTTP {response.status_code}, retry after {wait:.0f}s"
+                    elif response.status_code >= 400:
+                        status, error = "error", f"HTTP {response.status_code}"
+                    else:
+                        self._entries[source.url] = await self._read(source, response)
+                        self._validators[source.url] = (response.headers.get("etag"), response.headers.get("last-modified"))
+        except _Throttled as e:
+            status, error = "throttled", str(e)
+        except ET.ParseError as e:
+            status, error = "error", f"Invalid feed XML: {e}"
+        except Exception as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+        feed_fetches.labels(host_name, status).inc()
+        entries = self._entries.get(source.url, [])
+        self._status[source.name] = {
+            "url": source.url,
+            "status": status,
+            "items": len(entries),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            **({"error": error} if error else {}),
+        }
+        return entries
+
+    async def poll(self) -> List[FeedEntry]:
+        """Fetch every feed now and merge their items, newest first"""
+        results = await asyncio.gather(*(self.fetch(source) for source in self.sources))
+        seen = set()
+        merged: List[FeedEntry] = []
+        for entry in (entry for entries in results for entry in entries):
+            key = canonicalize_url(entry.url) or entry.title.lower()
+            if key not in seen:
+                seen.add(key)
+                merged.append(entry)
+        # ISO timestamps in UTC sort chronologically; undated items go last
+        merged.sort(key=lambda entry: entry.published or "", reverse=True)
+        self._latest = merged
+        self._polled_at = time.time()
+        return merged
+
+    async def candidates(self, limit: Optional[int] = None) -> List[FeedEntry]:
+        """Latest merged items, polling first when the last poll is older than ``poll_interval``"""
+        if time.time() - self._polled_at >= self.poll_interval:
+            async with self._poll_lock:
+                if time.time() - self._polled_at >= self.poll_interval:
+                    await self.poll()
+        return self._latest[:limit] if limit else list(self._latest)
+
+    def stats(self) -> dict:
+        return {
+            "sources": len(self.sources),
+            "candidates": len(self._latest),
+            "polled_at": datetime.fromtimestamp(self._polled_at, tz=timezone.utc).isoformat() if self._polled_at else None,
+            "feeds": dict(self._status),
+        }
+
+    async def shutdown(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def with_feed_context(query: str, entries: List[FeedEntry]) -> str:
+    """``query`` followed by the feed items, for agents that should report real, current stories"""
+    if not entries:
+        return query
+    lines = []
+    for entry in entries:
+        meta = ", ".join(part for part in (entry.source, entry.published) if part)
+        lines.append(f"- {entry.title} ({meta})\n  URL: {entry.url or 'n/a'}\n  {entry.summary}".rstrip())
+    return (
+        f"{query}\n\nCandidate items fetched just now from the news feeds. Base the update on these "
+        "real items, keep their sources and URLs, and skip any that are not about AI:\n"
+        + "\n".join(lines)
+    )
+
+
+feed_ingester = FeedIngester()
+
+
+__all__ = [
+    "FeedSource",
+    "FeedEntry",
+    "FeedParser",
+    "FeedIngester",
+    "DEFAULT_FEEDS",
+    "parse_sources",
+    "with_feed_context",
+    "feed_ingester",
+]
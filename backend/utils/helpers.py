@@ -1,29 +1,33 @@
 """
 Helper utilities for PDF generation, voice synthesis, and trend graphs
+ReportLab and gTTS are imported on first render, not at import time.
 """
-import os
 from datetime import datetime
 from typing import Optional
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from gtts import gTTS
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from io import BytesIO
 import base64
 
+from .artifact_store import artifact_key, artifact_path, store_artifact
+from .trend_renderer import trend_renderer
+
 def generate_pdf_report(content: str, title: str = "Daily News Report", output_path: Optional[str] = None) -> str:
-    """Generate a PDF report from text content"""
+    """Generate a PDF report from text content.
+
+    Without ``output_path`` the file is content-addressed under reports/ and an
+    identical earlier report is returned without rendering.
+    """
     if output_path is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = f"reports/news_report_{timestamp}.pdf"
-    
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else "reports", exist_ok=True)
-    
+        key = artifact_key("pdf_report", content, {"title": title})
+        output_path = artifact_path("reports", "news_report", key, "pdf")
+        return store_artifact(output_path, lambda path: _render_pdf(content, title, path))
+    return store_artifact(output_path, lambda path: _render_pdf(content, title, path), reuse=False)
+
+def _render_pdf(content: str, title: str, output_path: str):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.enums import TA_CENTER
+
     doc = SimpleDocTemplate(output_path, pagesize=A4)
     styles = getSampleStyleSheet()
     
@@ -66,17 +70,9 @@ def generate_pdf_report(content: str, title: str = "Daily News Report", output_p
             story.append(Spacer(1, 0.1*inch))
     
     doc.build(story)
-    return output_path
 
 def generate_voice_summary(text: str, language: str = "en", output_path: Optional[str] = None) -> str:
-    """Generate MP3 voice summary from text"""
-    if output_path is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = f"audio/voice_summary_{timestamp}.mp3"
-    
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else "audio", exist_ok=True)
-    
+    """Generate MP3 voice summary from text (content-addressed under audio/ by default)"""
     # Language mapping
     lang_map = {
         "english": "en",
@@ -87,45 +83,32 @@ def generate_voice_summary(text: str, language: str = "en", output_path: Optiona
     
     lang_code = lang_map.get(language.lower(), "en")
     
-    # Generate speech
-    tts = gTTS(text=text, lang=lang_code, slow=False)
-    tts.save(output_path)
-    
-    return output_path
+    def render(path: str):
+        from gtts import gTTS
 
-def generate_trend_graph(data: dict, output_path: Optional[str] = None) -> str:
-    """Generate a trend graph from data"""
-    if output_path is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = f"graphs/trend_graph_{timestamp}.png"
-    
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else "graphs", exist_ok=True)
-    
-    plt.figure(figsize=(12, 6))
+        # Generate speech
+        tts = gTTS(text=text, lang=lang_code, slow=False)
+        tts.save(path)
     
-    # Example: Plot trend data
-    if isinstance(data, dict) and 'dates' in data and 'values' in data:
-        dates = [datetime.strptime(d, '%Y-%m-%d') for d in data['dates']]
-        plt.plot(dates, data['values'], marker='o', linewidth=2, markersize=8)
-        plt.gcf().autofmt_xdate()
-        plt.xlabel('Date')
-        plt.ylabel('Trend Value')
-        plt.title('News Trend Analysis')
-        plt.grid(True, alpha=0.3)
-    else:
-        # Default example graph
-        plt.plot([1, 2, 3, 4, 5], [10, 15, 13, 17, 20], marker='o')
-        plt.xlabel('Time')
-        plt.ylabel('Trend')
-        plt.title('News Trend Analysis')
-        plt.grid(True, alpha=0.3)
+    if output_path is None:
+        key = artifact_key("voice_summary", text, {"lang": lang_code})
+        return store_artifact(artifact_path("audio", "voice_summary", key, "mp3"), render)
+    return store_artifact(output_path, render, reuse=False)
+
+def generate_trend_graph(data: dict, output_path: Optional[str] = None, fmt: str = "png", dpi: Optional[int] = None) -> str:
+    """Generate a trend graph file from data (content-addressed under graphs/ by default).
+
+    Use ``trend_renderer.render`` / ``render_base64`` to get the image without touching disk.
+    """
+    dpi = dpi or trend_renderer.dpi
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    def render(path: str):
+        trend_renderer.render_to_file(data, path, fmt=fmt, dpi=dpi)
     
-    return output_path
+    if output_path is None:
+        key = artifact_key("trend_graph", data, {"fmt": fmt, "dpi": dpi})
+        return store_artifact(artifact_path("graphs", "trend_graph", key, fmt), render)
+    return store_artifact(output_path, render, reuse=False)
 
 def get_base64_image(image_path: str) -> str:
     """Convert image to base64 string"""
@@ -0,0 +1,249 @@
+"""
+Artifact jobs - SQLite-backed queue for PDF, voice and graph generation
+Jobs are persisted so queued (or interrupted) work resumes after a restart.
+Several processes can share one database: a worker claims a job with a
+conditional UPDATE and holds it under a lease it renews while rendering, so
+only jobs whose owner stopped renewing are picked up again.
+"""
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from .helpers import generate_pdf_report, generate_voice_summary, generate_trend_graph
+from .render_pool import DOWNLOAD_PREFIXES, download_url, render_timed
+from .storage import data_path
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def _render_pdf(params: dict) -> str:
+    return generate_pdf_report(params["content"], title=params.get("title") or "AI News Report")
+
+
+def _render_voice(params: dict) -> str:
+    return generate_voice_summary(params["content"], language=params.get("language") or "english")
+
+
+def _render_graph(params: dict) -> str:
+    return generate_trend_graph(params.get("trend_data") or {})
+
+
+# Job kind -> (renderer run in the render pool, download URL prefix)
+JOB_KINDS: Dict[str, tuple] = {
+    "pdf_report": (_render_pdf, DOWNLOAD_PREFIXES["pdf_report"]),
+    "voice_summary": (_render_voice, DOWNLOAD_PREFIXES["voice_summary"]),
+    "trend_graph": (_render_graph, DOWNLOAD_PREFIXES["trend_graph"]),
+}
+
+
+class JobQueue:
+    """Persistent artifact job queue drained by a fixed number of async workers"""
+
+    def __init__(self, db_path: Optional[str] = None, concurrency: Optional[int] = None, lease_seconds: Optional[float] = None):
+        self.db_path = db_path or os.getenv("JOBS_DB_PATH") or data_path("jobs.sqlite3")
+        self.concurrency = concurrency if concurrency is not None else int(os.getenv("JOB_WORKERS", "2"))
+        self.lease_seconds = lease_seconds or float(os.getenv("JOB_LEASE_SECONDS", "60"))
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: set = set()  # ids in _queue, so the reaper does not queue them twice
+        self._workers: List[asyncio.Task] = []
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    owner TEXT,
+                    lease_until REAL
+                )"""
+            )
+            # Databases created before leases existed
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        return self._conn
+
+    def _execute(self, sql: str, args: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._db().execute(sql, args).fetchall()
+
+    def _update(self, sql: str, args: tuple = ()) -> int:
+        """Run an UPDATE; returns the number of rows changed"""
+        with self._lock:
+            return self._db().execute(sql, args).rowcount
+
+    def _claim(self, job_id: str) -> bool:
+        """Take ``job_id`` if it is queued or its lease expired; only one worker anywhere succeeds"""
+        now = time.time()
+        return self._update(
+            "UPDATE jobs SET status = ?, owner = ?, lease_until = ?, updated_at = ? "
+            "WHERE id = ? AND (status = ? OR (status = ? AND lease_until < ?))",
+            (RUNNING, self.owner, now + self.lease_seconds, now, job_id, QUEUED, RUNNING, now)
+        ) == 1
+
+    def _finish(self, job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None) -> bool:
+        """Record the outcome, unless the lease was lost and another worker took the job over"""
+        return self._update(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, lease_until = NULL "
+            "WHERE id = ? AND owner = ? AND status = ?",
+            (status, json.dumps(result) if result is not None else None, error, time.time(), job_id, self.owner, RUNNING)
+        ) == 1
+
+    async def _renew(self, job_id: str):
+        """Extend the lease on ``job_id`` while it renders"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await asyncio.to_thread(
+                self._update,
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND status = ?",
+                (time.time() + self.lease_seconds, job_id, self.owner, RUNNING)
+            )
+
+    def _insert(self, kind: str, params: Dict[str, Any]) -> str:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}. Must be one of: {list(JOB_KINDS)}")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._execute(
+            "INSERT INTO jobs (id, kind, params, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(params), QUEUED, now, now)
+        )
+        return job_id
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> str:
+        """Persist a new job and hand it to the workers; returns the job id"""
+        job_id = self._insert(kind, params)
+        self._put(job_id)
+        return job_id
+
+    async def submit_async(self, kind: str, params: Dict[str, Any]) -> str:
+        """``submit`` with the SQLite write off the event loop (the queue itself is loop-only)"""
+        job_id = await asyncio.to_thread(self._insert, kind, params)
+        self._put(job_id)
+        return job_id
+
+    def _put(self, job_id: str):
+        if self._queue is not None and job_id not in self._pending:
+            self._pending.add(job_id)
+            self._queue.put_nowait(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        row = rows[0]
+        return {
+            "job_id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    async def _run(self, job_id: str):
+        if not await asyncio.to_thread(self._claim, job_id):
+            return  # Finished, or running under another worker's live lease
+        row = (await asyncio.to_thread(self._execute, "SELECT kind, params FROM jobs WHERE id = ?", (job_id,)))[0]
+        renderer, _ = JOB_KINDS[row["kind"]]
+        renew = asyncio.ensure_future(self._renew(job_id))
+        try:
+            path = await render_timed(row["kind"], renderer, json.loads(row["params"]))
+        except Exception as e:
+            print(f"Artifact job {job_id} failed: {e}")
+            await asyncio.to_thread(self._finish, job_id, FAILED, error=str(e))
+            return
+        finally:
+            renew.cancel()
+        await asyncio.to_thread(self._finish, job_id, DONE, {"filename": os.path.basename(path), "url": download_url(row["kind"], path)})
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            self._pending.discard(job_id)
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                print(f"Artifact job {job_id} could not run: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _orphans(self, queued_before: float) -> List[str]:
+        """Jobs no live worker holds: queued before ``queued_before``, or running with an expired lease"""
+        rows = self._execute(
+            "SELECT id FROM jobs WHERE (status = ? AND updated_at < ?) OR (status = ? AND lease_until < ?) ORDER BY created_at",
+            (QUEUED, queued_before, RUNNING, time.time())
+        )
+        return [row["id"] for row in rows]
+
+    async def _reaper(self):
+        """Pick up jobs left behind by workers (in this or another process) that died"""
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                orphans = await asyncio.to_thread(self._orphans, time.time() - self.lease_seconds)
+            except sqlite3.Error as e:
+                print(f"Artifact job reaper failed: {e}")
+                continue
+            for job_id in orphans:
+                self._put(job_id)
+
+    def start(self):
+        """Start workers and queue unfinished jobs that no live worker holds"""
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        for job_id in self._orphans(time.time()):
+            self._put(job_id)
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(max(self.concurrency, 1))]
+        self._workers.append(asyncio.ensure_future(self._reaper()))
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._pending.clear()
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    def queued(self) -> int:
+        """Jobs waiting for a worker"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        rows = self._execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+        return {row["status"]: row["n"] for row in rows}
+
+
+__all__ = ["JobQueue", "JOB_KINDS", "QUEUED", "RUNNING", "DONE", "FAILED"]
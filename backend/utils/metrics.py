@@ -0,0 +1,305 @@
+"""
+Metrics - Counters, gauges and histograms rendered in the Prometheus text format
+Recording is a dict lookup plus an increment under an uncontended lock, so it
+is cheap enough for every request and agent call. Children are cached per
+label set; keep label values low-cardinality (route templates, agent ids).
+"""
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+# Seconds; spans fast cache hits through multi-minute agent runs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        # Optional callback returning {label values: value}, read at scrape time
+        self.collect: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """The child for one label set (created on first use)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def _values(self) -> List[Tuple[Tuple[str, ...], float]]:
+        if self.collect is not None:
+            return list(self.collect().items())
+        return [(values, child.value) for values, child in list(self._children.items())]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}_total{_format_labels(self.labelnames, values)} {_format_value(value)}"
+            for values, value in self._values()
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def track(self, *values: str) -> "_InFlight":
+        """Context manager that counts the block as in flight"""
+        return _InFlight(self.labels(*values))
+
+    def value(self, *values: str) -> float:
+        child = self._children.get(values)
+        return child.value if child is not None else 0.0
+
+    def total(self) -> float:
+        return sum(child.value for child in list(self._children.values()))
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}" for values, value in self._values()]
+
+
+class _InFlight:
+    __slots__ = ("_child",)
+
+    def __init__(self, child: _Value):
+        self._child = child
+
+    def __enter__(self):
+        self._child.inc()
+
+    def __exit__(self, *exc):
+        self._child.dec()
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: _HistogramValue):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together for /metrics"""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = (), collect=None) -> Counter:
+        counter = Counter(name, documentation, labelnames)
+        counter.collect = collect
+        return self.register(counter)
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = (), collect=None) -> Gauge:
+        gauge = Gauge(name, documentation, labelnames)
+        gauge.collect = collect
+        return self.register(gauge)
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in list(self._metrics.values())) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request, labelled by route template.
+
+    Measured until the response body is finished, so streaming endpoints
+    report their full duration. Unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        http_in_flight.labels().inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.labels().dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            http_request_seconds.labels(scope["method"], route, str(status[0])).observe(time.perf_counter() - start)
+
+
+metrics = MetricsRegistry()
+
+http_request_seconds = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+http_in_flight = metrics.gauge("http_requests_in_flight", "HTTP requests being handled")
+agent_run_seconds = metrics.histogram(
+    "agent_run_duration_seconds", "Upstream model call latency per agent", ("agent", "model", "mode")
+)
+agent_tokens = metrics.counter("agent_tokens", "Tokens reported in response.usage", ("agent", "model", "kind"))
+agent_errors = metrics.counter("agent_errors", "Failed agent calls by error class", ("agent", "error"))
+agent_in_flight = metrics.gauge("agent_calls_in_flight", "Upstream model calls in progress", ("agent",))
+agent_fallbacks = metrics.counter("agent_fallbacks", "Calls moved to a fallback model, by the model fallen back to", ("agent", "model"))
+agent_retries = metrics.counter("agent_retries", "Upstream model calls retried, by error class", ("model", "error"))
+rate_limit_wait_seconds = metrics.histogram(
+    "rate_limit_wait_seconds", "Time calls queued for the per-model rate limit", ("model",)
+)
+artifact_render_seconds = metrics.histogram(
+    "artifact_render_duration_seconds", "Artifact render time in the render pool", ("kind", "status")
+)
+renders_in_flight = metrics.gauge("artifact_renders_in_flight", "Artifacts rendering in the render pool")
+feed_fetches = metrics.counter("feed_fetches", "RSS/Atom feed fetches by host and outcome", ("host", "status"))
+article_extractions = metrics.counter("article_extractions", "Article body extractions by outcome", ("outcome",))
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsMiddleware",
+    "MetricsRegistry",
+    "metrics",
+    "http_request_seconds",
+    "http_in_flight",
+    "agent_run_seconds",
+    "agent_tokens",
+    "agent_errors",
+    "agent_in_flight",
+    "agent_retries",
+    "agent_fallbacks",
+    "rate_limit_wait_seconds",
+    "artifact_render_seconds",
+    "renders_in_flight",
+    "feed_fetches",
+    "article_extractions",
+]
@@ -0,0 +1,110 @@
+"""
+Render pool - Runs blocking artifact generation (PDF, voice, graphs) off the event loop
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import os
+import time
+
+from .helpers import generate_pdf_report, generate_voice_summary, generate_trend_graph
+from .metrics import artifact_render_seconds, renders_in_flight
+
+_executor: Optional[Executor] = None
+
+# Artifact kind -> route serving its files (the /api/download-* endpoints)
+DOWNLOAD_PREFIXES: Dict[str, str] = {
+    "pdf_report": "/api/download-pdf/",
+    "voice_summary": "/api/download-audio/",
+    "trend_graph": "/api/download-graph/",
+}
+
+
+def get_render_executor() -> Executor:
+    """Shared executor for artifact rendering.
+
+    Defaults to a process pool: ReportLab and matplotlib are CPU bound and
+    pyplot is not thread safe. Set ARTIFACT_EXECUTOR=thread where processes
+    cannot be spawned.
+    """
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("ARTIFACT_WORKERS", str(min(3, os.cpu_count() or 1))))
+        if os.getenv("ARTIFACT_EXECUTOR", "process") == "thread":
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artifact")
+        else:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+    return _executor
+
+
+def render_workers() -> int:
+    """Worker count of the render executor (0 until it is first used)"""
+    return getattr(_executor, "_max_workers", 0) if _executor is not None else 0
+
+
+async def run_in_render_pool(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Await ``func(*args, **kwargs)`` on the render executor"""
+    loop = asyncio.get_running_loop()
+    with renders_in_flight.track():
+        return await loop.run_in_executor(get_render_executor(), partial(func, *args, **kwargs))
+
+
+async def render_timed(kind: str, func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """``run_in_render_pool`` that records the render duration under ``kind``"""
+    start = time.perf_counter()
+    status = "error"
+    try:
+        result = await run_in_render_pool(func, *args, **kwargs)
+        status = "ok"
+        return result
+    finally:
+        artifact_render_seconds.labels(kind, status).observe(time.perf_counter() - start)
+
+
+def download_url(kind: str, path: str) -> str:
+    """Download URL of a rendered artifact; content-addressed names make it cacheable for good"""
+    return DOWNLOAD_PREFIXES[kind] + os.path.basename(path)
+
+
+async def render_artifacts(
+    content: str,
+    features: list,
+    language: str = "english",
+    trend_data: Optional[dict] = None
+) -> Dict[str, str]:
+    """Render the requested artifacts concurrently; returns ``<name>_path`` (file path) and ``<name>_url`` (download URL) keys"""
+    jobs = {}
+    if "pdf_report" in features:
+        jobs["pdf"] = ("pdf_report", render_timed("pdf_report", generate_pdf_report, content, title="AI News Report"))
+    if "voice_summary" in features:
+        jobs["voice"] = ("voice_summary", render_timed("voice_summary", generate_voice_summary, content, language=language))
+    if "trend_graph" in features:
+        jobs["graph"] = ("trend_graph", render_timed("trend_graph", generate_trend_graph, trend_data or {}))
+
+    paths = await asyncio.gather(*(render for _, render in jobs.values()))
+    response = {}
+    for (name, (kind, _)), path in zip(jobs.items(), paths):
+        response[f"{name}_path"] = path
+        response[f"{name}_url"] = download_url(kind, path)
+    return response
+
+
+def shutdown_render_pool():
+    """Stop the render executor (called on app shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+__all__ = [
+    "get_render_executor",
+    "run_in_render_pool",
+    "render_timed",
+    "render_workers",
+    "render_artifacts",
+    "download_url",
+    "DOWNLOAD_PREFIXES",
+    "shutdown_render_pool",
+]
@@ -0,0 +1,34 @@
+"""
+Runtime data location - where SQLite databases and disk caches are written
+DATA_DIR sets it explicitly. Otherwise files go in the working directory,
+unless that is read-only (Vercel and other serverless platforms), in which
+case a directory under the system temp dir is used; data written there only
+lives as long as the instance.
+"""
+import os
+import tempfile
+from typing import Optional
+
+_data_dir: Optional[str] = None
+
+
+def data_dir() -> str:
+    """Directory for runtime data (DATA_DIR, the working directory, or a temp dir when that is read-only)"""
+    global _data_dir
+    if _data_dir is None:
+        configured = os.getenv("DATA_DIR")
+        if configured:
+            _data_dir = configured
+        elif os.getenv("VERCEL") != "1" and os.access(os.getcwd(), os.W_OK):
+            _data_dir = ""
+        else:
+            _data_dir = os.path.join(tempfile.gettempdir(), "ai-news-data")
+    return _data_dir
+
+
+def data_path(name: str) -> str:
+    """``name`` inside the runtime data directory"""
+    return os.path.join(data_dir(), name)
+
+
+__all__ = ["data_dir", "data_path"]
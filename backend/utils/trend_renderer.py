@@ -0,0 +1,101 @@
+"""
+Trend graph renderer built on matplotlib's object-oriented Figure/Agg API
+Unlike pyplot there is no global figure state, so renders are safe to run
+concurrently from a thread pool. Output can stay in memory (bytes / base64).
+matplotlib is imported on the first render.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from io import BytesIO
+from typing import TYPE_CHECKING, Optional, Tuple
+import base64
+import os
+import threading
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+from .artifact_store import artifact_key
+
+SUPPORTED_FORMATS = ("png", "svg")
+
+MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+class TrendRenderer:
+    """Renders trend series to PNG/SVG bytes with an LRU cache keyed by the series"""
+
+    def __init__(self, dpi: Optional[int] = None, cache_size: Optional[int] = None):
+        self.dpi = dpi if dpi is not None else int(os.getenv("TREND_GRAPH_DPI", "150"))
+        self.cache_size = cache_size if cache_size is not None else int(os.getenv("TREND_GRAPH_CACHE_SIZE", "64"))
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _figure(self, data: dict) -> "Figure":
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(12, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+
+        if isinstance(data, dict) and data.get('dates') and data.get('values'):
+            # Day ('2024-01-05') or bucket timestamps ('2024-01-05T13:00:00+00:00')
+            dates = [datetime.fromisoformat(d) for d in data['dates']]
+            ax.plot(dates, data['values'], marker='o', linewidth=2, markersize=8)
+            fig.autofmt_xdate()
+            ax.set_xlabel('Date')
+            ax.set_ylabel('Trend Value')
+        else:
+            # Nothing counted yet: an empty chart rather than made-up values
+            ax.text(0.5, 0.5, 'No trend data yet', ha='center', va='center', transform=ax.transAxes)
+            ax.set_xlabel('Time')
+            ax.set_ylabel('Trend')
+        ax.set_title(data.get('title', 'News Trend Analysis') if isinstance(data, dict) else 'News Trend Analysis')
+        ax.grid(True, alpha=0.3)
+        fig.tight_layout()
+        return fig
+
+    def render(self, data: dict, fmt: str = "png", dpi: Optional[int] = None) -> bytes:
+        """Render ``data`` to image bytes, reusing a cached render of the same series"""
+        if fmt not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}. Must be one of: {list(SUPPORTED_FORMATS)}")
+        dpi = dpi or self.dpi
+        key = artifact_key("trend_graph", data, {"fmt": fmt, "dpi": dpi})
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        buffer = BytesIO()
+        self._figure(data).savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+        image = buffer.getvalue()
+
+        if self.cache_size > 0:
+            with self._lock:
+                self._cache[key] = image
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return image
+
+    def render_base64(self, data: dict, fmt: str = "png", dpi: Optional[int] = None) -> str:
+        return base64.b64encode(self.render(data, fmt, dpi)).decode('utf-8')
+
+    def render_data_uri(self, data: dict, fmt: str = "png", dpi: Optional[int] = None) -> str:
+        return f"data:{MEDIA_TYPES[fmt]};base64,{self.render_base64(data, fmt, dpi)}"
+
+    def render_to_file(self, data: dict, path: str, fmt: Optional[str] = None, dpi: Optional[int] = None):
+        fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower() or "png"
+        with open(path, 'wb') as f:
+            f.write(self.render(data, fmt, dpi))
+
+    def cache_info(self) -> Tuple[int, int]:
+        with self._lock:
+            return len(self._cache), self.cache_size
+
+
+trend_renderer = TrendRenderer()
+
+
+__all__ = ["TrendRenderer", "trend_renderer", "SUPPORTED_FORMATS", "MEDIA_TYPES"]
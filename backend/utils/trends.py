@@ -0,0 +1,327 @@
+"""
+Trend engine - Incremental per-term mention counts over time buckets
+Counts live in one NumPy matrix (terms x buckets) used as a ring buffer, so
+rolling averages and growth rates are vectorized over every term at once.
+Set TRENDS_DIR to back the matrix with a memory-mapped file that survives
+restarts.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+# Category -> keywords that count as a mention of it
+CATEGORY_KEYWORDS: Dict[str, tuple] = {
+    "ai": ("ai", "artificial intelligence", "machine learning", "deep learning", "neural network", "llm", "gpt", "chatbot", "generative"),
+    "crypto": ("crypto", "bitcoin", "ethereum", "blockchain", "stablecoin"),
+    "politics": ("election", "parliament", "government", "minister", "senate", "policy"),
+    "health": ("health", "hospital", "vaccine", "medical", "disease"),
+    "pakistan": ("pakistan", "karachi", "lahore", "islamabad"),
+    "sports": ("cricket", "football", "olympics", "match", "tournament"),
+    "regulation": ("regulation", "ai act", "lawsuit", "antitrust", "copyright"),
+}
+
+# Capitalized phrases (e.g. "OpenAI", "Google DeepMind") treated as entities
+_ENTITY = re.compile(r"\b([A-Z][A-Za-z0-9]+(?:[ \-][A-Z][A-Za-z0-9]+){0,2})\b")
+_ENTITY_STOPWORDS = {
+    "The", "A", "An", "In", "On", "At", "For", "And", "But", "With", "This", "That", "These", "Today",
+    "Time", "Source", "Location", "Read", "Breaking", "Latest", "Key", "Summary", "News", "Update",
+    "Updates", "Last", "Updated", "Coverage", "Global", "Brief", "Overall", "AI", "It", "We", "They",
+}
+_CATEGORY_PATTERNS = {
+    category: re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b", re.IGNORECASE)
+    for category, keywords in CATEGORY_KEYWORDS.items()
+}
+
+
+def extract_terms(text: str, categories: Iterable[str] = ()) -> Dict[str, int]:
+    """Count category and entity mentions in ``text``; keys look like ``category:ai``"""
+    counts: Dict[str, int] = {}
+    for category, pattern in _CATEGORY_PATTERNS.items():
+        hits = len(pattern.findall(text))
+        if hits:
+            counts[f"category:{category}"] = hits
+    for category in categories:
+        if category:
+            key = f"category:{category.lower()}"
+            counts[key] = counts.get(key, 0) + 1
+    for match in _ENTITY.findall(text):
+        if match in _ENTITY_STOPWORDS or len(match) < 3:
+            continue
+        key = f"entity:{match.lower()}"
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+class TrendEngine:
+    """Per-term mention counts in fixed-width time buckets (a ring of ``capacity`` buckets)"""
+
+    def __init__(
+        self,
+        bucket_seconds: Optional[int] = None,
+        capacity: Optional[int] = None,
+        directory: Optional[str] = None,
+        max_terms: Optional[int] = None
+    ):
+        self.bucket_seconds = bucket_seconds or int(os.getenv("TRENDS_BUCKET_SECONDS", "3600"))
+        self.capacity = capacity or int(os.getenv("TRENDS_CAPACITY", str(24 * 14)))
+        self.directory = directory if directory is not None else os.getenv("TRENDS_DIR")
+        # At this many terms the least mentioned are evicted so memory stays bounded
+        self.max_terms = max_terms or int(os.getenv("TRENDS_MAX_TERMS", "50000"))
+        self._lock = threading.Lock()
+        self._terms: Dict[str, int] = {}
+        self._free: List[int] = []  # rows of evicted terms, zeroed and ready for reuse
+        self.evicted = 0
+        self._head: Optional[int] = None  # newest bucket number written
+        self._counts: Optional[np.ndarray] = None
+        if self.directory:
+            self._load()
+        if self._counts is None:
+            self._counts = self._allocate(256)
+
+    # Storage
+
+    def _matrix_path(self) -> str:
+        return os.path.join(self.directory, "counts.npy")
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "terms.json")
+
+    def _allocate(self, rows: int, old: Optional[np.ndarray] = None) -> np.ndarray:
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self._matrix_path() + ".tmp"
+            counts = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint32, shape=(rows, self.capacity))
+            if old is not None:
+                counts[:old.shape[0]] = old
+            counts.flush()
+            del counts
+            os.replace(tmp_path, self._matrix_path())
+            return np.load(self._matrix_path(), mmap_mode="r+")
+        counts = np.zeros((rows, self.capacity), dtype=np.uint32)
+        if old is not None:
+            counts[:old.shape[0]] = old
+        return counts
+
+    def _load(self):
+        if not (os.path.exists(self._matrix_path()) and os.path.exists(self._index_path())):
+            return
+        with open(self._index_path(), encoding="utf-8") as f:
+            index = json.load(f)
+        counts = np.load(self._matrix_path(), mmap_mode="r+")
+        if counts.shape[1] != self.capacity or index.get("bucket_seconds") != self.bucket_seconds:
+            return  # Layout changed; start fresh
+        self._counts = counts
+        self._terms = index["terms"]
+        self._head = index["head"]
+        used = set(self._terms.values())
+        self._free = [row for row in range(max(used, default=-1) + 1) if row not in used]
+
+    def flush(self):
+        """Persist the term index (the count matrix is memory mapped)"""
+        if not self.directory:
+            return
+        with self._lock:
+            if isinstance(self._counts, np.memmap):
+                self._counts.flush()
+            tmp_path = self._index_path() + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"terms": self._terms, "head": self._head, "bucket_seconds": self.bucket_seconds}, f)
+            os.replace(tmp_path, self._index_path())
+
+    # Writes
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def _advance(self, bucket: int):
+        """Move the ring head forward, zeroing the buckets being reused"""
+        if self._head is None:
+            self._head = bucket
+            return
+        if bucket <= self._head:
+            return
+        steps = bucket - self._head
+        if steps >= self.capacity:
+            self._counts[:] = 0
+        else:
+            slots = (np.arange(self._head + 1, bucket + 1)) % self.capacity
+            self._counts[:, slots] = 0
+        self._head = bucket
+
+    def _evict_terms(self):
+        """Drop the least mentioned tenth of the terms (totals over the kept buckets; oldest first on ties)"""
+        names = list(self._terms)
+        rows = np.fromiter(self._terms.values(), dtype=np.int64, count=len(names))
+        totals = self._counts[rows].sum(axis=1, dtype=np.uint64)
+        drop = np.argsort(totals, kind="stable")[:max(1, self.max_terms // 10)]
+        for i in drop:
+            del self._terms[names[i]]
+        self._counts[rows[drop]] = 0
+        self._free.extend(rows[drop].tolist())
+        self.evicted += len(drop)
+
+    def _row(self, term: str) -> int:
+        row = self._terms.get(term)
+        if row is not None:
+            return row
+        if len(self._terms) >= self.max_terms:
+            self._evict_terms()
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._terms)
+            if row >= self._counts.shape[0]:
+                self._counts = self._allocate(min(self._counts.shape[0] * 2, self.max_terms), self._counts)
+        self._terms[term] = row
+        return row
+
+    def add(self, counts: Dict[str, int], timestamp: Optional[float] = None):
+        """Add mention counts observed at ``timestamp`` (default: now)"""
+        bucket = self._bucket(timestamp if timestamp is not None else time.time())
+        with self._lock:
+            self._advance(bucket)
+            if bucket <= self._head - self.capacity:
+                return  # Older than the window we keep
+            slot = bucket % self.capacity
+            for term, count in counts.items():
+                self._counts[self._row(term), slot] += count
+
+    def ingest_text(self, text: str, categories: Iterable[str] = (), timestamp: Optional[float] = None):
+        """Extract terms from an agent output and count them"""
+        self.add(extract_terms(text, categories), timestamp)
+
+    # Reads
+
+    def _window_slots(self, window: int) -> np.ndarray:
+        """Ring slots for the last ``window`` buckets, oldest first"""
+        window = max(1, min(window, self.capacity))
+        head = self._head if self._head is not None else self._bucket(time.time())
+        return np.arange(head - window + 1, head + 1) % self.capacity
+
+    def bucket_starts(self, window: int) -> List[str]:
+        head = self._head if self._head is not None else self._bucket(time.time())
+        window = max(1, min(window, self.capacity))
+        return [
+            datetime.fromtimestamp(b * self.bucket_seconds, tz=timezone.utc).isoformat()
+            for b in range(head - window + 1, head + 1)
+        ]
+
+    def matrix(self, terms: List[str], window: int) -> np.ndarray:
+        """Counts for ``terms`` over the last ``window`` buckets (rows follow ``terms``)"""
+        with self._lock:
+            self._advance(self._bucket(time.time()))
+            slots = self._window_slots(window)
+            rows = [self._terms.get(term) for term in terms]
+            out = np.zeros((len(terms), len(slots)), dtype=np.float64)
+            known = [i for i, row in enumerate(rows) if row is not None]
+            if known:
+                out[known] = self._counts[np.array([rows[i] for i in known])][:, slots]
+            return out
+
+    @staticmethod
+    def rolling_mean(series: np.ndarray, span: int) -> np.ndarray:
+        """Trailing mean over ``span`` buckets along the last axis (shorter at the start)"""
+        span = max(1, span)
+        cumsum = np.cumsum(series, axis=-1)
+        shifted = np.zeros_like(cumsum)
+        shifted[..., span:] = cumsum[..., :-span]
+        divisor = np.minimum(np.arange(1, series.shape[-1] + 1), span)
+        return (cumsum - shifted) / divisor
+
+    def _current_previous(self, terms: List[str], window: int):
+        """Per-term totals of the last ``window`` buckets and of the buckets before them.
+
+        Only ``capacity`` buckets are kept, so the previous span can be shorter
+        than ``window``; its total is scaled up to ``window`` buckets. Without
+        any previous bucket (``window == capacity``) ``previous`` is None.
+        """
+        window = max(1, min(window, self.capacity))
+        counts = self.matrix(terms, min(window * 2, self.capacity))
+        current = counts[:, -window:].sum(axis=1)
+        span = counts.shape[1] - window
+        previous = counts[:, :span].sum(axis=1) * (window / span) if span else None
+        return current, previous
+
+    @staticmethod
+    def _growth(current: np.ndarray, previous: Optional[np.ndarray]) -> np.ndarray:
+        if previous is None:
+            return np.zeros_like(current)
+        return (current - previous) / np.maximum(previous, 1)
+
+    def growth(self, terms: Optional[List[str]] = None, window: int = 24) -> Dict[str, float]:
+        """Relative change between the last ``window`` buckets and the ``window`` before"""
+        terms = terms if terms is not None else self.terms()
+        current, previous = self._current_previous(terms, window)
+        return dict(zip(terms, self._growth(current, previous).round(4).tolist()))
+
+    def top(self, n: int = 10, window: int = 24, kind: Optional[str] = None, by: str = "count") -> List[dict]:
+        """Top terms in the window by total ``count`` or by ``growth``"""
+        terms = [t for t in self.terms() if kind is None or t.startswith(f"{kind}:")]
+        if not terms:
+            return []
+        current, previous = self._current_previous(terms, window)
+        growth = self._growth(current, previous)
+        order = np.argsort(-(growth if by == "growth" else current), kind="stable")
+        return [
+            {"term": terms[i], "count": int(current[i]), "growth": round(float(growth[i]), 4)}
+            for i in order[:n] if current[i] > 0
+        ]
+
+    def series(self, terms: List[str], window: int = 24, span: int = 3) -> dict:
+        """Counts, rolling averages and growth for ``terms`` over the last ``window`` buckets"""
+        counts = self.matrix(terms, window)
+        rolling = self.rolling_mean(counts, span)
+        growth = self.growth(terms, window)
+        return {
+            "buckets": self.bucket_starts(window),
+            "bucket_seconds": self.bucket_seconds,
+            "series": {
+                term: {
+                    "counts": counts[i].astype(int).tolist(),
+                    "rolling_mean": rolling[i].round(3).tolist(),
+                    "growth": growth[term],
+                }
+                for i, term in enumerate(terms)
+            },
+        }
+
+    def graph_data(self, term: str, window: int = 24) -> dict:
+        """Data in the shape TrendRenderer / generate_trend_graph expect"""
+        return {
+            "dates": self.bucket_starts(window),
+            "values": self.matrix([term], window)[0].astype(int).tolist(),
+            "title": f"Mentions of {term.split(':', 1)[-1]}",
+        }
+
+    def top_graph_data(self, window: int = 24) -> dict:
+        """``graph_data`` of the top entity (any term if there are none); flagged ``empty`` when nothing was counted"""
+        top = self.top(1, window=window, kind="entity") or self.top(1, window=window)
+        if not top:
+            return {"dates": [], "values": [], "title": "No trend data yet", "empty": True}
+        return self.graph_data(top[0]["term"], window)
+
+    def terms(self) -> List[str]:
+        with self._lock:
+            return list(self._terms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "terms": len(self._terms),
+                "max_terms": self.max_terms,
+                "evicted": self.evicted,
+                "buckets": self.capacity,
+                "bucket_seconds": self.bucket_seconds,
+            }
+
+
+trend_engine = TrendEngine()
+
+
+__all__ = ["TrendEngine", "trend_engine", "extract_terms", "CATEGORY_KEYWORDS"]
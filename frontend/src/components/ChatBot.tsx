@@ -3,13 +3,16 @@
 import { useState, useRef, useEffect } from "react";
 import { motion, AnimatePresence } from "motion/react";
 import { Send, Bot, User, Loader2, Sparkles } from "lucide-react";
-import { runAgent, AgentResponse } from "@/lib/api";
+import { streamAgent } from "@/lib/api";
+import { randomId } from "@/lib/utils";
 
 interface Message {
   id: string;
   role: "user" | "assistant";
   content: string;
   timestamp: Date;
+  // The stream broke off after this partial answer
+  failed?: boolean;
 }
 
 interface ChatBotProps {
@@ -22,7 +25,8 @@ export function ChatBot({ agentType, agentName, agentDescription }: ChatBotProps
   const [messages, setMessages] = useState<Message[]>([]);
   const [input, setInput] = useState("");
   const [isLoading, setIsLoading] = useState(false);
-  const [sessionId, setSessionId] = useState<string | null>(null);
+  // Chosen up front: the backend only keeps history for sessions the client names
+  const [sessionId] = useState(randomId);
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const inputRef = useRef<HTMLInputElement>(null);
 
@@ -48,34 +52,53 @@ export function ChatBot({ agentType, agentName, agentDescription }: ChatBotProps
     setInput("");
     setIsLoading(true);
 
+    const assistantId = (Date.now() + 1).toString();
+    let started = false;
+
+    const addAssistantMessage = (content: string) => {
+      started = true;
+      setIsLoading(false);
+      setMessages((prev) => [
+        ...prev,
+        { id: assistantId, role: "assistant", content, timestamp: new Date() },
+      ]);
+    };
+
     try {
-      const response: AgentResponse = await runAgent(
+      await streamAgent(
         agentType,
         userMessage.content,
-        sessionId || undefined
+        (content) => {
+          if (!started) {
+            addAssistantMessage(content);
+            return;
+          }
+          setMessages((prev) =>
+            prev.map((message) =>
+              message.id === assistantId
+                ? { ...message, content: message.content + content }
+                : message
+            )
+          );
+        },
+        sessionId
       );
-
-      if (response.session_id) {
-        setSessionId(response.session_id);
+      // Finished without any text (e.g. a cached empty answer)
+      if (!started) {
+        addAssistantMessage("No response was returned. Please try again.");
       }
-
-      const assistantMessage: Message = {
-        id: (Date.now() + 1).toString(),
-        role: "assistant",
-        content: response.result,
-        timestamp: new Date(),
-      };
-
-      setMessages((prev) => [...prev, assistantMessage]);
     } catch (error) {
       console.error("Error sending message:", error);
-      const errorMessage: Message = {
-        id: (Date.now() + 1).toString(),
-        role: "assistant",
-        content: "Sorry, I encountered an error. Please try again.",
-        timestamp: new Date(),
-      };
-      setMessages((prev) => [...prev, errorMessage]);
+      if (started) {
+        // Keep the partial answer, marked as cut off, instead of adding a second bubble
+        setMessages((prev) =>
+          prev.map((message) =>
+            message.id === assistantId ? { ...message, failed: true } : message
+          )
+        );
+      } else {
+        addAssistantMessage("Sorry, I encountered an error. Please try again.");
+      }
     } finally {
       setIsLoading(false);
       inputRef.current?.focus();
@@ -196,12 +219,17 @@ export function ChatBot({ agentType, agentName, agentDescription }: ChatBotProps
                 className={`max-w-[80%] rounded-2xl p-4 ${
                   message.role === "user"
                     ? "gradient-primary text-white shadow-lg"
-                    : "glass-strong text-white/90 border border-white/10"
+                    : `glass-strong text-white/90 border ${message.failed ? "border-red-500/40" : "border-white/10"}`
                 }`}
               >
                 <p className="whitespace-pre-wrap break-words leading-relaxed text-[15px]">
                   {message.content}
                 </p>
+                {message.failed && (
+                  <p className="text-xs mt-2.5 text-red-400">
+                    The response was interrupted. Please try again.
+                  </p>
+                )}
                 <p className="text-xs mt-2.5 opacity-60 flex items-center gap-1.5">
                   {message.timestamp.toLocaleTimeString([], { 
                     hour: '2-digit', 
@@ -3,7 +3,7 @@
 import { useState, useEffect } from "react";
 import { motion } from "motion/react";
 import { Radio, RefreshCw, Clock, TrendingUp, ExternalLink } from "lucide-react";
-import { getLiveNews, LiveNewsResponse } from "@/lib/api";
+import { getLiveNews, LiveNewsResponse, StructuredNewsItem } from "@/lib/api";
 import { ParallaxElement } from "./ParallaxElement";
 import Image from "next/image";
 
@@ -27,6 +27,26 @@ export const LiveNewsSection = () => {
   const [lastUpdate, setLastUpdate] = useState<Date | null>(null);
   const [autoRefresh, setAutoRefresh] = useState(true);
 
+  // Structured items from the backend need no text parsing
+  const groupNewsItems = (items: StructuredNewsItem[]) => {
+    const toNewsItem = (item: StructuredNewsItem, imageSize: string): NewsItem => ({
+      title: item.headline,
+      summary: item.summary,
+      source: item.source || 'AI News Desk',
+      url: item.url || '#',
+      image_url: `https://images.unsplash.com/photo-1677442136019-21780ecad995?${imageSize}&fit=crop`,
+      time: item.time || 'Just now'
+    });
+    const impactRank = (item: StructuredNewsItem) =>
+      ({ high: 0, medium: 1, low: 2 } as Record<string, number>)[(item.impact || '').toLowerCase()] ?? 3;
+
+    return {
+      breaking: items.filter(item => item.breaking).map(item => toNewsItem(item, 'w=800&h=600')),
+      updates: items.filter(item => !item.breaking).map(item => toNewsItem(item, 'w=600&h=400')),
+      highlights: [...items].sort((a, b) => impactRank(a) - impactRank(b)).slice(0, 5).map(item => toNewsItem(item, 'w=400&h=400'))
+    };
+  };
+
   const parseNewsResponse = (response: string) => {
     try {
       const breaking: NewsItem[] = [];
@@ -237,7 +257,9 @@ export const LiveNewsSection = () => {
     try {
       const response = await getLiveNews(["ai"]); // Always AI only
       setNews(response);
-      const parsed = parseNewsResponse(response.result);
+      const parsed = response.items
+        ? groupNewsItems(response.items)
+        : parseNewsResponse(response.result || "");
       setParsedNews(parsed);
       setLastUpdate(new Date());
     } catch (error: any) {
@@ -17,11 +17,29 @@ export interface AgentResponse {
   agent_type?: string;
 }
 
+export interface StructuredNewsItem {
+  headline: string;
+  source: string;
+  url?: string;
+  time?: string;
+  location?: string;
+  summary: string;
+  impact?: string;
+  category?: string;
+  breaking?: boolean;
+}
+
 export interface LiveNewsResponse {
-  result: string;
+  result?: string;
+  items?: StructuredNewsItem[];
+  overview?: string;
   session_id: string;
   categories: string[];
   update_time: string;
+  cached?: boolean;
+  generated_at?: string;
+  age?: number;
+  stale?: boolean;
 }
 
 export async function runAgent(
@@ -48,6 +66,74 @@ export async function runAgent(
   return response.json();
 }
 
+export interface StreamDone {
+  session_id: string;
+  usage?: Record<string, number> | null;
+  cached?: boolean;
+  agent_type?: string;
+}
+
+export async function streamAgent(
+  agentType: string,
+  query: string,
+  onDelta: (content: string) => void,
+  sessionId?: string
+): Promise<StreamDone> {
+  const response = await fetch(`${API_URL}/api/agent/stream`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      Accept: "text/event-stream",
+    },
+    body: JSON.stringify({
+      query,
+      agent_type: agentType,
+      session_id: sessionId,
+    }),
+  });
+
+  if (!response.ok || !response.body) {
+    throw new Error(`API error: ${response.statusText}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Events are separated by a blank line
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf("\n\n");
+
+      let eventName = "message";
+      let data = "";
+      for (const line of rawEvent.split("\n")) {
+        if (line.startsWith("event: ")) eventName = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      if (!data) continue;
+
+      const payload = JSON.parse(data);
+      if (eventName === "delta") {
+        onDelta(payload.content);
+      } else if (eventName === "done") {
+        return payload as StreamDone;
+      } else if (eventName === "error") {
+        throw new Error(payload.detail || "Stream error");
+      }
+    }
+  }
+
+  throw new Error("Stream ended unexpectedly");
+}
+
 export async function getLiveNews(
   categories?: string[],
   sessionId?: string
@@ -60,6 +146,7 @@ export async function getLiveNews(
       },
       body: JSON.stringify({
         categories: categories || ["ai"],
+        format: "json",
         session_id: sessionId,
       }),
     });